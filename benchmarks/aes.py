@@ -0,0 +1,91 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Throughput of the aes.py backends: TgCrypto, cryptography and pyaes, on 512 KB blocks (a full upload part).
+
+Each backend is loaded as a separate copy of pyrogram.crypto.aes, with the faster libraries hidden from it. Backends
+that can't be imported here are skipped.
+
+Usage: python -m benchmarks.aes [rounds]
+"""
+
+import importlib.util
+import os
+import sys
+import timeit
+from types import ModuleType
+from typing import Optional
+
+from pyrogram.crypto import aes
+
+BACKENDS = {
+    "TgCrypto": [],
+    "cryptography": ["tgcrypto"],
+    "pyaes": ["tgcrypto", "cryptography.hazmat.primitives.ciphers"]
+}
+
+
+def load(hidden: list) -> Optional[ModuleType]:
+    saved = {name: sys.modules.get(name) for name in hidden}
+    # A None entry makes any import of that module raise ImportError
+    sys.modules.update(dict.fromkeys(hidden))
+
+    try:
+        spec = importlib.util.spec_from_file_location(f"aes_{len(hidden)}", aes.__file__)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except ImportError:
+        return None
+    finally:
+        for name, original in saved.items():
+            if original is None:
+                del sys.modules[name]
+            else:
+                sys.modules[name] = original
+
+    return module
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    data = os.urandom(512 * 1024)
+    key = os.urandom(32)
+    iv = os.urandom(32)
+
+    for backend, hidden in BACKENDS.items():
+        module = load(hidden)
+
+        if module is None or (backend == "TgCrypto" and module.tgcrypto is None):
+            print(f"{backend:>12}: not installed")
+            continue
+
+        # pyaes is orders of magnitude slower, a single round is plenty
+        number = 1 if backend == "pyaes" else rounds
+        for name, f in (
+            ("ige256_encrypt", lambda: module.ige256_encrypt(data, key, iv)),
+            ("ige256_decrypt", lambda: module.ige256_decrypt(data, key, iv)),
+            ("ctr256_encrypt", lambda: module.ctr256_encrypt(data, key, bytearray(iv[:16])))
+        ):
+            elapsed = min(timeit.repeat(f, number=number, repeat=3)) / number
+
+            print(f"{backend:>12} {name:>14}: {elapsed * 1e3:10.2f} ms ({len(data) / elapsed / 2 ** 20:8.2f} MiB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Crypto throughput of many sessions sharing pyrogram.crypto_executor, as with compose() running many clients.
+
+Every session encrypts a stream of packets: mostly small ones (pings, acks, service messages) and some big ones
+(file parts). The single thread executor every packet used to go through is compared with CryptoExecutor.
+
+Usage: python -m benchmarks.crypto_executor [sessions] [packets] [big packets ratio]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pyrogram.crypto import aes
+from pyrogram.crypto.executor import CryptoExecutor
+
+KEY = os.urandom(32)
+IV = os.urandom(32)
+
+
+def packets(count: int, ratio: float) -> list:
+    random.seed(0)
+
+    return [os.urandom(512 * 1024 if random.random() < ratio else 64) for _ in range(count)]
+
+
+async def single_thread(sessions: int, data: list) -> str:
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(1)
+
+    async def session():
+        for packet in data:
+            await loop.run_in_executor(executor, aes.ige256_encrypt, packet, KEY, IV)
+
+    await asyncio.gather(*[session() for _ in range(sessions)])
+    executor.shutdown()
+
+    return ""
+
+
+async def crypto_executor(sessions: int, data: list) -> str:
+    executor = CryptoExecutor()
+
+    async def session(lane: int):
+        for packet in data:
+            await executor.run(lane, len(packet), aes.ige256_encrypt, packet, KEY, IV)
+
+    await asyncio.gather(*[session(i) for i in range(sessions)])
+    executor.shutdown()
+
+    jobs = executor.inline_jobs + executor.pool_jobs
+
+    return (
+        f"{executor.inline_jobs} inline, {executor.pool_jobs} pooled, "
+        f"queue delay {executor.queue_delay / jobs * 1e6:.1f} µs avg, {executor.queue_delay_max * 1e3:.1f} ms max"
+    )
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    data = packets(
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+        float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+    )
+    size = sessions * sum(len(p) for p in data)
+
+    print(f"{sessions} sessions, {len(data)} packets each, {CryptoExecutor.WORKERS} workers")
+
+    for f in (single_thread, crypto_executor):
+        start = time.perf_counter()
+        stats = asyncio.run(f(sessions, data))
+        elapsed = time.perf_counter() - start
+
+        print(f"{f.__name__:>16}: {elapsed:8.3f} s ({size / elapsed / 2 ** 20:6.1f} MiB/s, {sessions * len(data) / elapsed:8.0f} packets/s) {stats}")
+
+
+if __name__ == "__main__":
+    main()
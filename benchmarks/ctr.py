@@ -0,0 +1,67 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Cost of the obfuscation layer (AES-256-CTR) of the obfuscated TCP transports, per received frame.
+
+Each frame is a 1 byte abridged length prefix followed by the packet, decrypted the way TCPAbridgedO does it. The
+stateless aes.ctr256_decrypt calls are compared with a persistent aes.CTR stream.
+
+Usage: python -m benchmarks.ctr [rounds]
+"""
+
+import os
+import sys
+import timeit
+
+from pyrogram.crypto import aes
+
+KEY = os.urandom(32)
+IV = os.urandom(16)
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    print(
+        f"ctr256_decrypt: {'TgCrypto' if aes.tgcrypto else 'cryptography' if aes.Cipher else 'pyaes'}, "
+        f"CTR: {'cryptography' if aes.Cipher else 'TgCrypto' if aes.tgcrypto else 'pyaes'}"
+    )
+
+    for size in (64, 1024, 16 * 1024):
+        frame = os.urandom(size)
+        number = max(1, rounds * 1024 // size)
+
+        state = (KEY, bytearray(IV), bytearray(1))
+        stream = aes.CTR(KEY, IV)
+
+        def functions():
+            aes.ctr256_decrypt(frame[:1], *state)
+            aes.ctr256_decrypt(frame[1:], *state)
+
+        def ctr():
+            stream.decrypt(frame[:1])
+            stream.decrypt(frame[1:])
+
+        for name, f in (("ctr256_decrypt", functions), ("CTR", ctr)):
+            elapsed = min(timeit.repeat(f, number=number, repeat=5)) / number
+
+            print(f"{size:>6} bytes {name:>14}: {elapsed * 1e6:10.1f} µs/frame ({size / elapsed / 2 ** 20:7.1f} MiB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Download throughput of Client.get_file over a simulated link, for different download windows.
+
+Every GetFile request waits for a round trip and then for its chunk to go through a link of limited bandwidth that
+is shared by all the requests in flight. A window of 1 is how chunks used to be requested, one at a time.
+
+Usage: python -m benchmarks.get_file [rtt ms] [bandwidth MiB/s] [file size MiB]
+"""
+
+import asyncio
+import sys
+import time
+
+from pyrogram import Client, raw
+from pyrogram.file_id import FileId, FileType
+
+
+class Link:
+    def __init__(self, rtt: float, bandwidth: float, size: int):
+        self.rtt = rtt
+        self.bandwidth = bandwidth
+        self.size = size
+        self.lock = asyncio.Lock()
+
+    async def invoke(self, query: raw.functions.upload.GetFile, sleep_threshold: float = 0):
+        await asyncio.sleep(self.rtt)
+
+        length = max(0, min(query.limit, self.size - query.offset))
+
+        async with self.lock:
+            await asyncio.sleep(length / self.bandwidth)
+
+        return raw.types.upload.File(type=raw.types.storage.FilePartial(), mtime=0, bytes=bytes(length))
+
+
+async def download(window: int, link: Link) -> int:
+    client = Client("benchmark", in_memory=True, max_download_window=window)
+    client.media_sessions[2] = link
+    file_id = FileId(file_type=FileType.DOCUMENT, dc_id=2, media_id=1, access_hash=1)
+
+    return sum([len(c) async for c in client.get_file(file_id, link.size)])
+
+
+def main():
+    rtt = (float(sys.argv[1]) if len(sys.argv) > 1 else 100) / 1000
+    bandwidth = (float(sys.argv[2]) if len(sys.argv) > 2 else 20) * 2 ** 20
+    size = int(float(sys.argv[3]) if len(sys.argv) > 3 else 32) * 2 ** 20
+
+    print(f"RTT {rtt * 1000:.0f} ms, link {bandwidth / 2 ** 20:.0f} MiB/s, file {size / 2 ** 20:.0f} MiB")
+
+    for window in (1, 2, 4, 8):
+        start = time.perf_counter()
+        downloaded = asyncio.run(download(window, Link(rtt, bandwidth, size)))
+        elapsed = time.perf_counter() - start
+
+        assert downloaded == size
+
+        print(f"window {window}: {elapsed:6.2f} s ({size / elapsed / 2 ** 20:5.1f} MiB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Per-packet cost of the incoming msg_id replay checks done by Session.handle_packet.
+
+Simulates a busy, channel-heavy account: server msg_ids grow with time and a handful of them arrive out of order
+(as it happens when the server flushes containers of updates). The old sorted list + bisect.insort implementation
+is compared against MsgIdWindow.
+
+Usage: python -m benchmarks.msg_id_window [packets]
+"""
+
+import bisect
+import random
+import sys
+import time
+
+from pyrogram.session.internals import MsgIdWindow
+
+STORED_MSG_IDS_MAX_SIZE = 1000 * 2
+
+
+def msg_ids(count: int) -> list:
+    now = int(time.time()) * 2 ** 32
+    ids = [now + i * 4 * 2 ** 10 + 1 for i in range(count)]
+
+    # Shuffle small runs of msg_ids, the way they are received when different containers interleave
+    for i in range(0, count - 8, 64):
+        chunk = ids[i:i + 8]
+        random.shuffle(chunk)
+        ids[i:i + 8] = chunk
+
+    return ids
+
+
+def sorted_list(ids: list):
+    stored_msg_ids = []
+
+    for msg_id in ids:
+        if len(stored_msg_ids) > STORED_MSG_IDS_MAX_SIZE:
+            del stored_msg_ids[:STORED_MSG_IDS_MAX_SIZE // 2]
+
+        if stored_msg_ids:
+            if msg_id < stored_msg_ids[0]:
+                continue
+
+            if msg_id in stored_msg_ids:
+                continue
+
+        bisect.insort(stored_msg_ids, msg_id)
+
+
+def window(ids: list):
+    stored_msg_ids = MsgIdWindow(STORED_MSG_IDS_MAX_SIZE)
+
+    for msg_id in ids:
+        if stored_msg_ids:
+            if msg_id < stored_msg_ids.min_msg_id:
+                continue
+
+            if msg_id in stored_msg_ids:
+                continue
+
+        stored_msg_ids.add(msg_id)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    ids = msg_ids(count)
+
+    for f in (sorted_list, window):
+        start = time.perf_counter()
+        f(ids)
+        elapsed = time.perf_counter() - start
+
+        print(f"{f.__name__:>12}: {elapsed * 1e9 / count:8.1f} ns/packet ({count} packets in {elapsed:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
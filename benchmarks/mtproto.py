@@ -0,0 +1,125 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Throughput of mtproto.pack and mtproto.unpack, compared with the copying implementation they replaced.
+
+The messages carry an upload.SaveFilePart, the usual big payload. Without TgCrypto the numbers are dominated by the
+pure Python AES, so only the 1 KB round is meaningful there.
+
+Usage: python -m benchmarks.mtproto [rounds]
+"""
+
+import os
+import sys
+import timeit
+from hashlib import sha256
+from io import BytesIO
+
+from pyrogram import raw
+from pyrogram.crypto import aes, mtproto
+from pyrogram.raw.core import Message, Long, Reader
+
+AUTH_KEY = mtproto.AuthKey(os.urandom(256))
+SESSION_ID = os.urandom(8)
+
+
+def old_pack(message: Message, salt: int, session_id: bytes, auth_key: bytes, auth_key_id: bytes) -> bytes:
+    data = Long(salt) + session_id + message.write()
+    padding = os.urandom(-(len(data) + 12) % 16 + 12)
+
+    msg_key_large = sha256(auth_key[88: 88 + 32])
+    msg_key_large.update(data)
+    msg_key_large.update(padding)
+    msg_key_large = msg_key_large.digest()
+    msg_key = msg_key_large[8:24]
+    aes_key, aes_iv = old_kdf(auth_key, msg_key, True)
+
+    return auth_key_id + msg_key + aes.ige256_encrypt(data + padding, aes_key, aes_iv)
+
+
+def old_unpack(b: BytesIO, session_id: bytes, auth_key: bytes, auth_key_id: bytes) -> Message:
+    assert b.read(8) == auth_key_id
+
+    msg_key = b.read(16)
+    aes_key, aes_iv = old_kdf(auth_key, msg_key, False)
+    data = Reader(aes.ige256_decrypt(b.read(), aes_key, aes_iv))
+    data.read(8)
+
+    assert data.read(8) == session_id
+
+    message = Message.read(data)
+
+    assert msg_key == sha256(auth_key[96:96 + 32] + data.getvalue()).digest()[8:24]
+
+    data.seek(32)
+    payload = data.read()
+    padding = payload[message.length:]
+
+    assert 12 <= len(padding) <= 1024
+    assert len(payload) % 4 == 0
+    assert message.msg_id % 2 != 0
+
+    return message
+
+
+def old_kdf(auth_key: bytes, msg_key: bytes, outgoing: bool) -> tuple:
+    x = 0 if outgoing else 8
+
+    sha256_a = sha256(msg_key + auth_key[x: x + 36]).digest()
+    sha256_b = sha256(auth_key[x + 40:x + 76] + msg_key).digest()
+
+    aes_key = sha256_a[:8] + sha256_b[8:24] + sha256_a[24:32]
+    aes_iv = sha256_b[:8] + sha256_a[8:24] + sha256_b[24:32]
+
+    return aes_key, aes_iv
+
+
+def incoming(message: Message) -> bytes:
+    data = Long(0) + SESSION_ID + message.write()
+    data += os.urandom(-(len(data) + 12) % 16 + 12)
+    msg_key = sha256(AUTH_KEY.key[96:96 + 32] + data).digest()[8:24]
+    aes_key, aes_iv = AUTH_KEY.kdf(msg_key, False)
+
+    return AUTH_KEY.id + msg_key + aes.ige256_encrypt(data, aes_key, aes_iv)
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+    for size in (2 ** 10, 2 ** 20):
+        message = Message(
+            raw.functions.upload.SaveFilePart(file_id=1, file_part=0, bytes=os.urandom(size)),
+            0x5bb8e511 * 2 + 1, 1, 0
+        )
+        message.length = len(message.body.write())
+        packet = incoming(message)
+        number = max(1, rounds * 2 ** 10 // size)
+
+        for name, f in (
+            ("old pack", lambda: old_pack(message, 0, SESSION_ID, AUTH_KEY.key, AUTH_KEY.id)),
+            ("pack", lambda: mtproto.pack(message, 0, SESSION_ID, AUTH_KEY)),
+            ("old unpack", lambda: old_unpack(BytesIO(packet), SESSION_ID, AUTH_KEY.key, AUTH_KEY.id)),
+            ("unpack", lambda: mtproto.unpack(packet, SESSION_ID, AUTH_KEY))
+        ):
+            elapsed = min(timeit.repeat(f, number=number, repeat=5)) / number
+
+            print(f"{size // 1024:>5} KB {name:>10}: {elapsed * 1e6:10.1f} µs ({size / elapsed / 2 ** 20:7.1f} MiB/s)")
+
+
+if __name__ == "__main__":
+    main()
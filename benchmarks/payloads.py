@@ -0,0 +1,179 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Synthetic, realistically shaped TL payloads shared by the benchmarks."""
+
+import os
+
+from pyrogram import raw
+
+
+def user(i: int) -> "raw.types.User":
+    return raw.types.User(
+        id=1_000_000 + i,
+        access_hash=0x7FFF_FFFF_0000 + i,
+        first_name=f"User {i}",
+        last_name="Lastname",
+        username=f"user_{i}",
+        photo=raw.types.UserProfilePhoto(photo_id=5_000_000 + i, dc_id=2, stripped_thumb=os.urandom(64)),
+        status=raw.types.UserStatusOffline(was_online=1_700_000_000 + i),
+        lang_code="en"
+    )
+
+
+def channel(i: int) -> "raw.types.Channel":
+    return raw.types.Channel(
+        id=2_000_000 + i,
+        title=f"Channel {i}",
+        photo=raw.types.ChatPhoto(photo_id=6_000_000 + i, dc_id=4, stripped_thumb=os.urandom(64)),
+        date=1_700_000_000 + i,
+        broadcast=True,
+        access_hash=0x7FFF_0000_FFFF + i,
+        username=f"channel_{i}",
+        participants_count=100_000 + i
+    )
+
+
+def message(i: int) -> "raw.types.Message":
+    return raw.types.Message(
+        id=i,
+        peer_id=raw.types.PeerChannel(channel_id=2_000_000 + i % 10),
+        date=1_700_000_000 + i,
+        message=f"Message number {i}: " + "lorem ipsum dolor sit amet " * 8,
+        post=True,
+        from_id=raw.types.PeerUser(user_id=1_000_000 + i % 50),
+        fwd_from=raw.types.MessageFwdHeader(
+            date=1_690_000_000 + i,
+            from_id=raw.types.PeerChannel(channel_id=2_000_100),
+            channel_post=i
+        ) if i % 3 == 0 else None,
+        media=raw.types.MessageMediaPhoto(
+            photo=raw.types.Photo(
+                id=7_000_000 + i,
+                access_hash=0x1234_5678 + i,
+                file_reference=os.urandom(32),
+                date=1_700_000_000 + i,
+                sizes=[
+                    raw.types.PhotoStrippedSize(type="i", bytes=os.urandom(100)),
+                    raw.types.PhotoSize(type="m", w=320, h=240, size=15_000),
+                    raw.types.PhotoSizeProgressive(type="y", w=1280, h=960, sizes=[10_000, 40_000, 90_000])
+                ],
+                dc_id=4
+            )
+        ) if i % 2 == 0 else None,
+        reply_markup=raw.types.ReplyInlineMarkup(
+            rows=[
+                raw.types.KeyboardButtonRow(
+                    buttons=[
+                        raw.types.KeyboardButtonCallback(text=f"Button {j}", data=f"cb_{i}_{j}".encode())
+                        for j in range(3)
+                    ]
+                )
+                for _ in range(2)
+            ]
+        ),
+        entities=[
+            raw.types.MessageEntityBold(offset=0, length=7),
+            raw.types.MessageEntityTextUrl(offset=8, length=6, url="https://example.com/")
+        ],
+        views=10_000 + i,
+        forwards=100 + i,
+        edit_date=1_700_000_100 + i,
+        reactions=raw.types.MessageReactions(
+            results=[
+                raw.types.ReactionCount(reaction=raw.types.ReactionEmoji(emoticon=e), count=10 + i)
+                for e in ("👍", "❤", "🔥")
+            ]
+        )
+    )
+
+
+def channel_messages(count: int = 100) -> "raw.types.messages.ChannelMessages":
+    return raw.types.messages.ChannelMessages(
+        pts=count,
+        count=count,
+        messages=[message(i) for i in range(count)],
+        topics=[],
+        chats=[channel(i) for i in range(10)],
+        users=[user(i) for i in range(50)]
+    )
+
+
+def difference(count: int = 100) -> "raw.types.updates.Difference":
+    return raw.types.updates.Difference(
+        new_messages=[message(i) for i in range(count)],
+        new_encrypted_messages=[],
+        other_updates=[
+            raw.types.UpdateNewChannelMessage(message=message(count + i), pts=i, pts_count=1)
+            for i in range(count)
+        ],
+        chats=[channel(i) for i in range(10)],
+        users=[user(i) for i in range(50)],
+        state=raw.types.updates.State(pts=count, qts=0, date=1_700_000_000, seq=1, unread_count=0)
+    )
+
+
+def entities(count: int) -> list:
+    return [
+        raw.types.MessageEntityTextUrl(offset=i * 10, length=5, url=f"https://example.com/{i}")
+        if i % 2 else
+        raw.types.MessageEntityBold(offset=i * 10, length=5)
+        for i in range(count)
+    ]
+
+
+def send_multi_media(count: int = 10) -> "raw.functions.messages.SendMultiMedia":
+    return raw.functions.messages.SendMultiMedia(
+        peer=raw.types.InputPeerChannel(channel_id=2_000_000, access_hash=0x7FFF_0000_FFFF),
+        multi_media=[
+            raw.types.InputSingleMedia(
+                media=raw.types.InputMediaPhoto(
+                    id=raw.types.InputPhoto(id=7_000_000 + i, access_hash=i, file_reference=os.urandom(32))
+                ),
+                random_id=i,
+                message="caption " * 64,
+                entities=entities(32)
+            )
+            for i in range(count)
+        ]
+    )
+
+
+def edit_message(count: int = 500) -> "raw.functions.messages.EditMessage":
+    return raw.functions.messages.EditMessage(
+        peer=raw.types.InputPeerChannel(channel_id=2_000_000, access_hash=0x7FFF_0000_FFFF),
+        id=1,
+        message="lorem ipsum " * count,
+        entities=entities(count)
+    )
+
+
+def invoke_with_layer() -> "raw.functions.InvokeWithLayer":
+    return raw.functions.InvokeWithLayer(
+        layer=raw.all.layer,
+        query=raw.functions.InitConnection(
+            api_id=12345,
+            app_version="Pyrogram 2.0",
+            device_model="CPython 3.11",
+            system_version="Linux 6.1",
+            system_lang_code="en",
+            lang_code="en",
+            lang_pack="",
+            query=raw.functions.help.GetConfig()
+        )
+    )
@@ -0,0 +1,59 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Import time and memory footprint of pyrogram.
+
+Every import is timed in a fresh interpreter, so that nothing is cached across runs. Peak RSS is the one of the
+child process once the import is done, baseline interpreter included.
+
+Usage: python -m benchmarks.startup [runs]
+"""
+
+import subprocess
+import sys
+
+MODULES = ("pyrogram",)
+
+CHILD = """
+import resource, time
+start = time.perf_counter()
+import {}
+print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def run(module: str) -> tuple:
+    out = subprocess.run([sys.executable, "-c", CHILD.format(module)], capture_output=True, text=True, check=True)
+    elapsed, rss = out.stdout.split()
+
+    return float(elapsed), int(rss)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    for module in MODULES:
+        results = [run(module) for _ in range(runs)]
+        elapsed = min(r[0] for r in results)
+        rss = min(r[1] for r in results)
+
+        print(f"{module:>10}: {elapsed * 1e3:8.1f} ms, {rss / 1024:6.1f} MiB peak RSS (best of {runs})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Throughput of the TCP transport over loopback, compared with the implementation it replaced.
+
+Receiving: a local server streams abridged frames as fast as it can, the client reads them with TCPAbridged.recv
+(the old one accumulated StreamReader reads, still available as ReaderStream). Sending: the client sends TCPFull frames to a server that drops them
+(the old framing joined header, payload and checksum before writing).
+
+Usage: python -m benchmarks.tcp [megabytes]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from binascii import crc32
+from struct import pack
+
+from pyrogram.connection.transport import TCP, TCPAbridged, TCPFull, ReaderStream
+
+
+class StreamReaderTCP(TCPAbridged):
+    STREAM = ReaderStream
+
+
+class ConcatTCPFull(TCPFull):
+    async def send(self, data: bytes, *args) -> None:
+        data = pack("<II", len(data) + 12, self.seq_no) + data
+        data += pack("<I", crc32(data))
+        self.seq_no += 1
+
+        await TCP.send(self, data)
+
+
+def frame(size: int) -> bytes:
+    length = size // 4
+
+    return (bytes([length]) if length <= 126 else b"\x7f" + length.to_bytes(3, "little")) + os.urandom(size)
+
+
+async def run(transport, size: int, count: int) -> float:
+    # Frames are written in batches of up to 16 MB
+    batch = min(count, max(1, 2 ** 24 // size))
+    data = frame(size) * batch
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        await reader.readexactly(1)
+
+        for _ in range(-(-count // batch)):
+            writer.write(data)
+            await writer.drain()
+
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    tcp = transport(ipv6=False, proxy={})
+    await tcp.connect(server.sockets[0].getsockname())
+
+    start = time.perf_counter()
+
+    for _ in range(count):
+        await tcp.recv()
+
+    elapsed = time.perf_counter() - start
+
+    await tcp.close()
+    server.close()
+
+    return elapsed
+
+
+async def send(transport, size: int, count: int) -> float:
+    done = asyncio.Event()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        while await reader.read(2 ** 20):
+            pass
+
+        writer.close()
+        done.set()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    tcp = transport(ipv6=False, proxy={})
+    await tcp.connect(server.sockets[0].getsockname())
+    data = os.urandom(size)
+
+    start = time.perf_counter()
+
+    for _ in range(count):
+        await tcp.send(data)
+
+    elapsed = time.perf_counter() - start
+
+    await tcp.close()
+    await done.wait()
+    server.close()
+
+    return elapsed
+
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+
+    for size in (1024, 64 * 1024, 1024 * 1024):
+        count = megabytes * 2 ** 20 // size
+
+        for transport in (StreamReaderTCP, TCPAbridged):
+            elapsed = min(asyncio.run(run(transport, size, count)) for _ in range(3))
+
+            print(
+                f"recv {size // 1024:>5} KB frames {transport.__name__:>15}: "
+                f"{count * size / elapsed / 2 ** 20:8.1f} MiB/s, {count / elapsed:9.0f} frames/s"
+            )
+
+    for size in (512 * 1024, 1024 * 1024):
+        count = megabytes * 2 ** 20 // size
+
+        for transport in (ConcatTCPFull, TCPFull):
+            elapsed = min(asyncio.run(send(transport, size, count)) for _ in range(3))
+
+            print(
+                f"send {size // 1024:>5} KB frames {transport.__name__:>15}: "
+                f"{count * size / elapsed / 2 ** 20:8.1f} MiB/s, {count / elapsed:9.0f} frames/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Eager vs lazy decoding of a large updates.Difference.
+
+Two kinds of consumers are simulated: one that only looks at the new state and drops the rest, and one that reads a
+couple of scalar fields of every new message, leaving media, entities, reply markups and reactions untouched.
+
+Usage: python -m benchmarks.tl_lazy [rounds]
+"""
+
+import sys
+import timeit
+import tracemalloc
+
+from pyrogram.raw.core import TLObject, Reader, LazyReader
+from . import payloads
+
+
+def state(difference):
+    return difference.state.pts
+
+
+def message_ids(difference):
+    return [(message.id, message.date) for message in difference.new_messages]
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    data = payloads.difference(500).write()
+
+    for consumer in (state, message_ids):
+        for reader in (Reader, LazyReader):
+            elapsed = min(
+                timeit.repeat(lambda: consumer(TLObject.read(reader(data))), number=rounds, repeat=5)
+            ) / rounds
+
+            tracemalloc.start()
+            difference = TLObject.read(reader(data))
+            consumer(difference)
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            print(f"{consumer.__name__:>12} {reader.__name__:>10}: {elapsed * 1e3:8.2f} ms, {memory / 2 ** 20:6.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Per-object decoding and encoding cost of the hottest constructors.
+
+Message, User and Channel are the bulk of every update and history response, and most of their fields are fixed-width
+ints, longs and flags that the generated code reads and writes with fused Struct formats.
+
+Usage: python -m benchmarks.tl_objects [rounds]
+"""
+
+import sys
+import timeit
+
+from pyrogram.raw.core import TLObject, Reader
+from . import payloads
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+
+    for name, payload in (
+        ("Message", payloads.message(1)),
+        ("User", payloads.user(1)),
+        ("Channel", payloads.channel(1))
+    ):
+        data = payload.write()
+
+        read = min(timeit.repeat(lambda: TLObject.read(Reader(data)), number=rounds, repeat=25)) / rounds
+        write = min(timeit.repeat(payload.write, number=rounds, repeat=25)) / rounds
+
+        print(f"{name:>8}: read {read * 1e6:6.2f} µs, write {write * 1e6:6.2f} µs ({len(data)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Decoding throughput of large TL payloads.
+
+Compares the BytesIO based primitives against the memoryview based Reader, then decodes a big
+messages.ChannelMessages and updates.Difference the way Session.handle_packet does.
+
+Usage: python -m benchmarks.tl_reader [rounds]
+"""
+
+import sys
+import timeit
+from io import BytesIO
+
+from pyrogram.raw.core import TLObject, Reader, Int, Long, String
+from . import payloads
+
+
+def bench(name: str, f, rounds: int, size: int):
+    # Best of a few repeats, so that the numbers are not skewed by other processes
+    elapsed = min(timeit.repeat(f, number=rounds, repeat=5)) / rounds
+
+    print(f"{name:>32}: {elapsed * 1e3:8.2f} ms/round ({size / elapsed / 2 ** 20:6.1f} MiB/s)")
+
+
+def primitives(rounds: int):
+    count = 10_000
+    data = b"".join(Int(i) + Long(i) + String(f"user{i}") for i in range(count))
+
+    def bytes_io():
+        b = BytesIO(data)
+
+        for _ in range(count):
+            Int.read(b)
+            Long.read(b)
+            String.read(b)
+
+    def reader():
+        b = Reader(data)
+
+        for _ in range(count):
+            b.read_int()
+            b.read_long()
+            b.read_string()
+
+    bench("primitives (BytesIO)", bytes_io, rounds, len(data))
+    bench("primitives (Reader)", reader, rounds, len(data))
+
+
+def objects(rounds: int):
+    for name, payload in (
+        ("messages.ChannelMessages", payloads.channel_messages()),
+        ("updates.Difference", payloads.difference())
+    ):
+        data = payload.write()
+
+        bench(name, lambda: TLObject.read(Reader(data)), rounds, len(data))
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    primitives(rounds * 10)
+    objects(rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Serialization throughput of large, deeply nested requests.
+
+Usage: python -m benchmarks.tl_writer [rounds]
+"""
+
+import sys
+import timeit
+
+from . import payloads
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    for name, payload in (
+        ("messages.SendMultiMedia", payloads.send_multi_media()),
+        ("messages.EditMessage", payloads.edit_message()),
+        ("InvokeWithLayer(InitConnection)", payloads.invoke_with_layer()),
+        ("messages.ChannelMessages", payloads.channel_messages())
+    ):
+        size = len(payload.write())
+        elapsed = min(timeit.repeat(payload.write, number=rounds, repeat=5)) / rounds
+
+        print(f"{name:>32}: {elapsed * 1e6:8.1f} µs ({size / elapsed / 2 ** 20:6.1f} MiB/s, {size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
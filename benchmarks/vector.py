@@ -0,0 +1,48 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Vector decoding cost as payloads grow.
+
+Decodes updates.Difference payloads full of nested vectors (messages, entities, reactions, keyboard rows) from
+128 KiB up to 1 MiB. The time per KiB should stay flat: it used to grow with the payload size because every
+Vector copied the remainder of the buffer just to guess the size of its items.
+
+Usage: python -m benchmarks.vector [rounds]
+"""
+
+import sys
+import timeit
+
+from pyrogram.raw.core import TLObject, Reader
+from . import payloads
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    # Size added to the payload by each step of payloads.difference (a new message and an update)
+    step = len(payloads.difference(11).write()) - len(payloads.difference(10).write())
+
+    for kib in (128, 256, 512, 1024):
+        data = payloads.difference(kib * 1024 // step).write()
+        elapsed = min(timeit.repeat(lambda: TLObject.read(Reader(data)), number=rounds, repeat=3)) / rounds
+
+        print(f"{len(data) / 1024:8.0f} KiB: {elapsed * 1e3:8.2f} ms ({elapsed * 1e6 / (len(data) / 1024):6.1f} µs/KiB)")
+
+
+if __name__ == "__main__":
+    main()
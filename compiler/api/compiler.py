@@ -22,6 +22,7 @@ import re
 import shutil
 from functools import partial
 from pathlib import Path
+from struct import calcsize
 from typing import NamedTuple, List, Tuple
 
 # from autoflake import fix_code
@@ -42,6 +43,11 @@ INT_RE = re.compile(r"int(\d+)")
 
 CORE_TYPES = ["int", "long", "int128", "int256", "double", "bytes", "string", "Bool", "true"]
 
+# Fixed-width types that can be packed and unpacked together with a single Struct
+STRUCT_FORMATS = {"int": "i", "long": "q", "double": "d"}
+# Sizes of the other fixed-width core types, used to skip them
+CORE_SIZES = {"int128": 16, "int256": 32, "Bool": 4}
+
 WARNING = """
 # # # # # # # # # # # # # # # # # # # # # # # #
 #               !!! WARNING !!!               #
@@ -149,6 +155,80 @@ def sort_args(args):
     return args + flags
 
 
+def fuse(run: list, structs: dict) -> Tuple[str, str, str]:
+    """Generate the write, read and skip code of a run of consecutive fixed-width fields.
+
+    Each field is a (name, value, type, flag) tuple. Fields of a run share the same flag, so that they are either all
+    present or all missing, and runs longer than one field are packed and unpacked with a single precompiled Struct.
+    """
+    names = [i[0] for i in run]
+    values = [i[1] for i in run]
+    flag = run[0][3]
+    condition = f"flags{flag[0]} & (1 << {flag[1]})" if flag else None
+    fmt = "".join(STRUCT_FORMATS[i[2]] for i in run)
+
+    if len(run) == 1:
+        t = run[0][2]
+        write = [f"b += {t.title()}({values[0]})"]
+        read = [f"{names[0]} = b.read_{t}()" + (f" if {condition} else None" if condition else "")]
+
+        if condition:
+            write = [f"if {values[0]} is not None:", f"    {write[0]}"]
+    else:
+        struct = f"STRUCT_{fmt.upper()}"
+        structs[struct] = f"<{fmt}"
+
+        write = [f"b += {struct}.pack({', '.join(values)})"]
+        read = [
+            f"{', '.join(names)} = {struct}.unpack_from(b.buffer, b.offset)",
+            f"b.offset += {calcsize(f'<{fmt}')}"
+        ]
+
+        if condition:
+            write = [f"if {condition}:", *[f"    {i}" for i in write]]
+            read = [f"if {condition}:", *[f"    {i}" for i in read], "else:", f"    {' = '.join(names)} = None"]
+
+    # Flags are the only values needed to skip an object, everything else is jumped over
+    if any(i[0] == i[1] for i in run):
+        skip = read
+    else:
+        skip = [f"b.offset += {calcsize(f'<{fmt}')}"]
+
+        if condition:
+            skip = [f"if {condition}:", f"    {skip[0]}"]
+
+    return (
+        "\n        " + "\n        ".join(write) + "\n        ",
+        "\n        " + "\n        ".join(read) + "\n        ",
+        "\n        " + "\n        ".join(skip) + "\n        "
+    )
+
+
+def write_namespace(path: Path, notice: str, types: List[str], namespaces: List[str]):
+    """Write the __init__ of a namespace, whose members are only imported when first accessed (PEP 562)."""
+    modules = {t: snake("UpdatesT" if t == "Updates" else t) for t in types}
+    imports = [f"from .{module} import {t}" for t, module in modules.items()]
+
+    if namespaces:
+        imports.append(f"from . import {', '.join(namespaces)}")
+
+    with open(path, "w") as f:
+        f.write(f"{notice}\n\n")
+        f.write(f"{WARNING}\n\n")
+        f.write("from typing import TYPE_CHECKING\n\n")
+        f.write("from pyrogram.raw.core.loader import namespace\n\n")
+
+        # Keep the eager imports around for type checkers and IDEs
+        if imports:
+            f.write("if TYPE_CHECKING:\n")
+            f.write("".join(f"    {i}\n" for i in imports))
+            f.write("\n")
+
+        f.write("__getattr__, __dir__ = namespace(__name__, {\n")
+        f.write("".join(f'    "{t}": "{module}",\n' for t, module in modules.items()))
+        f.write("}, [" + ", ".join(f'"{n}"' for n in namespaces) + "])\n")
+
+
 def remove_whitespaces(source: str) -> str:
     """Remove whitespaces from blank lines"""
     lines = source.split("\n")
@@ -448,11 +528,40 @@ def start(format: bool = False):
                              f"            :nosignatures:\n\n" \
                              f"            " + references
 
-        write_types = read_types = "" if c.has_flags else "# No flags\n        "
+        write_types = read_types = skip_types = "" if c.has_flags else "# No flags\n        "
+        read_true_types = ""
+        structs = {}
+        run = []
 
         for arg_name, arg_type in c.args:
             flag = FLAGS_RE_2.match(arg_type)
 
+            if re.match(r"flags\d?", arg_name) and arg_type == "#":
+                field = (arg_name, arg_name, "int", None)
+            elif flag and flag.group(3) in STRUCT_FORMATS:
+                field = (arg_name, f"self.{arg_name}", flag.group(3), (flag.group(1), flag.group(2)))
+            elif not flag and arg_type in STRUCT_FORMATS:
+                field = (arg_name, f"self.{arg_name}", arg_type, None)
+            else:
+                field = None
+
+            # True flags take no space, so they don't break runs of fixed-width fields
+            if flag and flag.group(3) == "true":
+                number, index, _ = flag.groups()
+                read_true_types += f"{arg_name} = True if flags{number} & (1 << {index}) else False\n        "
+
+                continue
+
+            if run and (field is None or field[3] != run[0][3]):
+                write_run, read_run, skip_run = fuse(run, structs)
+                write_types += write_run
+                read_types += read_run
+                skip_types += skip_run
+                run = []
+
+            if field is not None:
+                run.append(field)
+
             if re.match(r"flags\d?", arg_name) and arg_type == "#":
                 write_flags = []
 
@@ -472,33 +581,45 @@ def start(format: bool = False):
                 write_flags = "\n        ".join([
                     f"{arg_name} = 0",
                     "\n        ".join(write_flags),
-                    f"b.write(Int({arg_name}))\n        "
+                    ""
                 ])
 
                 write_types += write_flags
-                read_types += f"\n        {arg_name} = Int.read(b)\n        "
 
                 continue
 
+            if field is not None:
+                continue
+
             if flag:
                 number, index, flag_type = flag.groups()
 
-                if flag_type == "true":
-                    read_types += "\n        "
-                    read_types += f"{arg_name} = True if flags{number} & (1 << {index}) else False"
-                elif flag_type in CORE_TYPES:
+                if flag_type in CORE_TYPES:
                     write_types += "\n        "
                     write_types += f"if self.{arg_name} is not None:\n            "
-                    write_types += f"b.write({flag_type.title()}(self.{arg_name}))\n        "
+                    write_types += (
+                        f"{flag_type.title()}.write_to(b, self.{arg_name})\n        "
+                        if flag_type in ("bytes", "string") else
+                        f"b += {flag_type.title()}(self.{arg_name})\n        "
+                    )
 
                     read_types += "\n        "
-                    read_types += f"{arg_name} = {flag_type.title()}.read(b) if flags{number} & (1 << {index}) else None"
+                    read_types += f"{arg_name} = b.read_{flag_type.lower()}() if flags{number} & (1 << {index}) else None"
+
+                    skip_types += "\n        "
+                    skip_types += f"if flags{number} & (1 << {index}):\n            "
+                    skip_types += (
+                        f"b.offset += {CORE_SIZES[flag_type]}\n        "
+                        if flag_type in CORE_SIZES else
+                        "b.skip_bytes()\n        "
+                    )
                 elif "vector" in flag_type.lower():
                     sub_type = arg_type.split("<")[1][:-1]
 
                     write_types += "\n        "
-                    write_types += f"if self.{arg_name} is not None:\n            "
-                    write_types += "b.write(Vector(self.{}{}))\n        ".format(
+                    # Must match the flag, which is only set for non-empty vectors
+                    write_types += f"if self.{arg_name}:\n            "
+                    write_types += "Vector.write_to(b, self.{}{})\n        ".format(
                         arg_name, f", {sub_type.title()}" if sub_type in CORE_TYPES else ""
                     )
 
@@ -506,25 +627,46 @@ def start(format: bool = False):
                     read_types += "{} = TLObject.read(b{}) if flags{} & (1 << {}) else []\n        ".format(
                         arg_name, f", {sub_type.title()}" if sub_type in CORE_TYPES else "", number, index
                     )
+
+                    skip_types += "\n        "
+                    skip_types += f"if flags{number} & (1 << {index}):\n            "
+                    skip_types += "TLObject.skip(b{})\n        ".format(
+                        f", {sub_type.title()}" if sub_type in CORE_TYPES else ""
+                    )
                 else:
                     write_types += "\n        "
                     write_types += f"if self.{arg_name} is not None:\n            "
-                    write_types += f"b.write(self.{arg_name}.write())\n        "
+                    write_types += f"self.{arg_name}.write_into(b)\n        "
 
                     read_types += "\n        "
                     read_types += f"{arg_name} = TLObject.read(b) if flags{number} & (1 << {index}) else None\n        "
+
+                    skip_types += "\n        "
+                    skip_types += f"if flags{number} & (1 << {index}):\n            "
+                    skip_types += "TLObject.skip(b)\n        "
             else:
                 if arg_type in CORE_TYPES:
                     write_types += "\n        "
-                    write_types += f"b.write({arg_type.title()}(self.{arg_name}))\n        "
+                    write_types += (
+                        f"{arg_type.title()}.write_to(b, self.{arg_name})\n        "
+                        if arg_type in ("bytes", "string") else
+                        f"b += {arg_type.title()}(self.{arg_name})\n        "
+                    )
 
                     read_types += "\n        "
-                    read_types += f"{arg_name} = {arg_type.title()}.read(b)\n        "
+                    read_types += f"{arg_name} = b.read_{arg_type.lower()}()\n        "
+
+                    skip_types += "\n        "
+                    skip_types += (
+                        f"b.offset += {CORE_SIZES[arg_type]}\n        "
+                        if arg_type in CORE_SIZES else
+                        "b.skip_bytes()\n        "
+                    )
                 elif "vector" in arg_type.lower():
                     sub_type = arg_type.split("<")[1][:-1]
 
                     write_types += "\n        "
-                    write_types += "b.write(Vector(self.{}{}))\n        ".format(
+                    write_types += "Vector.write_to(b, self.{}{})\n        ".format(
                         arg_name, f", {sub_type.title()}" if sub_type in CORE_TYPES else ""
                     )
 
@@ -532,13 +674,30 @@ def start(format: bool = False):
                     read_types += "{} = TLObject.read(b{})\n        ".format(
                         arg_name, f", {sub_type.title()}" if sub_type in CORE_TYPES else ""
                     )
+
+                    skip_types += "\n        "
+                    skip_types += "TLObject.skip(b{})\n        ".format(
+                        f", {sub_type.title()}" if sub_type in CORE_TYPES else ""
+                    )
                 else:
                     write_types += "\n        "
-                    write_types += f"b.write(self.{arg_name}.write())\n        "
+                    write_types += f"self.{arg_name}.write_into(b)\n        "
 
                     read_types += "\n        "
                     read_types += f"{arg_name} = TLObject.read(b)\n        "
 
+                    skip_types += "\n        "
+                    skip_types += "TLObject.skip(b)\n        "
+
+        if run:
+            write_run, read_run, skip_run = fuse(run, structs)
+            write_types += write_run
+            read_types += read_run
+            skip_types += skip_run
+
+        if read_true_types:
+            read_types += "\n        " + read_true_types
+
         slots = ", ".join([f'"{i[0]}"' for i in sorted_args])
         return_arguments = ", ".join([f"{i[0]}={i[0]}" for i in sorted_args])
 
@@ -554,7 +713,9 @@ def start(format: bool = False):
             fields=fields,
             read_types=read_types,
             write_types=write_types,
-            return_arguments=return_arguments
+            skip_types=(skip_types if c.args else skip_types + "pass").rstrip(),
+            return_arguments=return_arguments,
+            structs="".join(f'\n{k} = Struct("{v}")' for k, v in structs.items()) + "\n" if structs else ""
         )
 
         directory = "types" if c.section == "types" else c.section
@@ -579,58 +740,29 @@ def start(format: bool = False):
         d[c.namespace].append(c.name)
 
     for namespace, types in namespaces_to_types.items():
-        with open(DESTINATION_PATH / "base" / namespace / "__init__.py", "w") as f:
-            f.write(f"{notice}\n\n")
-            f.write(f"{WARNING}\n\n")
-
-            for t in types:
-                module = t
-
-                if module == "Updates":
-                    module = "UpdatesT"
-
-                f.write(f"from .{snake(module)} import {t}\n")
-
-            if not namespace:
-                f.write(f"from . import {', '.join(filter(bool, namespaces_to_types))}")
+        write_namespace(
+            DESTINATION_PATH / "base" / namespace / "__init__.py", notice, types,
+            [] if namespace else list(filter(bool, namespaces_to_types))
+        )
 
     for namespace, types in namespaces_to_constructors.items():
-        with open(DESTINATION_PATH / "types" / namespace / "__init__.py", "w") as f:
-            f.write(f"{notice}\n\n")
-            f.write(f"{WARNING}\n\n")
-
-            for t in types:
-                module = t
-
-                if module == "Updates":
-                    module = "UpdatesT"
-
-                f.write(f"from .{snake(module)} import {t}\n")
-
-            if not namespace:
-                f.write(f"from . import {', '.join(filter(bool, namespaces_to_constructors))}\n")
+        write_namespace(
+            DESTINATION_PATH / "types" / namespace / "__init__.py", notice, types,
+            [] if namespace else list(filter(bool, namespaces_to_constructors))
+        )
 
     for namespace, types in namespaces_to_functions.items():
-        with open(DESTINATION_PATH / "functions" / namespace / "__init__.py", "w") as f:
-            f.write(f"{notice}\n\n")
-            f.write(f"{WARNING}\n\n")
-
-            for t in types:
-                module = t
-
-                if module == "Updates":
-                    module = "UpdatesT"
-
-                f.write(f"from .{snake(module)} import {t}\n")
-
-            if not namespace:
-                f.write(f"from . import {', '.join(filter(bool, namespaces_to_functions))}")
+        write_namespace(
+            DESTINATION_PATH / "functions" / namespace / "__init__.py", notice, types,
+            [] if namespace else list(filter(bool, namespaces_to_functions))
+        )
 
     with open(DESTINATION_PATH / "all.py", "w", encoding="utf-8") as f:
         f.write(notice + "\n\n")
         f.write(WARNING + "\n\n")
+        f.write("from .core.loader import Objects\n\n")
         f.write(f"layer = {layer}\n\n")
-        f.write("objects = {")
+        f.write("objects = Objects({")
 
         for c in combinators:
             f.write(f'\n    {c.id}: "pyrogram.raw.{c.section}.{c.qualname}",')
@@ -644,7 +776,7 @@ def start(format: bool = False):
         f.write('\n    0x3072cfa1: "pyrogram.raw.core.GzipPacked",')
         f.write('\n    0x5bb8e511: "pyrogram.raw.core.Message",')
 
-        f.write("\n}\n")
+        f.write("\n})\n")
 
 
 if "__main__" == __name__:
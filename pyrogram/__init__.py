@@ -20,8 +20,6 @@ __version__ = "2.1.30"
 __license__ = "GNU Lesser General Public License v3.0 (LGPL-3.0)"
 __copyright__ = "Copyright (C) 2017-present Dan <https://github.com/delivrance>"
 
-from concurrent.futures.thread import ThreadPoolExecutor
-
 
 class StopTransmission(Exception):
     pass
@@ -39,4 +37,6 @@ from . import raw, types, filters, handlers, emoji, enums
 from .client import Client
 from .sync import idle, compose
 
-crypto_executor = ThreadPoolExecutor(1, thread_name_prefix="CryptoWorker")
+from .crypto.executor import CryptoExecutor
+
+crypto_executor = CryptoExecutor()
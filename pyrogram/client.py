@@ -24,10 +24,11 @@ import os
 import platform
 import re
 import shutil
+import struct
 import sys
+from collections import defaultdict, deque
 from concurrent.futures.thread import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from hashlib import sha256
 from importlib import import_module
 from io import StringIO, BytesIO
 from mimetypes import MimeTypes
@@ -39,12 +40,12 @@ from pyrogram import __version__, __license__
 from pyrogram import enums
 from pyrogram import raw
 from pyrogram import utils
-from pyrogram.crypto import aes
+from pyrogram.crypto import cdn
 from pyrogram.errors import CDNFileHashMismatch
 from pyrogram.errors import (
     SessionPasswordNeeded,
     VolumeLocNotFound, ChannelPrivate,
-    BadRequest, AuthBytesInvalid,
+    BadRequest, AuthBytesInvalid, Unauthorized,
     FloodWait, FloodPremiumWait,
     ChannelInvalid, PersistentTimestampInvalid, PersistentTimestampOutdated
 )
@@ -194,6 +195,12 @@ class Client(Methods):
             A value that is too high may result in network related issues.
             Defaults to 1.
 
+        max_download_window (``int``, *optional*):
+            Set the maximum amount of file chunks (1 MiB each) that a single download keeps requesting in parallel.
+            The actual amount grows and shrinks within this limit depending on the measured round trip times.
+            Pass 1 to request chunks one at a time.
+            Defaults to 4.
+
         max_message_cache_size (``int``, *optional*):
             Set the maximum size of the message cache.
             Defaults to 10000.
@@ -209,6 +216,32 @@ class Client(Methods):
         init_connection_params (:obj:`~pyrogram.raw.base.JSONValue`, *optional*):
             Additional initConnection parameters.
             For now, only the tz_offset field is supported, for specifying timezone offset in seconds.
+
+        lazy_decoding (``bool``, *optional*):
+            Pass True to decode the nested raw objects of incoming updates and responses only when they are first
+            accessed (e.g.: the media, entities or reply markup of a message).
+            Useful for clients handling raw updates that filter most of them away.
+            Defaults to False (raw objects are fully decoded as soon as they are received).
+
+        connections (``int``, *optional*):
+            Number of TCP connections the main session opens to its data center.
+            All of them share the same authorization key and session, requests go out on whichever connection is free
+            and responses are accepted from any of them. Useful for busy clients, so that big uploads or slow sockets
+            don't hold back the other requests.
+            Defaults to 1.
+
+        warm_up_dcs (``bool`` | List of ``int``, *optional*):
+            Pass True to open the media sessions of the current DC and of the DCs files were previously downloaded
+            from in background as soon as the client is initialized, or pass a list of DC IDs to choose them yourself.
+            This way the first downloads from those DCs don't have to wait for their sessions to be set up.
+            Await ``client.media_sessions_ready.wait()`` in case you need them to be ready.
+            Defaults to False.
+
+        ordered_updates (``bool``, *optional*):
+            Pass True to handle the updates of each chat one at a time and in the order they arrived, while updates of
+            different chats are still handled in parallel by the *workers*. Every chat is assigned to one worker, so
+            that handlers keeping per-chat state (e.g.: conversations) work with any number of workers.
+            Defaults to False (updates are handled by whichever worker is free, possibly out of order).
     """
 
     APP_VERSION = f"Pyrogram {__version__}"
@@ -229,6 +262,8 @@ class Client(Methods):
     UPDATES_WATCHDOG_INTERVAL = 15 * 60
 
     MAX_CONCURRENT_TRANSMISSIONS = 1
+    MAX_DOWNLOAD_WINDOW = 4
+    CDN_FILE_HASHES_CACHE_SIZE = 100
     MAX_MESSAGE_CACHE_SIZE = 10000
 
     mimetypes = MimeTypes()
@@ -264,12 +299,17 @@ class Client(Methods):
         sleep_threshold: int = Session.SLEEP_THRESHOLD,
         hide_password: Optional[bool] = False,
         max_concurrent_transmissions: int = MAX_CONCURRENT_TRANSMISSIONS,
+        max_download_window: int = MAX_DOWNLOAD_WINDOW,
         max_message_cache_size: int = MAX_MESSAGE_CACHE_SIZE,
         storage_engine: Optional[Storage] = None,
         client_platform: "enums.ClientPlatform" = enums.ClientPlatform.OTHER,
         init_connection_params: Optional["raw.base.JSONValue"] = None,
         connection_factory: Type[Connection] = Connection,
-        protocol_factory: Type[TCP] = TCPAbridged
+        protocol_factory: Type[TCP] = TCPAbridged,
+        lazy_decoding: bool = False,
+        connections: int = 1,
+        warm_up_dcs: Union[bool, List[int]] = False,
+        ordered_updates: bool = False
     ):
         super().__init__()
 
@@ -301,11 +341,16 @@ class Client(Methods):
         self.sleep_threshold = sleep_threshold
         self.hide_password = hide_password
         self.max_concurrent_transmissions = max_concurrent_transmissions
+        self.max_download_window = max_download_window
         self.max_message_cache_size = max_message_cache_size
         self.client_platform = client_platform
         self.init_connection_params = init_connection_params
         self.connection_factory = connection_factory
         self.protocol_factory = protocol_factory
+        self.lazy_decoding = lazy_decoding
+        self.connections = connections
+        self.warm_up_dcs = warm_up_dcs
+        self.ordered_updates = ordered_updates
 
         self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="Handler")
 
@@ -334,7 +379,14 @@ class Client(Methods):
         self.sessions_lock = asyncio.Lock()
 
         self.media_sessions = {}
-        self.media_sessions_lock = asyncio.Lock()
+        self.media_session_locks = defaultdict(asyncio.Lock)
+
+        self.cdn_sessions = {}
+        self.cdn_sessions_lock = asyncio.Lock()
+        self.cdn_file_hashes = Cache(self.CDN_FILE_HASHES_CACHE_SIZE)
+
+        self.warm_up_task = None
+        self.media_sessions_ready = asyncio.Event()
 
         self.save_file_semaphore = asyncio.Semaphore(self.max_concurrent_transmissions)
         self.get_file_semaphore = asyncio.Semaphore(self.max_concurrent_transmissions)
@@ -948,10 +1000,14 @@ class Client(Methods):
                 log.warning('[%s] No plugin loaded from "%s"', self.name, root)
 
     async def handle_download(self, packet):
-        file_id, directory, file_name, in_memory, file_size, progress, progress_args = packet
+        file_id, directory, file_name, in_memory, file_size, progress, progress_args, resume = packet
 
         os.makedirs(directory, exist_ok=True) if not in_memory else None
         temp_file_path = os.path.abspath(re.sub("\\\\", "/", os.path.join(directory, file_name))) + ".temp"
+
+        if resume and not in_memory and file_size:
+            return await self.handle_resumable_download(file_id, temp_file_path, file_size, progress, progress_args)
+
         file = BytesIO() if in_memory else open(temp_file_path, "wb")
 
         try:
@@ -979,54 +1035,371 @@ class Client(Methods):
                 shutil.move(temp_file_path, file_path)
                 return file_path
 
-    async def get_file(
+    async def handle_resumable_download(
         self,
         file_id: FileId,
-        file_size: int = 0,
-        limit: int = 0,
-        offset: int = 0,
-        progress: Callable = None,
-        progress_args: tuple = ()
-    ) -> AsyncGenerator[bytes, None]:
-        async with self.get_file_semaphore:
-            file_type = file_id.file_type
+        temp_file_path: str,
+        file_size: int,
+        progress: Callable,
+        progress_args: tuple
+    ) -> Optional[str]:
+        chunk_size = 1024 * 1024
+        parts = DownloadParts(temp_file_path + ".parts", file_id.media_id or 0, file_size, chunk_size)
+        resumed = os.path.isfile(temp_file_path) and os.path.getsize(temp_file_path) == file_size
+
+        resumed = parts.open(resumed)
+        file = open(temp_file_path, "r+b" if resumed else "w+b", buffering=0)
+
+        if resumed:
+            log.info("Resuming download of %s (%s/%s chunks)", temp_file_path, len(parts), parts.count)
+        else:
+            try:
+                os.posix_fallocate(file.fileno(), 0, file_size)
+            except (AttributeError, OSError):
+                file.truncate(file_size)
+
+        async def report():
+            if progress:
+                func = functools.partial(
+                    progress,
+                    min(len(parts) * chunk_size, file_size),
+                    file_size,
+                    *progress_args
+                )
+
+                if inspect.iscoroutinefunction(progress):
+                    await func()
+                else:
+                    await self.loop.run_in_executor(self.executor, func)
+
+        def write(index: int, chunk: bytes):
+            # Chunks arrive out of order and are written straight into place, only then they are marked as done
+            if len(chunk) != min(chunk_size, file_size - index * chunk_size):
+                raise ValueError(f"Unexpected size of chunk {index}: {len(chunk)}")
+
+            file.seek(index * chunk_size)
+            file.write(chunk)
+            parts.add(index)
+
+        async def get_chunk(index: int):
+            start = self.loop.time()
+
+            result = await session.invoke(
+                raw.functions.upload.GetFile(
+                    location=location,
+                    offset=index * chunk_size,
+                    limit=chunk_size
+                ),
+                sleep_threshold=30
+            )
+
+            window.update(self.loop.time() - start)
+
+            return index, result
+
+        missing = iter(parts.missing())
+        pending = set()
+        cdn = False
+
+        try:
+            async with self.get_file_semaphore:
+                location = self.get_file_location(file_id)
+                session = await self.get_media_session(file_id.dc_id)
+                window = DownloadWindow(self.max_download_window)
+
+                try:
+                    while not cdn:
+                        while len(pending) < window.size:
+                            index = next(missing, None)
+
+                            if index is None:
+                                break
+
+                            pending.add(self.loop.create_task(get_chunk(index)))
+
+                        if not pending:
+                            break
+
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                        for task in done:
+                            index, r = task.result()
+
+                            if isinstance(r, raw.types.upload.FileCdnRedirect):
+                                cdn = True
+                            else:
+                                write(index, r.bytes)
+                                await report()
+                finally:
+                    for task in pending:
+                        task.cancel()
+
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+            if cdn:
+                # CDN chunks have to be decrypted and verified, get_file takes care of that one chunk at a time
+                index = parts.missing()[0]
 
-            if file_type == FileType.CHAT_PHOTO:
-                if file_id.chat_id > 0:
-                    peer = raw.types.InputPeerUser(
-                        user_id=file_id.chat_id,
+                async for chunk in self.get_file(file_id, file_size, 0, index, progress, progress_args):
+                    write(index, chunk)
+                    index += 1
+
+                if len(parts) < parts.count:
+                    raise ValueError("CDN download ended early")
+        except BaseException as e:
+            # Both the temporary file and the parts already downloaded are kept, so that the download can be resumed
+            file.close()
+            parts.close()
+
+            if isinstance(e, asyncio.CancelledError):
+                raise e
+
+            if isinstance(e, (FloodWait, FloodPremiumWait)):
+                raise e
+
+            if not isinstance(e, pyrogram.StopTransmission):
+                log.exception(e)
+
+            return None
+        else:
+            file.close()
+            parts.close()
+            os.remove(parts.path)
+
+            file_path = os.path.splitext(temp_file_path)[0]
+            shutil.move(temp_file_path, file_path)
+            return file_path
+
+    @staticmethod
+    def get_file_location(file_id: FileId) -> "raw.base.InputFileLocation":
+        file_type = file_id.file_type
+
+        if file_type == FileType.CHAT_PHOTO:
+            if file_id.chat_id > 0:
+                peer = raw.types.InputPeerUser(
+                    user_id=file_id.chat_id,
+                    access_hash=file_id.chat_access_hash
+                )
+            else:
+                if file_id.chat_access_hash == 0:
+                    peer = raw.types.InputPeerChat(
+                        chat_id=-file_id.chat_id
+                    )
+                else:
+                    peer = raw.types.InputPeerChannel(
+                        channel_id=utils.get_channel_id(file_id.chat_id),
                         access_hash=file_id.chat_access_hash
                     )
+
+            location = raw.types.InputPeerPhotoFileLocation(
+                peer=peer,
+                photo_id=file_id.media_id,
+                big=file_id.thumbnail_source == ThumbnailSource.CHAT_PHOTO_BIG
+            )
+        elif file_type == FileType.PHOTO:
+            location = raw.types.InputPhotoFileLocation(
+                id=file_id.media_id,
+                access_hash=file_id.access_hash,
+                file_reference=file_id.file_reference,
+                thumb_size=file_id.thumbnail_size
+            )
+        else:
+            location = raw.types.InputDocumentFileLocation(
+                id=file_id.media_id,
+                access_hash=file_id.access_hash,
+                file_reference=file_id.file_reference,
+                thumb_size=file_id.thumbnail_size
+            )
+
+        return location
+
+    async def get_media_session(self, dc_id: int) -> Session:
+        session = self.media_sessions.get(dc_id)
+        if session:
+            return session
+
+        # A single session per DC, even when it's requested by downloads and the warm-up at the same time
+        async with self.media_session_locks[dc_id]:
+            session = self.media_sessions.get(dc_id)
+            if not session:
+                if dc_id != await self.storage.dc_id():
+                    session = self.media_sessions[dc_id] = await self.start_dc_session(dc_id, is_media=True)
                 else:
-                    if file_id.chat_access_hash == 0:
-                        peer = raw.types.InputPeerChat(
-                            chat_id=-file_id.chat_id
-                        )
-                    else:
-                        peer = raw.types.InputPeerChannel(
-                            channel_id=utils.get_channel_id(file_id.chat_id),
-                            access_hash=file_id.chat_access_hash
-                        )
+                    session = self.media_sessions[dc_id] = Session(
+                        self, dc_id, await self.storage.auth_key(),
+                        await self.storage.test_mode(), is_media=True
+                    )
+                    await session.start()
 
-                location = raw.types.InputPeerPhotoFileLocation(
-                    peer=peer,
-                    photo_id=file_id.media_id,
-                    big=file_id.thumbnail_source == ThumbnailSource.CHAT_PHOTO_BIG
-                )
-            elif file_type == FileType.PHOTO:
-                location = raw.types.InputPhotoFileLocation(
-                    id=file_id.media_id,
-                    access_hash=file_id.access_hash,
-                    file_reference=file_id.file_reference,
-                    thumb_size=file_id.thumbnail_size
+        return session
+
+    async def warm_up_media_sessions(self):
+        if self.warm_up_dcs is True:
+            dc_ids = [await self.storage.dc_id()]
+
+            for dc_id in range(1, 6):
+                if dc_id not in dc_ids and await self.storage.exported_auth_key(dc_id) is not None:
+                    dc_ids.append(dc_id)
+        else:
+            dc_ids = list(self.warm_up_dcs)
+
+        log.info("Warming up media sessions for DCs %s", dc_ids)
+
+        results = await asyncio.gather(*[self.get_media_session(dc_id) for dc_id in dc_ids], return_exceptions=True)
+
+        for dc_id, result in zip(dc_ids, results):
+            if isinstance(result, Exception):
+                log.warning("Unable to warm up the media session for DC%s: %s", dc_id, result)
+
+        self.media_sessions_ready.set()
+
+    async def start_dc_session(self, dc_id: int, is_media: bool = False) -> Session:
+        """Start a session on a DC other than the one of the main session, authorized as the current user.
+
+        The authorization key of the DC is kept in the storage, so that the handshake and the authorization export and
+        import are only done the first time or in case the key stops being valid.
+        """
+        test_mode = await self.storage.test_mode()
+        auth_key = await self.storage.exported_auth_key(dc_id)
+
+        if auth_key is not None:
+            session = Session(self, dc_id, auth_key, test_mode, is_media=is_media)
+
+            try:
+                await session.start()
+                await session.invoke(raw.functions.users.GetUsers(id=[raw.types.InputUserSelf()]))
+            except Unauthorized as e:
+                log.info("Stored authorization key for DC%s is no longer valid: %s", dc_id, e)
+
+                await session.stop()
+                await self.storage.exported_auth_key(dc_id, None)
+            except BaseException:
+                await session.stop()
+                raise
+            else:
+                return session
+
+        auth_key = await Auth(self, dc_id, test_mode).create()
+        session = Session(self, dc_id, auth_key, test_mode, is_media=is_media)
+
+        try:
+            await session.start()
+
+            for _ in range(3):
+                exported_auth = await self.invoke(
+                    raw.functions.auth.ExportAuthorization(
+                        dc_id=dc_id
+                    )
                 )
+
+                try:
+                    await session.invoke(
+                        raw.functions.auth.ImportAuthorization(
+                            id=exported_auth.id,
+                            bytes=exported_auth.bytes
+                        )
+                    )
+                except AuthBytesInvalid:
+                    continue
+                else:
+                    break
             else:
-                location = raw.types.InputDocumentFileLocation(
-                    id=file_id.media_id,
-                    access_hash=file_id.access_hash,
-                    file_reference=file_id.file_reference,
-                    thumb_size=file_id.thumbnail_size
+                raise AuthBytesInvalid
+        except BaseException:
+            await session.stop()
+            raise
+
+        await self.storage.exported_auth_key(dc_id, auth_key)
+
+        return session
+
+    async def get_cdn_session(self, dc_id: int) -> Session:
+        session = self.cdn_sessions.get(dc_id)
+        if session:
+            return session
+
+        async with self.cdn_sessions_lock:
+            session = self.cdn_sessions.get(dc_id)
+            if not session:
+                test_mode = await self.storage.test_mode()
+
+                session = Session(
+                    self, dc_id, await Auth(self, dc_id, test_mode).create(),
+                    test_mode, is_media=True, is_cdn=True
                 )
+                await session.start()
+
+                self.cdn_sessions[dc_id] = session
+
+        return session
+
+    async def drop_cdn_session(self, dc_id: int, session: Session):
+        async with self.cdn_sessions_lock:
+            if self.cdn_sessions.get(dc_id) is session:
+                self.cdn_sessions.pop(dc_id)
+
+        await session.stop()
+
+    def cache_cdn_file_hashes(self, file_token: bytes, hashes: List["raw.types.FileHash"]) -> dict:
+        file_hashes = self.cdn_file_hashes[file_token]
+
+        if file_hashes is None:
+            file_hashes = self.cdn_file_hashes[file_token] = {}
+
+        for h in hashes:
+            file_hashes[h.offset] = h
+
+        return file_hashes
+
+    async def get_cdn_file_hashes(
+        self,
+        session: Session,
+        file_token: bytes,
+        offset: int,
+        length: int
+    ) -> List["raw.types.FileHash"]:
+        """Get the hashes of the parts of a CDN file that are needed to verify the chunk at offset.
+
+        Hashes come in batches covering more than a single chunk, they are cached by file token so that most chunks
+        don't need to ask for them.
+        """
+        file_hashes = self.cache_cdn_file_hashes(file_token, [])
+
+        hashes = []
+        position = offset
+
+        while position < offset + length:
+            if position not in file_hashes:
+                file_hashes = self.cache_cdn_file_hashes(
+                    file_token,
+                    await session.invoke(
+                        raw.functions.upload.GetCdnFileHashes(
+                            file_token=file_token,
+                            offset=position
+                        )
+                    )
+                )
+
+            h = file_hashes.get(position)
+
+            CDNFileHashMismatch.check(h is not None, "h is not None")
+
+            hashes.append(h)
+            position += h.limit
+
+        return hashes
+
+    async def get_file(
+        self,
+        file_id: FileId,
+        file_size: int = 0,
+        limit: int = 0,
+        offset: int = 0,
+        progress: Callable = None,
+        progress_args: tuple = ()
+    ) -> AsyncGenerator[bytes, None]:
+        async with self.get_file_semaphore:
+            location = self.get_file_location(file_id)
 
             current = 0
             total = abs(limit) or (1 << 31) - 1
@@ -1034,50 +1407,32 @@ class Client(Methods):
             offset_bytes = abs(offset) * chunk_size
 
             dc_id = file_id.dc_id
+            requests = deque()
+            file_token = None
 
             try:
-                session = self.media_sessions.get(dc_id)
-                if not session:
-                    session = self.media_sessions[dc_id] = Session(
-                        self, dc_id,
-                        await Auth(self, dc_id, await self.storage.test_mode()).create()
-                        if dc_id != await self.storage.dc_id()
-                        else await self.storage.auth_key(),
-                        await self.storage.test_mode(),
-                        is_media=True
+                session = await self.get_media_session(dc_id)
+
+                async def get_chunk(offset: int):
+                    start = self.loop.time()
+
+                    result = await session.invoke(
+                        raw.functions.upload.GetFile(
+                            location=location,
+                            offset=offset,
+                            limit=chunk_size
+                        ),
+                        sleep_threshold=30
                     )
-                    await session.start()
 
-                    if dc_id != await self.storage.dc_id():
-                        for _ in range(3):
-                            exported_auth = await self.invoke(
-                                raw.functions.auth.ExportAuthorization(
-                                    dc_id=dc_id
-                                )
-                            )
+                    window.update(self.loop.time() - start)
 
-                            try:
-                                await session.invoke(
-                                    raw.functions.auth.ImportAuthorization(
-                                        id=exported_auth.id,
-                                        bytes=exported_auth.bytes
-                                    )
-                                )
-                            except AuthBytesInvalid:
-                                continue
-                            else:
-                                break
-                        else:
-                            raise AuthBytesInvalid
+                    return result
 
-                r = await session.invoke(
-                    raw.functions.upload.GetFile(
-                        location=location,
-                        offset=offset_bytes,
-                        limit=chunk_size
-                    ),
-                    sleep_threshold=30
-                )
+                window = DownloadWindow(self.max_download_window)
+                next_offset = offset_bytes + chunk_size
+
+                r = await get_chunk(offset_bytes)
 
                 if isinstance(r, raw.types.upload.File):
                     while True:
@@ -1106,25 +1461,27 @@ class Client(Methods):
                         if len(chunk) < chunk_size or current >= total:
                             break
 
-                        r = await session.invoke(
-                            raw.functions.upload.GetFile(
-                                location=location,
-                                offset=offset_bytes,
-                                limit=chunk_size
-                            ),
-                            sleep_threshold=30
-                        )
+                        # Keep the following chunks on their way while this one is being consumed. Responses are
+                        # awaited in the same order they were requested, so chunks are still yielded in order.
+                        while not requests or (
+                            len(requests) < window.size
+                            and current + len(requests) < total
+                            and (not file_size or next_offset < file_size)
+                        ):
+                            requests.append(self.loop.create_task(get_chunk(next_offset)))
+                            next_offset += chunk_size
+
+                        r = await requests.popleft()
 
                 elif isinstance(r, raw.types.upload.FileCdnRedirect):
-                    cdn_session = Session(
-                        self, r.dc_id, await Auth(self, r.dc_id, await self.storage.test_mode()).create(),
-                        await self.storage.test_mode(), is_media=True, is_cdn=True
-                    )
+                    file_token = r.file_token
+                    self.cache_cdn_file_hashes(file_token, r.file_hashes)
 
-                    try:
-                        await cdn_session.start()
+                    cdn_session = await self.get_cdn_session(r.dc_id)
+                    cdn_session_retried = False
 
-                        while True:
+                    while True:
+                        try:
                             r2 = await cdn_session.invoke(
                                 raw.functions.upload.GetCdnFile(
                                     file_token=r.file_token,
@@ -1132,77 +1489,82 @@ class Client(Methods):
                                     limit=chunk_size
                                 )
                             )
+                        except (Unauthorized, OSError):
+                            # The CDN session is shared, make sure a broken one is not reused by the next downloads
+                            await self.drop_cdn_session(r.dc_id, cdn_session)
 
-                            if isinstance(r2, raw.types.upload.CdnFileReuploadNeeded):
-                                try:
+                            if cdn_session_retried:
+                                raise
+
+                            cdn_session = await self.get_cdn_session(r.dc_id)
+                            cdn_session_retried = True
+                            continue
+
+                        cdn_session_retried = False
+
+                        if isinstance(r2, raw.types.upload.CdnFileReuploadNeeded):
+                            try:
+                                self.cache_cdn_file_hashes(
+                                    r.file_token,
                                     await session.invoke(
                                         raw.functions.upload.ReuploadCdnFile(
                                             file_token=r.file_token,
                                             request_token=r2.request_token
                                         )
                                     )
-                                except VolumeLocNotFound:
-                                    break
-                                else:
-                                    continue
-
-                            chunk = r2.bytes
-
-                            # https://core.telegram.org/cdn#decrypting-files
-                            decrypted_chunk = aes.ctr256_decrypt(
-                                chunk,
-                                r.encryption_key,
-                                bytearray(
-                                    r.encryption_iv[:-4]
-                                    + (offset_bytes // 16).to_bytes(4, "big")
                                 )
-                            )
-
-                            hashes = await session.invoke(
-                                raw.functions.upload.GetCdnFileHashes(
-                                    file_token=r.file_token,
-                                    offset=offset_bytes
-                                )
-                            )
+                            except VolumeLocNotFound:
+                                break
+                            else:
+                                continue
 
-                            # https://core.telegram.org/cdn#verifying-files
-                            for i, h in enumerate(hashes):
-                                cdn_chunk = decrypted_chunk[h.limit * i: h.limit * (i + 1)]
-                                CDNFileHashMismatch.check(
-                                    h.hash == sha256(cdn_chunk).digest(),
-                                    "h.hash == sha256(cdn_chunk).digest()"
-                                )
+                        chunk = r2.bytes
+
+                        decrypted_chunk = await pyrogram.crypto_executor.run(
+                            r.file_token,
+                            len(chunk),
+                            cdn.decrypt_chunk,
+                            chunk,
+                            r.encryption_key,
+                            r.encryption_iv,
+                            offset_bytes,
+                            await self.get_cdn_file_hashes(session, r.file_token, offset_bytes, len(chunk))
+                        )
 
-                            yield decrypted_chunk
+                        yield decrypted_chunk
 
-                            current += 1
-                            offset_bytes += chunk_size
+                        current += 1
+                        offset_bytes += chunk_size
 
-                            if progress:
-                                func = functools.partial(
-                                    progress,
-                                    min(offset_bytes, file_size) if file_size != 0 else offset_bytes,
-                                    file_size,
-                                    *progress_args
-                                )
+                        if progress:
+                            func = functools.partial(
+                                progress,
+                                min(offset_bytes, file_size) if file_size != 0 else offset_bytes,
+                                file_size,
+                                *progress_args
+                            )
 
-                                if inspect.iscoroutinefunction(progress):
-                                    await func()
-                                else:
-                                    await self.loop.run_in_executor(self.executor, func)
+                            if inspect.iscoroutinefunction(progress):
+                                await func()
+                            else:
+                                await self.loop.run_in_executor(self.executor, func)
 
-                            if len(chunk) < chunk_size or current >= total:
-                                break
-                    except Exception as e:
-                        raise e
-                    finally:
-                        await cdn_session.stop()
+                        if len(chunk) < chunk_size or current >= total:
+                            break
             except pyrogram.StopTransmission:
                 raise
             except (FloodWait, FloodPremiumWait):
                 raise
             except Exception as e:
                 log.exception(e)
+            finally:
+                for task in requests:
+                    task.cancel()
+
+                await asyncio.gather(*requests, return_exceptions=True)
+
+                if file_token is not None:
+                    self.cdn_file_hashes.pop(file_token)
 
     def guess_mime_type(self, filename: str) -> Optional[str]:
         return self.mimetypes.guess_type(filename)[0]
@@ -1211,6 +1573,96 @@ class Client(Methods):
         return self.mimetypes.guess_extension(mime_type)
 
 
+class DownloadWindow:
+    """Amount of file chunks that are requested in parallel by a download.
+
+    The window grows by one for every response that arrives in less than twice the smallest round trip time seen so
+    far and shrinks by one otherwise, so that it stops growing as soon as requests start queueing up somewhere.
+    """
+
+    RTT_TOLERANCE = 2
+
+    def __init__(self, max_size: int):
+        self.max_size = max(1, max_size)
+        self.size = 1
+        self.min_rtt = None
+
+    def update(self, rtt: float):
+        if self.min_rtt is None or rtt < self.min_rtt:
+            self.min_rtt = rtt
+
+        if rtt < self.min_rtt * self.RTT_TOLERANCE:
+            self.size = min(self.size + 1, self.max_size)
+        else:
+            self.size = max(self.size - 1, 1)
+
+
+class DownloadParts:
+    """Bitmap of the chunks of a resumable download that have already been written to its temporary file.
+
+    The bitmap is kept in a small file next to the temporary one and is updated as soon as a chunk is written, so
+    that an interrupted download can be resumed from the chunks that are still missing.
+    """
+
+    HEADER = struct.Struct("<4sqqi")  # Magic, media id, file size, chunk size
+    MAGIC = b"PGDP"
+
+    def __init__(self, path: str, media_id: int, file_size: int, chunk_size: int):
+        self.path = path
+        self.count = -(-file_size // chunk_size)
+        self.header = self.HEADER.pack(self.MAGIC, media_id, file_size, chunk_size)
+        self.bitmap = bytearray(-(-self.count // 8))
+        self.done = 0
+        self.file = None
+
+    def open(self, resume: bool = True) -> bool:
+        """Load the bitmap of a previous attempt of the same download, if any and if resume is True.
+
+        Returns True in case a previous attempt was loaded, False in case the download starts from scratch.
+        """
+        data = b""
+
+        if resume:
+            try:
+                with open(self.path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                pass
+
+        resumed = data[:self.HEADER.size] == self.header and len(data) == self.HEADER.size + len(self.bitmap)
+
+        if resumed:
+            self.bitmap[:] = data[self.HEADER.size:]
+            self.done = sum(bin(b).count("1") for b in self.bitmap)
+
+        self.file = open(self.path, "r+b" if resumed else "w+b", buffering=0)
+
+        if not resumed:
+            self.file.write(self.header + self.bitmap)
+
+        return resumed
+
+    def close(self):
+        self.file.close()
+
+    def add(self, index: int):
+        if index not in self:
+            self.bitmap[index >> 3] |= 1 << (index & 7)
+            self.done += 1
+
+            self.file.seek(self.HEADER.size + (index >> 3))
+            self.file.write(self.bitmap[index >> 3:(index >> 3) + 1])
+
+    def missing(self) -> List[int]:
+        return [i for i in range(self.count) if i not in self]
+
+    def __contains__(self, index: int) -> bool:
+        return bool(self.bitmap[index >> 3] >> (index & 7) & 1)
+
+    def __len__(self) -> int:
+        return self.done
+
+
 class Cache:
     def __init__(self, capacity: int):
         self.capacity = capacity
@@ -1228,3 +1680,6 @@ class Cache:
         if len(self.store) > self.capacity:
             for _ in range(self.capacity // 2 + 1):
                 del self.store[next(iter(self.store))]
+
+    def pop(self, key):
+        return self.store.pop(key, None)
@@ -16,6 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+from .stream import Stream, ReaderStream
 from .tcp import TCP, Proxy
 from .tcp_abridged import TCPAbridged
 from .tcp_abridged_o import TCPAbridgedO
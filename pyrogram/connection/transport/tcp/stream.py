@@ -0,0 +1,276 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+from typing import Callable, Optional, Union
+
+
+class Stream(asyncio.BufferedProtocol):
+    """Receiving end of a TCP connection, reading straight from the socket into preallocated buffers.
+
+    Reads of up to :attr:`BUFFER_SIZE` bytes (length prefixes, small frames) are served from a staging buffer that is
+    reused for the whole connection. Bigger reads get a buffer of their own that the socket fills in place, which is
+    then handed over as a memoryview, so big frames are never copied nor accumulated chunk by chunk.
+
+    A read gives up (returning None) once nothing at all has been received for ``timeout`` seconds. A single timer is
+    kept for this, instead of one for each read.
+
+    Incoming data can be transformed in place as soon as it arrives with :attr:`decrypt`, for transports whose whole
+    stream is encrypted.
+    """
+
+    BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.loop = asyncio.get_event_loop()
+        self.transport: Optional[asyncio.Transport] = None
+        self.decrypt: Optional[Callable[[memoryview], bytes]] = None
+
+        self.buffer = bytearray(self.BUFFER_SIZE)
+        self.start = 0
+        self.end = 0
+
+        # Buffer of the big read in progress, if any, and how much of it is filled
+        self.frame: Optional[memoryview] = None
+        self.filled = 0
+
+        self.wanted = 0
+        self.waiter: Optional[asyncio.Future] = None
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.last_received = 0.0
+
+        self.closed = False
+        self.lost = self.loop.create_future()
+        self.paused = False
+        self.drained: Optional[asyncio.Future] = None
+
+    def connection_made(self, transport: asyncio.Transport):
+        self.transport = transport
+        self.last_received = self.loop.time()
+
+    def connection_lost(self, exc: Optional[Exception]):
+        self.closed = True
+        self.wake(False)
+
+        if not self.lost.done():
+            self.lost.set_result(None)
+
+        if self.drained is not None and not self.drained.done():
+            self.drained.set_result(None)
+
+    def eof_received(self) -> bool:
+        self.closed = True
+        self.wake(False)
+
+        return False
+
+    def pause_writing(self):
+        self.paused = True
+
+    def resume_writing(self):
+        self.paused = False
+
+        if self.drained is not None and not self.drained.done():
+            self.drained.set_result(None)
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        if self.frame is not None:
+            return self.frame[self.filled:]
+
+        if self.end == len(self.buffer):
+            # Move the unread bytes back to the beginning (the size doesn't change, views may still be around)
+            self.buffer[:self.end - self.start] = self.buffer[self.start:self.end]
+            self.end -= self.start
+            self.start = 0
+
+        return memoryview(self.buffer)[self.end:]
+
+    def buffer_updated(self, nbytes: int):
+        self.last_received = self.loop.time()
+
+        if self.frame is not None:
+            if self.decrypt is not None:
+                view = self.frame[self.filled:self.filled + nbytes]
+                view[:] = self.decrypt(view)
+
+            self.filled += nbytes
+
+            if self.filled == len(self.frame):
+                # Further data goes to the staging buffer again, even before the reader gets to run
+                self.frame = None
+                self.wake(True)
+        else:
+            if self.decrypt is not None:
+                view = memoryview(self.buffer)[self.end:self.end + nbytes]
+                view[:] = self.decrypt(view)
+                view.release()
+
+            self.end += nbytes
+
+            if self.waiter is not None and self.end - self.start >= self.wanted:
+                self.wake(True)
+            elif self.start == 0 and self.end == len(self.buffer):
+                # Nobody is reading, stop receiving until there's room again
+                self.transport.pause_reading()
+
+    async def read(self, n: int) -> Optional[Union[bytes, memoryview]]:
+        if self.end - self.start < n and n > self.BUFFER_SIZE:
+            return await self.read_frame(n)
+
+        if self.end - self.start < n:
+            if self.start + n > len(self.buffer):
+                self.buffer[:self.end - self.start] = self.buffer[self.start:self.end]
+                self.end -= self.start
+                self.start = 0
+
+            self.transport.resume_reading()
+
+            if not await self.wait(n):
+                return None
+
+        with memoryview(self.buffer) as view:
+            data = view[self.start:self.start + n].tobytes()
+
+        self.start += n
+
+        if self.start == self.end:
+            self.start = self.end = 0
+
+        return data
+
+    async def read_frame(self, n: int) -> Optional[memoryview]:
+        frame = memoryview(bytearray(n))
+        available = self.end - self.start
+
+        frame[:available] = self.buffer[self.start:self.end]
+        self.start = self.end = 0
+
+        self.frame = frame
+        self.filled = available
+        self.transport.resume_reading()
+
+        try:
+            if not await self.wait(n):
+                return None
+        finally:
+            self.frame = None
+
+        return frame
+
+    async def wait(self, n: int) -> bool:
+        if self.closed:
+            return False
+
+        self.wanted = n
+        self.waiter = self.loop.create_future()
+
+        if self.timer is None:
+            self.timer = self.loop.call_at(self.last_received + self.timeout, self.check_timeout)
+
+        try:
+            return await self.waiter
+        finally:
+            self.waiter = None
+
+    def wake(self, result: bool):
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(result)
+
+    def check_timeout(self):
+        self.timer = None
+
+        if self.waiter is None:
+            return
+
+        deadline = self.last_received + self.timeout
+
+        if self.loop.time() >= deadline:
+            self.wake(False)
+        else:
+            self.timer = self.loop.call_at(deadline, self.check_timeout)
+
+    async def drain(self):
+        if self.paused and not self.lost.done():
+            self.drained = self.loop.create_future()
+            await self.drained
+
+        if self.lost.done():
+            raise ConnectionResetError("Connection lost")
+
+    def close(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+        if self.transport is not None:
+            self.transport.close()
+
+
+class ReaderStream(asyncio.StreamReaderProtocol):
+    """Receiving end of a TCP connection built on :class:`asyncio.StreamReader`, as it was before :class:`Stream`.
+
+    Frames are accumulated read by read and each read waits with a timeout of its own, which makes it slower for big
+    frames. It is kept as a fallback and can be selected with :attr:`~pyrogram.connection.transport.TCP.STREAM`.
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.loop = asyncio.get_event_loop()
+        self.reader = asyncio.StreamReader()
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.transport: Optional[asyncio.Transport] = None
+        self.decrypt: Optional[Callable[[bytes], bytes]] = None
+        self.lost = self.loop.create_future()
+
+        super().__init__(self.reader)
+
+    def connection_made(self, transport: asyncio.Transport):
+        super().connection_made(transport)
+
+        self.transport = transport
+        self.writer = asyncio.StreamWriter(transport, self, self.reader, self.loop)
+
+    def connection_lost(self, exc: Optional[Exception]):
+        super().connection_lost(exc)
+
+        if not self.lost.done():
+            self.lost.set_result(None)
+
+    async def read(self, n: int) -> Optional[bytes]:
+        data = b""
+
+        while len(data) < n:
+            try:
+                chunk = await asyncio.wait_for(self.reader.read(n - len(data)), self.timeout)
+            except (OSError, asyncio.TimeoutError):
+                return None
+            else:
+                if not chunk:
+                    return None
+
+                data += self.decrypt(chunk) if self.decrypt is not None else chunk
+
+        return data
+
+    async def drain(self):
+        await self.writer.drain()
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
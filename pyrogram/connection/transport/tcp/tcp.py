@@ -21,10 +21,12 @@ import ipaddress
 import logging
 import socket
 from concurrent.futures import ThreadPoolExecutor
-from typing import Tuple, Dict, TypedDict, Optional
+from typing import Tuple, Dict, TypedDict, Optional, Union, Type
 
 import socks
 
+from .stream import Stream, ReaderStream
+
 log = logging.getLogger(__name__)
 
 proxy_type_by_scheme: Dict[str, int] = {
@@ -45,12 +47,14 @@ class Proxy(TypedDict):
 class TCP:
     TIMEOUT = 10
 
+    # Receiving end of the connection. Subclass a transport and set ReaderStream here to go back to StreamReader reads
+    STREAM: Type[Union[Stream, ReaderStream]] = Stream
+
     def __init__(self, ipv6: bool, proxy: Proxy) -> None:
         self.ipv6 = ipv6
         self.proxy = proxy
 
-        self.reader: Optional[asyncio.StreamReader] = None
-        self.writer: Optional[asyncio.StreamWriter] = None
+        self.stream: Optional[Union[Stream, ReaderStream]] = None
 
         self.lock = asyncio.Lock()
         self.loop = asyncio.get_event_loop()
@@ -96,7 +100,8 @@ class TCP:
 
         sock.setblocking(False)
 
-        self.reader, self.writer = await asyncio.open_connection(
+        _, self.stream = await self.loop.create_connection(
+            lambda: self.STREAM(TCP.TIMEOUT),
             sock=sock
         )
 
@@ -106,7 +111,8 @@ class TCP:
     ) -> None:
         host, port = destination
         family = socket.AF_INET6 if self.ipv6 else socket.AF_INET
-        self.reader, self.writer = await asyncio.open_connection(
+        _, self.stream = await self.loop.create_connection(
+            lambda: self.STREAM(TCP.TIMEOUT),
             host=host,
             port=port,
             family=family
@@ -125,42 +131,30 @@ class TCP:
             raise TimeoutError("Connection timed out")
 
     async def close(self) -> None:
-        if self.writer is None:
+        if self.stream is None:
             return None
 
         try:
-            self.writer.close()
-            await asyncio.wait_for(self.writer.wait_closed(), TCP.TIMEOUT)
+            self.stream.close()
+            await asyncio.wait_for(self.stream.lost, TCP.TIMEOUT)
         except Exception as e:
             log.info("Close exception: %s %s", type(e).__name__, e)
 
-    async def send(self, data: bytes) -> None:
-        if self.writer is None:
+    async def send(self, *data: bytes) -> None:
+        if self.stream is None:
             return None
 
         async with self.lock:
             try:
-                self.writer.write(data)
-                await self.writer.drain()
+                # Headers, payloads and trailers are written as they are, without being joined first
+                self.stream.transport.writelines(data)
+                await self.stream.drain()
             except Exception as e:
                 log.info("Send exception: %s %s", type(e).__name__, e)
                 raise OSError(e)
 
-    async def recv(self, length: int = 0) -> Optional[bytes]:
-        data = b""
+    async def recv(self, length: int = 0) -> Optional[Union[bytes, memoryview]]:
+        if self.stream is None:
+            return None
 
-        while len(data) < length:
-            try:
-                chunk = await asyncio.wait_for(
-                    self.reader.read(length - len(data)),
-                    TCP.TIMEOUT
-                )
-            except (OSError, asyncio.TimeoutError):
-                return None
-            else:
-                if chunk:
-                    data += chunk
-                else:
-                    return None
-
-        return data
+        return await self.stream.read(length)
@@ -33,8 +33,8 @@ class TCPAbridgedO(TCP):
     def __init__(self, ipv6: bool, proxy: Proxy) -> None:
         super().__init__(ipv6, proxy)
 
-        self.encrypt = None
-        self.decrypt = None
+        self.encryptor: Optional[aes.CTR] = None
+        self.decryptor: Optional[aes.CTR] = None
 
     async def connect(self, address: Tuple[str, int]) -> None:
         await super().connect(address)
@@ -48,19 +48,27 @@ class TCPAbridgedO(TCP):
 
         temp = bytearray(nonce[55:7:-1])
 
-        self.encrypt = (nonce[8:40], nonce[40:56], bytearray(1))
-        self.decrypt = (temp[0:32], temp[32:48], bytearray(1))
+        self.encryptor = aes.CTR(nonce[8:40], nonce[40:56])
+        self.decryptor = aes.CTR(temp[0:32], temp[32:48])
+        # Everything received from now on is decrypted as soon as it arrives, whole chunks at a time
+        self.stream.decrypt = self.decryptor.decrypt
 
-        nonce[56:64] = aes.ctr256_encrypt(nonce, *self.encrypt)[56:64]
+        nonce[56:64] = self.encryptor.encrypt(nonce)[56:64]
 
         await super().send(nonce)
 
     async def send(self, data: bytes, *args) -> None:
         length = len(data) // 4
-        data = (bytes([length]) if length <= 126 else b"\x7f" + length.to_bytes(3, "little")) + data
-        payload = await self.loop.run_in_executor(pyrogram.crypto_executor, aes.ctr256_encrypt, data, *self.encrypt)
+        header = bytes([length]) if length <= 126 else b"\x7f" + length.to_bytes(3, "little")
 
-        await super().send(payload)
+        await super().send(*await self.encrypt(header, data))
+
+    async def encrypt(self, *data: bytes) -> list:
+        # CTR is a stream cipher: encrypting the parts one after the other is the same as encrypting them joined
+        return [
+            await pyrogram.crypto_executor.run(self.encryptor, len(i), self.encryptor.encrypt, i)
+            for i in data
+        ]
 
     async def recv(self, length: int = 0) -> Optional[bytes]:
         length = await super().recv(1)
@@ -68,19 +76,10 @@ class TCPAbridgedO(TCP):
         if length is None:
             return None
 
-        length = aes.ctr256_decrypt(length, *self.decrypt)
-
         if length == b"\x7f":
             length = await super().recv(3)
 
             if length is None:
                 return None
 
-            length = aes.ctr256_decrypt(length, *self.decrypt)
-
-        data = await super().recv(int.from_bytes(length, "little") * 4)
-
-        if data is None:
-            return None
-
-        return await self.loop.run_in_executor(pyrogram.crypto_executor, aes.ctr256_decrypt, data, *self.decrypt)
+        return await super().recv(int.from_bytes(length, "little") * 4)
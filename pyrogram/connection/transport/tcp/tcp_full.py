@@ -37,11 +37,11 @@ class TCPFull(TCP):
         self.seq_no = 0
 
     async def send(self, data: bytes, *args) -> None:
-        data = pack("<II", len(data) + 12, self.seq_no) + data
-        data += pack("<I", crc32(data))
+        header = pack("<II", len(data) + 12, self.seq_no)
+        checksum = pack("<I", crc32(data, crc32(header)))
         self.seq_no += 1
 
-        await super().send(data)
+        await super().send(header, data, checksum)
 
     async def recv(self, length: int = 0) -> Optional[bytes]:
         length = await super().recv(4)
@@ -54,11 +54,9 @@ class TCPFull(TCP):
         if packet is None:
             return None
 
-        packet = length + packet
-        checksum = packet[-4:]
-        packet = packet[:-4]
+        packet = memoryview(packet)
 
-        if crc32(packet) != unpack("<I", checksum)[0]:
+        if crc32(packet[:-4], crc32(length)) != unpack("<I", packet[-4:])[0]:
             return None
 
-        return packet[8:]
+        return packet[4:-4]
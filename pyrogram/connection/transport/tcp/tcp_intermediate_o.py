@@ -21,6 +21,7 @@ import os
 from struct import pack, unpack
 from typing import Optional, Tuple
 
+import pyrogram
 from pyrogram.crypto import aes
 from .tcp import TCP, Proxy
 
@@ -33,8 +34,8 @@ class TCPIntermediateO(TCP):
     def __init__(self, ipv6: bool, proxy: Proxy) -> None:
         super().__init__(ipv6, proxy)
 
-        self.encrypt = None
-        self.decrypt = None
+        self.encryptor: Optional[aes.CTR] = None
+        self.decryptor: Optional[aes.CTR] = None
 
     async def connect(self, address: Tuple[str, int]) -> None:
         await super().connect(address)
@@ -48,20 +49,24 @@ class TCPIntermediateO(TCP):
 
         temp = bytearray(nonce[55:7:-1])
 
-        self.encrypt = (nonce[8:40], nonce[40:56], bytearray(1))
-        self.decrypt = (temp[0:32], temp[32:48], bytearray(1))
+        self.encryptor = aes.CTR(nonce[8:40], nonce[40:56])
+        self.decryptor = aes.CTR(temp[0:32], temp[32:48])
+        # Everything received from now on is decrypted as soon as it arrives, whole chunks at a time
+        self.stream.decrypt = self.decryptor.decrypt
 
-        nonce[56:64] = aes.ctr256_encrypt(nonce, *self.encrypt)[56:64]
+        nonce[56:64] = self.encryptor.encrypt(nonce)[56:64]
 
         await super().send(nonce)
 
     async def send(self, data: bytes, *args) -> None:
-        await super().send(
-            aes.ctr256_encrypt(
-                pack("<i", len(data)) + data,
-                *self.encrypt
-            )
-        )
+        await super().send(*await self.encrypt(pack("<i", len(data)), data))
+
+    async def encrypt(self, *data: bytes) -> list:
+        # CTR is a stream cipher: encrypting the parts one after the other is the same as encrypting them joined
+        return [
+            await pyrogram.crypto_executor.run(self.encryptor, len(i), self.encryptor.encrypt, i)
+            for i in data
+        ]
 
     async def recv(self, length: int = 0) -> Optional[bytes]:
         length = await super().recv(4)
@@ -69,11 +74,4 @@ class TCPIntermediateO(TCP):
         if length is None:
             return None
 
-        length = aes.ctr256_decrypt(length, *self.decrypt)
-
-        data = await super().recv(unpack("<i", length)[0])
-
-        if data is None:
-            return None
-
-        return aes.ctr256_decrypt(data, *self.decrypt)
+        return await super().recv(unpack("<i", length)[0])
@@ -0,0 +1,52 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from hashlib import sha256
+from typing import List
+
+from pyrogram import raw
+from pyrogram.errors import CDNFileHashMismatch
+from . import aes
+
+
+def decrypt_chunk(
+    chunk: bytes,
+    key: bytes,
+    iv: bytes,
+    offset: int,
+    hashes: List["raw.types.FileHash"]
+) -> bytes:
+    # https://core.telegram.org/cdn#decrypting-files
+    decrypted_chunk = aes.ctr256_decrypt(
+        chunk,
+        key,
+        bytearray(iv[:-4] + (offset // 16).to_bytes(4, "big"))
+    )
+
+    # https://core.telegram.org/cdn#verifying-files
+    view = memoryview(decrypted_chunk)
+
+    for h in hashes:
+        start = h.offset - offset
+
+        CDNFileHashMismatch.check(
+            h.hash == sha256(view[start:start + h.limit]).digest(),
+            "h.hash == sha256(cdn_chunk).digest()"
+        )
+
+    return decrypted_chunk
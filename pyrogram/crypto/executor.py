@@ -0,0 +1,110 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class CryptoExecutor(ThreadPoolExecutor):
+    """Runs the encryption and decryption of packets for every session and transport in the process.
+
+    Jobs up to :attr:`INLINE_MAX_SIZE` bytes are run inline on the event loop, since handing them to a thread costs
+    more than the work itself. Bigger jobs are run by a pool of :attr:`WORKERS` threads, in parallel, as TgCrypto
+    releases the GIL. Jobs submitted on the same lane (e.g. the incoming packets of a session) are run one after the
+    other and in the order they were submitted, whichever way they are run.
+
+    The time jobs spend waiting before they start running is accounted in :attr:`queue_delay` (total) and
+    :attr:`queue_delay_max`, seconds, along with the number of :attr:`inline_jobs` and :attr:`pool_jobs`.
+    """
+
+    WORKERS = min(4, os.cpu_count() or 1)
+    INLINE_MAX_SIZE = 8 * 1024
+
+    def __init__(
+        self,
+        workers: int = WORKERS,
+        inline_max_size: int = INLINE_MAX_SIZE,
+        thread_name_prefix: str = "CryptoWorker"
+    ):
+        super().__init__(workers, thread_name_prefix=thread_name_prefix)
+
+        self.inline_max_size = inline_max_size
+
+        # Last job of each lane, which the next job on that lane waits for
+        self.lanes: Dict[Hashable, asyncio.Future] = {}
+
+        self.inline_jobs = 0
+        self.pool_jobs = 0
+        self.queue_delay = 0.0
+        self.queue_delay_max = 0.0
+
+    async def run(self, lane: Hashable, size: int, func: Callable, *args: Any) -> Any:
+        previous: Optional[asyncio.Future] = self.lanes.get(lane)
+
+        if previous is None and size <= self.inline_max_size:
+            self.inline_jobs += 1
+            return func(*args)
+
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+        done = self.lanes[lane] = loop.create_future()
+        # What has to finish before the next job on this lane can start, even if this one gets cancelled
+        blocker = previous
+
+        def release(future: asyncio.Future = None):
+            if future is not None and not future.cancelled():
+                future.exception()  # Nobody is awaiting it anymore
+
+            done.set_result(None)
+
+            if self.lanes.get(lane) is done:
+                del self.lanes[lane]
+
+        try:
+            if previous is not None:
+                # Unlike awaiting it directly, this won't cancel the previous job if this one gets cancelled
+                await asyncio.wait([previous])
+
+            if size <= self.inline_max_size:
+                self.inline_jobs += 1
+                self.account(time.perf_counter() - submitted)
+
+                return func(*args)
+
+            self.pool_jobs += 1
+            blocker = loop.run_in_executor(self, self.timed, func, args)
+            started, result = await asyncio.shield(blocker)
+            self.account(started - submitted)
+
+            return result
+        finally:
+            if blocker is None or blocker.done():
+                release()
+            else:
+                blocker.add_done_callback(release)
+
+    @staticmethod
+    def timed(func: Callable, args: tuple) -> tuple:
+        return time.perf_counter(), func(*args)
+
+    def account(self, delay: float):
+        self.queue_delay += delay
+        self.queue_delay_max = max(self.queue_delay_max, delay)
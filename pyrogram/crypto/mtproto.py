@@ -16,52 +16,94 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from hashlib import sha256
-from io import BytesIO
+from hashlib import sha1, sha256
 from os import urandom
 
 from pyrogram.errors import SecurityCheckMismatch
-from pyrogram.raw.core import Message, Long
+from pyrogram.raw.core import Message, Long, Reader, LazyReader
 from . import aes
 
 
+class AuthKey:
+    """An auth key along with the parts of it that are needed for every message, computed once per session.
+
+    The sha256 of the constant prefixes of the msg_key and kdf inputs are kept as well, and copied before feeding
+    them the rest of the data.
+    """
+
+    __slots__ = ("key", "id", "msg_key_out", "msg_key_in", "kdf_out", "kdf_in")
+
+    def __init__(self, key: bytes):
+        self.key = key
+        self.id = sha1(key).digest()[-8:]
+
+        # 88 = 88 + 0 (outgoing message), 96 = 88 + 8 (incoming message)
+        self.msg_key_out = sha256(key[88:88 + 32])
+        self.msg_key_in = sha256(key[96:96 + 32])
+
+        # https://core.telegram.org/mtproto/description#defining-aes-key-and-initialization-vector
+        self.kdf_out = key[0:0 + 36], sha256(key[40:40 + 36])
+        self.kdf_in = key[8:8 + 36], sha256(key[48:48 + 36])
+
+    def kdf(self, msg_key: bytes, outgoing: bool) -> tuple:
+        a, b = self.kdf_out if outgoing else self.kdf_in
+
+        sha256_a = sha256(msg_key + a).digest()
+        sha256_b = b.copy()
+        sha256_b.update(msg_key)
+        sha256_b = sha256_b.digest()
+
+        aes_key = sha256_a[:8] + sha256_b[8:24] + sha256_a[24:32]
+        aes_iv = sha256_b[:8] + sha256_a[8:24] + sha256_b[24:32]
+
+        return aes_key, aes_iv
+
+
 def kdf(auth_key: bytes, msg_key: bytes, outgoing: bool) -> tuple:
-    # https://core.telegram.org/mtproto/description#defining-aes-key-and-initialization-vector
-    x = 0 if outgoing else 8
+    return AuthKey(auth_key).kdf(msg_key, outgoing)
 
-    sha256_a = sha256(msg_key + auth_key[x: x + 36]).digest()
-    sha256_b = sha256(auth_key[x + 40:x + 76] + msg_key).digest()  # 76 = 40 + 36
 
-    aes_key = sha256_a[:8] + sha256_b[8:24] + sha256_a[24:32]
-    aes_iv = sha256_b[:8] + sha256_a[8:24] + sha256_b[24:32]
+def pack(message: Message, salt: int, session_id: bytes, auth_key: AuthKey) -> bytearray:
+    # The packet is built in place: auth_key_id (8) + msg_key (16) are filled in once the plaintext is hashed and
+    # the plaintext is then replaced by its ciphertext, which has the very same length.
+    packet = bytearray(24)
+    packet += Long(salt)
+    packet += session_id
+    message.write_into(packet)
+    packet += urandom(-(len(packet) - 24 + 12) % 16 + 12)
 
-    return aes_key, aes_iv
+    with memoryview(packet) as view:
+        data = view[24:]
 
+        msg_key_large = auth_key.msg_key_out.copy()
+        msg_key_large.update(data)
+        msg_key = msg_key_large.digest()[8:24]
+        aes_key, aes_iv = auth_key.kdf(msg_key, True)
 
-def pack(message: Message, salt: int, session_id: bytes, auth_key: bytes, auth_key_id: bytes) -> bytes:
-    data = Long(salt) + session_id + message.write()
-    padding = urandom(-(len(data) + 12) % 16 + 12)
+        view[:8] = auth_key.id
+        view[8:24] = msg_key
+        data[:] = aes.ige256_encrypt(data, aes_key, aes_iv)
 
-    # 88 = 88 + 0 (outgoing message)
-    msg_key_large = sha256(auth_key[88: 88 + 32] + data + padding).digest()
-    msg_key = msg_key_large[8:24]
-    aes_key, aes_iv = kdf(auth_key, msg_key, True)
+        data.release()
 
-    return auth_key_id + msg_key + aes.ige256_encrypt(data + padding, aes_key, aes_iv)
+    return packet
 
 
 def unpack(
-    b: BytesIO,
+    packet: bytes,
     session_id: bytes,
-    auth_key: bytes,
-    auth_key_id: bytes
+    auth_key: AuthKey,
+    lazy: bool = False
 ) -> Message:
-    SecurityCheckMismatch.check(b.read(8) == auth_key_id, "b.read(8) == auth_key_id")
+    packet = memoryview(packet)
+
+    SecurityCheckMismatch.check(packet[:8] == auth_key.id, "packet[:8] == auth_key.id")
 
-    msg_key = b.read(16)
-    aes_key, aes_iv = kdf(auth_key, msg_key, False)
-    data = BytesIO(aes.ige256_decrypt(b.read(), aes_key, aes_iv))
-    data.read(8)  # Salt
+    msg_key = packet[8:24].tobytes()
+    aes_key, aes_iv = auth_key.kdf(msg_key, False)
+    plaintext = aes.ige256_decrypt(packet[24:], aes_key, aes_iv)
+    data = (LazyReader if lazy else Reader)(plaintext)
+    data.seek(8)  # Salt
 
     # https://core.telegram.org/mtproto/security_guidelines#checking-session-id
     SecurityCheckMismatch.check(data.read(8) == session_id, "data.read(8) == session_id")
@@ -81,18 +123,19 @@ def unpack(
         raise ValueError(f"The server sent an unknown constructor: {hex(e.args[0])}\n{left}")
 
     # https://core.telegram.org/mtproto/security_guidelines#checking-sha256-hash-value-of-msg-key
-    # 96 = 88 + 8 (incoming message)
+    msg_key_large = auth_key.msg_key_in.copy()
+    msg_key_large.update(plaintext)
     SecurityCheckMismatch.check(
-        msg_key == sha256(auth_key[96:96 + 32] + data.getvalue()).digest()[8:24],
-        "msg_key == sha256(auth_key[96:96 + 32] + data.getvalue()).digest()[8:24]"
+        msg_key == msg_key_large.digest()[8:24],
+        "msg_key == sha256(auth_key[96:96 + 32] + plaintext).digest()[8:24]"
     )
 
     # https://core.telegram.org/mtproto/security_guidelines#checking-message-length
-    data.seek(32)  # Get to the payload, skip salt (8) + session_id (8) + msg_id (8) + seq_no (4) + length (4)
-    payload = data.read()
-    padding = payload[message.length:]
-    SecurityCheckMismatch.check(12 <= len(padding) <= 1024, "12 <= len(padding) <= 1024")
-    SecurityCheckMismatch.check(len(payload) % 4 == 0, "len(payload) % 4 == 0")
+    # The payload starts after salt (8) + session_id (8) + msg_id (8) + seq_no (4) + length (4)
+    payload_length = len(plaintext) - 32
+    padding_length = payload_length - message.length
+    SecurityCheckMismatch.check(12 <= padding_length <= 1024, "12 <= len(padding) <= 1024")
+    SecurityCheckMismatch.check(payload_length % 4 == 0, "len(payload) % 4 == 0")
 
     # https://core.telegram.org/mtproto/security_guidelines#checking-msg-id
     SecurityCheckMismatch.check(message.msg_id % 2 != 0, "message.msg_id % 2 != 0")
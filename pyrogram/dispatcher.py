@@ -20,6 +20,7 @@ import asyncio
 import inspect
 import logging
 from collections import OrderedDict
+from typing import List, Optional, Tuple
 
 import pyrogram
 from pyrogram import errors
@@ -31,6 +32,7 @@ from pyrogram.handlers import (
     ChosenInlineResultHandler, ChatMemberUpdatedHandler, ChatJoinRequestHandler, StoryHandler,
     ShippingQueryHandler, MessageReactionHandler, MessageReactionCountHandler, ChatBoostHandler
 )
+from pyrogram.handlers.handler import Handler
 from pyrogram.raw.types import (
     UpdateNewMessage, UpdateNewChannelMessage, UpdateNewScheduledMessage,
     UpdateBotNewBusinessMessage, UpdateBotEditBusinessMessage, UpdateBotDeleteBusinessMessage,
@@ -71,10 +73,17 @@ class Dispatcher:
         self.loop = asyncio.get_event_loop()
 
         self.handler_worker_tasks = []
-        self.locks_list = []
 
         self.updates_queue = asyncio.Queue()
+
+        # Handlers are never changed in place: every change builds new groups and a new (lazily filled) index of the
+        # handlers relevant to each handler type, so that workers can iterate them without locking
         self.groups = OrderedDict()
+        self.handlers_index = {}
+
+        # With ordered updates, every worker has its own queue and updates are routed to them by chat
+        self.shard_queues = []
+        self.router_task = None
 
         async def message_parser(update, users, chats):
             connection_id = getattr(update, "connection_id", None)
@@ -217,12 +226,18 @@ class Dispatcher:
     async def start(self):
         if not self.client.no_updates:
             for i in range(self.client.workers):
-                self.locks_list.append(asyncio.Lock())
+                if self.client.ordered_updates:
+                    self.shard_queues.append(asyncio.Queue())
 
                 self.handler_worker_tasks.append(
-                    self.loop.create_task(self.handler_worker(self.locks_list[-1]))
+                    self.loop.create_task(self.handler_worker(
+                        self.shard_queues[-1] if self.client.ordered_updates else self.updates_queue
+                    ))
                 )
 
+            if self.client.ordered_updates:
+                self.router_task = self.loop.create_task(self.router_worker())
+
             log.info("Started %s HandlerTasks", self.client.workers)
 
             if not self.client.skip_updates:
@@ -230,54 +245,108 @@ class Dispatcher:
 
     async def stop(self):
         if not self.client.no_updates:
-            for i in range(self.client.workers):
+            if self.router_task is not None:
                 self.updates_queue.put_nowait(None)
+                await self.router_task
+                self.router_task = None
+
+                for queue in self.shard_queues:
+                    queue.put_nowait(None)
+            else:
+                for i in range(self.client.workers):
+                    self.updates_queue.put_nowait(None)
 
             for i in self.handler_worker_tasks:
                 await i
 
             self.handler_worker_tasks.clear()
-            self.groups.clear()
+            self.shard_queues.clear()
+            self.set_groups(OrderedDict())
 
             log.info("Stopped %s HandlerTasks", self.client.workers)
 
+    def set_groups(self, groups: OrderedDict):
+        self.groups = groups
+        self.handlers_index = {}
+
     def add_handler(self, handler, group: int):
-        async def fn():
-            for lock in self.locks_list:
-                await lock.acquire()
+        groups = OrderedDict((g, list(handlers)) for g, handlers in self.groups.items())
+        groups.setdefault(group, []).append(handler)
 
-            try:
-                if group not in self.groups:
-                    self.groups[group] = []
-                    self.groups = OrderedDict(sorted(self.groups.items()))
+        self.set_groups(OrderedDict(sorted(groups.items())))
 
-                self.groups[group].append(handler)
-            finally:
-                for lock in self.locks_list:
-                    lock.release()
+    def remove_handler(self, handler, group: int):
+        if group not in self.groups:
+            raise ValueError(f"Group {group} does not exist. Handler was not removed.")
 
-        self.loop.create_task(fn())
+        groups = OrderedDict((g, list(handlers)) for g, handlers in self.groups.items())
+        groups[group].remove(handler)
 
-    def remove_handler(self, handler, group: int):
-        async def fn():
-            for lock in self.locks_list:
-                await lock.acquire()
+        self.set_groups(groups)
 
-            try:
-                if group not in self.groups:
-                    raise ValueError(f"Group {group} does not exist. Handler was not removed.")
+    def get_handlers(self, handler_type: type) -> Tuple[Tuple[Handler, ...], ...]:
+        """Get the groups of handlers that can handle an update of the given handler type, in group order."""
+        handlers = self.handlers_index.get(handler_type)
+
+        if handlers is None:
+            groups = (
+                tuple(h for h in group if isinstance(h, (handler_type, RawUpdateHandler)))
+                for group in self.groups.values()
+            )
+
+            handlers = self.handlers_index[handler_type] = tuple(group for group in groups if group)
+
+        return handlers
+
+    @property
+    def shard_queue_sizes(self) -> List[int]:
+        """Number of updates waiting in the queue of each worker, when updates are ordered."""
+        return [queue.qsize() for queue in self.shard_queues]
+
+    @staticmethod
+    def get_chat_id(update) -> Optional[int]:
+        """Get the id of the chat (or user) an update belongs to, if any."""
+        peer = (
+            getattr(getattr(update, "message", None), "peer_id", None)
+            or getattr(update, "peer", None)
+            or getattr(update, "peer_id", None)
+        )
+
+        if isinstance(peer, (raw.types.PeerUser, raw.types.PeerChat, raw.types.PeerChannel)):
+            return utils.get_peer_id(peer)
 
-                self.groups[group].remove(handler)
-            finally:
-                for lock in self.locks_list:
-                    lock.release()
+        if isinstance(getattr(update, "channel_id", None), int):
+            return utils.get_channel_id(update.channel_id)
 
-        self.loop.create_task(fn())
+        if isinstance(getattr(update, "chat_id", None), int):
+            return -update.chat_id
 
-    async def handler_worker(self, lock):
+        if isinstance(getattr(update, "user_id", None), int):
+            return update.user_id
+
+        return None
+
+    async def router_worker(self):
         while True:
             packet = await self.updates_queue.get()
 
+            if packet is None:
+                break
+
+            chat_id = self.get_chat_id(packet[0])
+
+            if chat_id is None:
+                # Updates that don't belong to any chat have no order to keep
+                queue = min(self.shard_queues, key=asyncio.Queue.qsize)
+            else:
+                queue = self.shard_queues[hash(chat_id) % len(self.shard_queues)]
+
+            queue.put_nowait(packet)
+
+    async def handler_worker(self, queue: asyncio.Queue):
+        while True:
+            packet = await queue.get()
+
             if packet is None:
                 break
 
@@ -291,43 +360,42 @@ class Dispatcher:
                     else (None, type(None))
                 )
 
-                async with lock:
-                    for group in self.groups.values():
-                        for handler in group:
-                            args = None
-
-                            if isinstance(handler, handler_type):
-                                try:
-                                    if await handler.check(self.client, parsed_update):
-                                        args = (parsed_update,)
-                                except Exception as e:
-                                    log.exception(e)
-                                    continue
-
-                            elif isinstance(handler, RawUpdateHandler):
-                                args = (update, users, chats)
-
-                            if args is None:
-                                continue
+                for group in self.get_handlers(handler_type):
+                    for handler in group:
+                        args = None
 
+                        if isinstance(handler, handler_type):
                             try:
-                                if inspect.iscoroutinefunction(handler.callback):
-                                    await handler.callback(self.client, *args)
-                                else:
-                                    await self.loop.run_in_executor(
-                                        self.client.executor,
-                                        handler.callback,
-                                        self.client,
-                                        *args
-                                    )
-                            except pyrogram.StopPropagation:
-                                raise
-                            except pyrogram.ContinuePropagation:
-                                continue
+                                if await handler.check(self.client, parsed_update):
+                                    args = (parsed_update,)
                             except Exception as e:
                                 log.exception(e)
+                                continue
 
-                            break
+                        elif isinstance(handler, RawUpdateHandler):
+                            args = (update, users, chats)
+
+                        if args is None:
+                            continue
+
+                        try:
+                            if inspect.iscoroutinefunction(handler.callback):
+                                await handler.callback(self.client, *args)
+                            else:
+                                await self.loop.run_in_executor(
+                                    self.client.executor,
+                                    handler.callback,
+                                    self.client,
+                                    *args
+                                )
+                        except pyrogram.StopPropagation:
+                            raise
+                        except pyrogram.ContinuePropagation:
+                            continue
+                        except Exception as e:
+                            log.exception(e)
+
+                        break
             except pyrogram.StopPropagation:
                 pass
             except Exception as e:
@@ -30,10 +30,58 @@ from typing import Union, BinaryIO, Callable
 import pyrogram
 from pyrogram import StopTransmission
 from pyrogram import raw
-from pyrogram.session import Session
+from pyrogram.errors import FloodWait, FloodPremiumWait, InternalServerError, ServiceUnavailable
 
 log = logging.getLogger(__name__)
 
+# How many times a single part is retried before giving up on the whole upload, and the delay before the first retry.
+# The delay doubles on every retry.
+PART_RETRIES = 5
+PART_RETRY_DELAY = 0.5
+# How many parts are read from disk ahead of the ones being uploaded
+READ_AHEAD = 16
+
+
+class UploadWindow:
+    """Amount of file parts that are uploaded in parallel.
+
+    Every time as many parts as the window size have been uploaded, the throughput of that round is compared with the
+    previous one. The window keeps moving in the same direction while the throughput improves and turns around as soon
+    as it gets worse. A flood wait halves it.
+    """
+
+    MAX_SIZE = 8
+
+    def __init__(self, size: int, now: float):
+        self.size = size
+        self.direction = 1
+        self.throughput = 0
+        self.round_start = now
+        self.round_size = 0
+        self.round_parts = 0
+
+    def update(self, now: float, size: int):
+        self.round_size += size
+        self.round_parts += 1
+
+        if self.round_parts < self.size:
+            return
+
+        throughput = self.round_size / max(now - self.round_start, 1e-6)
+
+        if throughput < self.throughput:
+            self.direction = -self.direction
+
+        self.size = min(max(self.size + self.direction, 1), self.MAX_SIZE)
+        self.throughput = throughput
+        self.round_start = now
+        self.round_size = 0
+        self.round_parts = 0
+
+    def flood(self):
+        self.size = max(self.size // 2, 1)
+        self.direction = -1
+
 
 class SaveFile:
     async def save_file(
@@ -98,17 +146,76 @@ class SaveFile:
             if path is None:
                 return None
 
-            async def worker(session):
-                while True:
-                    data = await queue.get()
+            async def reader():
+                nonlocal read
+                part = file_part
+
+                try:
+                    while True:
+                        # Cancelling the reader can't stop a read that is already running in the executor, it's
+                        # shielded so that it can be waited for before the file is closed or handed back
+                        read = self.loop.run_in_executor(None, fp.read, part_size)
+                        chunk = await asyncio.shield(read)
+
+                        if not chunk:
+                            break
 
-                    if data is None:
-                        return
+                        if md5_sum is not None:
+                            md5_sum.update(chunk)
 
+                        await queue.put((part, chunk))
+
+                        if is_missing_part:
+                            break
+
+                        part += 1
+                except OSError as e:
+                    await queue.put(e)
+                else:
+                    await queue.put(None)
+
+            async def upload(part: int, chunk: bytes) -> int:
+                if is_big:
+                    rpc = raw.functions.upload.SaveBigFilePart(
+                        file_id=file_id,
+                        file_part=part,
+                        file_total_parts=file_total_parts,
+                        bytes=chunk
+                    )
+                else:
+                    rpc = raw.functions.upload.SaveFilePart(
+                        file_id=file_id,
+                        file_part=part,
+                        bytes=chunk
+                    )
+
+                retries = 0
+
+                while True:
                     try:
-                        await session.invoke(data)
-                    except Exception as e:
-                        log.exception(e)
+                        # Flood waits are handled here, so that they can slow the whole upload down
+                        if await session.invoke(rpc, sleep_threshold=0):
+                            return len(chunk)
+
+                        raise InternalServerError(f"Part {part} was not saved")
+                    except (FloodWait, FloodPremiumWait) as e:
+                        if e.value > self.sleep_threshold >= 0:
+                            raise
+
+                        window.flood()
+
+                        log.warning("[%s] Waiting for %s seconds before uploading part %s", self.name, e.value, part)
+
+                        await asyncio.sleep(e.value)
+                    except (OSError, InternalServerError, ServiceUnavailable) as e:
+                        if retries == PART_RETRIES:
+                            raise
+
+                        retries += 1
+
+                        log.warning("[%s] Retrying part %s due to: %s", self.name, part, str(e) or repr(e))
+
+                        await asyncio.sleep(min(PART_RETRY_DELAY * 2 ** (retries - 1), 30))
 
             part_size = 512 * 1024
 
@@ -138,70 +245,67 @@ class SaveFile:
 
             file_total_parts = int(math.ceil(file_size / part_size))
             is_big = file_size > 10 * 1024 * 1024
-            workers_count = 4 if is_big else 1
             is_missing_part = file_id is not None
             file_id = file_id or self.rnd_id()
             md5_sum = md5() if not is_big and not is_missing_part else None
             dc_id = await self.storage.dc_id()
 
-            session = self.media_sessions.get(dc_id)
-            if not session:
-                session = self.media_sessions[dc_id] = Session(
-                    self, dc_id, await self.storage.auth_key(),
-                    await self.storage.test_mode(), is_media=True
-                )
-                await session.start()
+            session = await self.get_media_session(dc_id)
 
-            workers = [self.loop.create_task(worker(session)) for _ in range(workers_count)]
-            queue = asyncio.Queue(1)
+            window = UploadWindow(4 if is_big else 1, self.loop.time())
+            queue = asyncio.Queue(READ_AHEAD)
+            pending = set()
+            uploaded = file_part
+            read = None
+
+            fp.seek(part_size * file_part)
+            reader_task = self.loop.create_task(reader())
 
             try:
-                fp.seek(part_size * file_part)
+                # Parts are read from disk ahead of time and uploaded out of order, as many at once as the window
+                # allows. Every part is retried on its own, one that fails for good fails the whole upload.
+                eof = False
 
                 while True:
-                    chunk = fp.read(part_size)
+                    while not eof and len(pending) < window.size:
+                        item = await queue.get()
+
+                        if item is None:
+                            eof = True
+                            break
+
+                        if isinstance(item, Exception):
+                            raise item
 
-                    if not chunk:
-                        if not is_big and not is_missing_part:
-                            md5_sum = "".join([hex(i)[2:].zfill(2) for i in md5_sum.digest()])
+                        pending.add(self.loop.create_task(upload(*item)))
+
+                    if not pending:
                         break
 
-                    if is_big:
-                        rpc = raw.functions.upload.SaveBigFilePart(
-                            file_id=file_id,
-                            file_part=file_part,
-                            file_total_parts=file_total_parts,
-                            bytes=chunk
-                        )
-                    else:
-                        rpc = raw.functions.upload.SaveFilePart(
-                            file_id=file_id,
-                            file_part=file_part,
-                            bytes=chunk
-                        )
-
-                    await queue.put(rpc)
-
-                    if is_missing_part:
-                        return
-
-                    if not is_big and not is_missing_part:
-                        md5_sum.update(chunk)
-
-                    file_part += 1
-
-                    if progress:
-                        func = functools.partial(
-                            progress,
-                            min(file_part * part_size, file_size),
-                            file_size,
-                            *progress_args
-                        )
-
-                        if inspect.iscoroutinefunction(progress):
-                            await func()
-                        else:
-                            await self.loop.run_in_executor(self.executor, func)
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                    for task in done:
+                        window.update(self.loop.time(), task.result())
+                        uploaded += 1
+
+                        if progress:
+                            func = functools.partial(
+                                progress,
+                                min(uploaded * part_size, file_size),
+                                file_size,
+                                *progress_args
+                            )
+
+                            if inspect.iscoroutinefunction(progress):
+                                await func()
+                            else:
+                                await self.loop.run_in_executor(self.executor, func)
+
+                if is_missing_part:
+                    return
+
+                if md5_sum is not None:
+                    md5_sum = "".join([hex(i)[2:].zfill(2) for i in md5_sum.digest()])
             except StopTransmission:
                 raise
             except Exception as e:
@@ -222,10 +326,13 @@ class SaveFile:
                         md5_checksum=md5_sum
                     )
             finally:
-                for _ in workers:
-                    await queue.put(None)
+                for task in pending | {reader_task}:
+                    task.cancel()
+
+                await asyncio.gather(reader_task, *pending, return_exceptions=True)
 
-                await asyncio.gather(*workers)
+                if read is not None:
+                    await asyncio.gather(read, return_exceptions=True)
 
                 if isinstance(path, (str, PurePath)):
                     fp.close()
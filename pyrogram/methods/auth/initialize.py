@@ -31,7 +31,7 @@ class Initialize:
         """Initialize the client by starting up workers.
 
         This method will start updates and download workers.
-        It will also load plugins and start the internal dispatcher.
+        It will also load plugins, start the internal dispatcher and, if enabled, the warm-up of media sessions.
 
         Raises:
             ConnectionError: In case you try to initialize a disconnected client or in case you try to initialize an
@@ -49,4 +49,9 @@ class Initialize:
 
         self.updates_watchdog_task = asyncio.create_task(self.updates_watchdog())
 
+        if self.warm_up_dcs:
+            self.warm_up_task = asyncio.create_task(self.warm_up_media_sessions())
+        else:
+            self.media_sessions_ready.set()
+
         self.is_initialized = True
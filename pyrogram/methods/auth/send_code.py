@@ -121,7 +121,8 @@ class SendCode:
                 )
                 self.session = Session(
                     self, await self.storage.dc_id(),
-                    await self.storage.auth_key(), await self.storage.test_mode()
+                    await self.storage.auth_key(), await self.storage.test_mode(),
+                    connections=self.connections
                 )
 
                 await self.session.start()
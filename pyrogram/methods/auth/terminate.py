@@ -16,6 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import logging
 
 import pyrogram
@@ -46,11 +47,28 @@ class Terminate:
         await self.storage.save()
         await self.dispatcher.stop()
 
+        if self.warm_up_task is not None:
+            self.warm_up_task.cancel()
+
+            try:
+                await self.warm_up_task
+            except asyncio.CancelledError:
+                pass
+
+            self.warm_up_task = None
+
+        self.media_sessions_ready.clear()
+
         for media_session in self.media_sessions.values():
             await media_session.stop()
 
         self.media_sessions.clear()
 
+        for cdn_session in self.cdn_sessions.values():
+            await cdn_session.stop()
+
+        self.cdn_sessions.clear()
+
         self.updates_watchdog_event.set()
 
         if self.updates_watchdog_task is not None:
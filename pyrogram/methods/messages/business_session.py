@@ -18,9 +18,7 @@
 
 import pyrogram
 from pyrogram import raw
-from pyrogram.errors import AuthBytesInvalid
 from pyrogram.session import Session
-from pyrogram.session.auth import Auth
 
 
 async def get_session(client: "pyrogram.Client", business_connection_id: str) -> Session:
@@ -42,34 +40,6 @@ async def get_session(client: "pyrogram.Client", business_connection_id: str) ->
         if client.sessions.get(dc_id):
             return client.sessions[dc_id]
 
-        session = client.sessions[dc_id] = Session(
-            client, dc_id,
-            await Auth(client, dc_id, await client.storage.test_mode()).create(),
-            await client.storage.test_mode()
-        )
-
-        await session.start()
-
-        for _ in range(3):
-            exported_auth = await client.invoke(
-                raw.functions.auth.ExportAuthorization(
-                    dc_id=dc_id
-                )
-            )
-
-            try:
-                await session.invoke(
-                    raw.functions.auth.ImportAuthorization(
-                        id=exported_auth.id,
-                        bytes=exported_auth.bytes
-                    )
-                )
-            except AuthBytesInvalid:
-                continue
-            else:
-                break
-        else:
-            await session.stop()
-            raise AuthBytesInvalid
+        session = client.sessions[dc_id] = await client.start_dc_session(dc_id)
 
         return session
@@ -36,7 +36,8 @@ class DownloadMedia:
         in_memory: bool = False,
         block: bool = True,
         progress: Callable = None,
-        progress_args: tuple = ()
+        progress_args: tuple = (),
+        resume: bool = False
     ) -> Optional[Union[str, BinaryIO]]:
         """Download the media from a message.
 
@@ -73,6 +74,14 @@ class DownloadMedia:
                 You can pass anything you need to be available in the progress callback scope; for example, a Message
                 object or a Client instance in order to edit the message with the updated progress status.
 
+            resume (``bool``, *optional*):
+                Pass True to download the file chunks in parallel straight into place, keeping track of the chunks
+                already downloaded in a small ".parts" file next to the ".temp" one. In case the download fails or is
+                stopped, both files are kept and calling this method again with the same *file_name* resumes the
+                download from the missing chunks only.
+                Has no effect on in-memory downloads and on media whose size is unknown.
+                Defaults to False.
+
         Other Parameters:
             current (``int``):
                 The amount of bytes transmitted so far.
@@ -113,6 +122,9 @@ class DownloadMedia:
 
                 await app.download_media(message, progress=progress)
 
+                # Resume a download that was interrupted earlier
+                await app.download_media(message, file_name="video.mp4", resume=True)
+
             Download media in-memory
 
             .. code-block:: python
@@ -192,7 +204,7 @@ class DownloadMedia:
             )
 
         downloader = self.handle_download(
-            (file_id_obj, directory, file_name, in_memory, file_size, progress, progress_args)
+            (file_id_obj, directory, file_name, in_memory, file_size, progress, progress_args, resume)
         )
 
         if block:
@@ -19,6 +19,7 @@
 from .future_salt import FutureSalt
 from .future_salts import FutureSalts
 from .gzip_packed import GzipPacked
+from .lazy import Lazy, LazyReader, Combinator
 from .list import List
 from .message import Message
 from .msg_container import MsgContainer
@@ -28,4 +29,5 @@ from .primitives.double import Double
 from .primitives.int import Int, Long, Int128, Int256
 from .primitives.string import String
 from .primitives.vector import Vector
+from .reader import Reader
 from .tl_object import TLObject
@@ -20,6 +20,7 @@ from io import BytesIO
 from typing import Any
 
 from .primitives.int import Int, Long
+from .reader import Reader
 from .tl_object import TLObject
 
 
@@ -36,10 +37,10 @@ class FutureSalt(TLObject):
         self.salt = salt
 
     @staticmethod
-    def read(data: BytesIO, *args: Any) -> "FutureSalt":
-        valid_since = Int.read(data)
-        valid_until = Int.read(data)
-        salt = Long.read(data)
+    def read(data: Reader, *args: Any) -> "FutureSalt":
+        valid_since = data.read_int()
+        valid_until = data.read_int()
+        salt = data.read_long()
 
         return FutureSalt(valid_since, valid_until, salt)
 
@@ -21,6 +21,7 @@ from typing import Any, List
 
 from .future_salt import FutureSalt
 from .primitives.int import Int, Long
+from .reader import Reader
 from .tl_object import TLObject
 
 
@@ -37,11 +38,11 @@ class FutureSalts(TLObject):
         self.salts = salts
 
     @staticmethod
-    def read(data: BytesIO, *args: Any) -> "FutureSalts":
-        req_msg_id = Long.read(data)
-        now = Int.read(data)
+    def read(data: Reader, *args: Any) -> "FutureSalts":
+        req_msg_id = data.read_long()
+        now = data.read_int()
 
-        count = Int.read(data)
+        count = data.read_int()
         salts = [FutureSalt.read(data) for _ in range(count)]
 
         return FutureSalts(req_msg_id, now, salts)
@@ -22,6 +22,7 @@ from typing import cast, Any
 
 from .primitives.bytes import Bytes
 from .primitives.int import Int
+from .reader import Reader
 from .tl_object import TLObject
 
 
@@ -36,16 +37,20 @@ class GzipPacked(TLObject):
         self.packed_data = packed_data
 
     @staticmethod
-    def read(data: BytesIO, *args: Any) -> "GzipPacked":
+    def read(data: Reader, *args: Any) -> "GzipPacked":
         # Return the Object itself instead of a GzipPacked wrapping it
         return cast(GzipPacked, TLObject.read(
-            BytesIO(
+            data.__class__(
                 decompress(
-                    Bytes.read(data)
+                    data.read_view()
                 )
             )
         ))
 
+    @staticmethod
+    def skip(data: Reader, *args: Any) -> None:
+        data.skip_bytes()
+
     def write(self, *args: Any) -> bytes:
         b = BytesIO()
 
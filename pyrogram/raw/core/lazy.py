@@ -0,0 +1,130 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from typing import Any, Union
+
+from .list import List
+from .primitives.vector import Vector
+from .reader import Reader, UINT
+from .tl_object import TLObject
+from ..all import objects
+
+RPC_RESULT_ID = 0xF35C6D01  # hex(crc32(b"rpc_result req_msg_id:long result:Object = RpcResult"))
+
+
+class Lazy:
+    """Span of an object that has not been decoded yet.
+
+    Lazy values are kept aside by the objects decoded by a :obj:`LazyReader` and are replaced by the decoded object
+    the first time the attribute they belong to is accessed.
+    """
+
+    __slots__ = ["data", "vector"]
+
+    def __init__(self, data: memoryview, vector: bool = False):
+        self.data = data
+        self.vector = vector
+
+    def decode(self) -> Any:
+        b = LazyReader(self.data)
+
+        if self.vector:
+            # Items of vector fields are always boxed objects, there's no need to guess their size
+            b.offset = 4
+            return List(TLObject.read(b) for _ in range(b.read_int()))
+
+        return TLObject.read(b)
+
+
+class Combinator(TLObject):
+    """Base of the generated raw types and functions.
+
+    Fields that a :obj:`LazyReader` left undecoded are kept as :obj:`Lazy` spans in :attr:`_lazy` while their own slots
+    stay empty, so that only reading one of them falls back to :meth:`__getattr__`, which decodes it and fills the
+    slot. Every other attribute access is a plain slot access, whether lazy decoding is in use or not.
+    """
+
+    __slots__ = ["_lazy"]
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            lazy = LAZY_SLOT.__get__(self)[name]
+        except (AttributeError, KeyError):
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}") from None
+
+        value = lazy.decode()
+        setattr(self, name, value)
+        LAZY_SLOT.__get__(self).pop(name, None)
+
+        return value
+
+
+LAZY_SLOT = Combinator._lazy
+
+
+class LazyReader(Reader):
+    """Reader that only decodes objects one level deep.
+
+    The top-level object is decoded as usual, but its object and vector fields are skipped over and kept as
+    :obj:`Lazy` spans of the original buffer, which are decoded on first access the same way. Vectors and RPC results
+    are transparent: their items are decoded as top-level objects. Spans keep the whole buffer alive.
+    """
+
+    __slots__ = ["depth"]
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview], offset: int = 0):
+        super().__init__(data, offset)
+        self.depth = 0
+
+    def read_object(self, *args: Any) -> Any:
+        offset = self.offset
+        constructor_id = UINT.unpack_from(self.buffer, offset)[0]
+
+        if self.depth and not args:
+            TLObject.skip(self)
+            return Lazy(self.buffer[offset:self.offset], constructor_id == Vector.ID)
+
+        self.offset = offset + 4
+
+        if constructor_id == Vector.ID or constructor_id == RPC_RESULT_ID:
+            return objects[constructor_id].read(self, *args)
+
+        self.depth += 1
+
+        try:
+            value = objects[constructor_id].read(self, *args)
+        finally:
+            self.depth -= 1
+
+        if isinstance(value, Combinator):
+            lazy = None
+
+            for name in value.__slots__:
+                field = getattr(value, name)
+
+                if field.__class__ is Lazy:
+                    if lazy is None:
+                        lazy = {}
+
+                    lazy[name] = field
+                    delattr(value, name)
+
+            if lazy is not None:
+                value._lazy = lazy
+
+        return value
@@ -0,0 +1,82 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import sys
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+
+class Objects(dict):
+    """Map of constructor IDs to classes, each class is only imported the first time it's looked up."""
+
+    def __init__(self, paths: Dict[int, str]):
+        super().__init__()
+        self.paths = paths
+
+    def __missing__(self, key: int) -> type:
+        path, name = self.paths[key].rsplit(".", 1)
+        value = self[key] = getattr(import_module(path), name)
+
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.paths
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def get(self, key: int, default: Any = None) -> Any:
+        return self[key] if key in self.paths else default
+
+    def keys(self):
+        return self.paths.keys()
+
+    def values(self):
+        return [self[key] for key in self.paths]
+
+    def items(self):
+        return [(key, self[key]) for key in self.paths]
+
+
+def namespace(name: str, members: Dict[str, str], namespaces: List[str]) -> Tuple[Callable, Callable]:
+    """Build the PEP 562 ``__getattr__`` and ``__dir__`` of a generated namespace.
+
+    Members are imported from their own module on first access and then cached in the namespace, so that only the
+    classes actually in use are ever loaded.
+    """
+    module = sys.modules[name]
+
+    def __getattr__(attr: str) -> Any:
+        if attr in namespaces:
+            value = import_module(f"{name}.{attr}")
+        elif attr in members:
+            value = getattr(import_module(f"{name}.{members[attr]}"), attr)
+        else:
+            raise AttributeError(f"module {name!r} has no attribute {attr!r}")
+
+        setattr(module, attr, value)
+
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted({*module.__dict__, *members, *namespaces})
+
+    return __getattr__, __dir__
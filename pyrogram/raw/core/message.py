@@ -16,41 +16,51 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from io import BytesIO
 from typing import Any
 
 from .primitives.int import Int, Long
+from .reader import Reader
 from .tl_object import TLObject
 
 
 class Message(TLObject):
     ID = 0x5BB8E511  # hex(crc32(b"message msg_id:long seqno:int bytes:int body:Object = Message"))
 
-    __slots__ = ["msg_id", "seq_no", "length", "body"]
+    __slots__ = ["msg_id", "seq_no", "length", "body", "data"]
 
     QUALNAME = "Message"
 
-    def __init__(self, body: TLObject, msg_id: int, seq_no: int, length: int):
+    def __init__(self, body: TLObject, msg_id: int, seq_no: int, length: int, data: bytes = None):
         self.msg_id = msg_id
         self.seq_no = seq_no
         self.length = length
         self.body = body
+        # Serialized body, kept around for outgoing messages so that it's only ever written once
+        self.data = data
 
     @staticmethod
-    def read(data: BytesIO, *args: Any) -> "Message":
-        msg_id = Long.read(data)
-        seq_no = Int.read(data)
-        length = Int.read(data)
-        body = data.read(length)
+    def read(data: Reader, *args: Any) -> "Message":
+        msg_id = data.read_long()
+        seq_no = data.read_int()
+        length = data.read_int()
+        # The body is decoded from a view bounded to its own length, no bytes are copied
+        body = data.__class__(data.buffer[data.offset:data.offset + length])
+        data.offset += length
 
-        return Message(TLObject.read(BytesIO(body)), msg_id, seq_no, length)
+        return Message(TLObject.read(body), msg_id, seq_no, length)
 
     def write(self, *args: Any) -> bytes:
-        b = BytesIO()
+        b = bytearray()
+        self.write_into(b)
 
-        b.write(Long(self.msg_id))
-        b.write(Int(self.seq_no))
-        b.write(Int(self.length))
-        b.write(self.body.write())
+        return bytes(b)
 
-        return b.getvalue()
+    def write_into(self, b: bytearray, *args: Any) -> None:
+        b += Long(self.msg_id)
+        b += Int(self.seq_no)
+        b += Int(self.length)
+
+        if self.data is None:
+            self.body.write_into(b)
+        else:
+            b += self.data
@@ -16,11 +16,11 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from io import BytesIO
 from typing import List, Any
 
 from .message import Message
 from .primitives.int import Int
+from .reader import Reader
 from .tl_object import TLObject
 
 
@@ -35,19 +35,21 @@ class MsgContainer(TLObject):
         self.messages = messages
 
     @staticmethod
-    def read(data: BytesIO, *args: Any) -> "MsgContainer":
-        count = Int.read(data)
+    def read(data: Reader, *args: Any) -> "MsgContainer":
+        count = data.read_int()
         return MsgContainer([Message.read(data) for _ in range(count)])
 
     def write(self, *args: Any) -> bytes:
-        b = BytesIO()
+        b = bytearray()
+        self.write_into(b)
 
-        b.write(Int(self.ID, False))
+        return bytes(b)
+
+    def write_into(self, b: bytearray, *args: Any) -> None:
+        b += Int(self.ID, False)
 
         count = len(self.messages)
-        b.write(Int(count))
+        b += Int(count)
 
         for message in self.messages:
-            b.write(message.write())
-
-        return b.getvalue()
+            message.write_into(b)
@@ -53,3 +53,17 @@ class Bytes(bytes, TLObject):
                 + value
                 + bytes(-length % 4)
             )
+
+    @staticmethod
+    def write_to(b: bytearray, value: bytes) -> None:
+        length = len(value)
+
+        if length <= 253:
+            b.append(length)
+            b += value
+            b += bytes(-(length + 1) % 4)
+        else:
+            b.append(254)
+            b += length.to_bytes(3, "little")
+            b += value
+            b += bytes(-length % 4)
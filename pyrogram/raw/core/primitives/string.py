@@ -29,3 +29,7 @@ class String(Bytes):
 
     def __new__(cls, value: str) -> bytes:  # type: ignore
         return super().__new__(cls, value.encode())
+
+    @staticmethod
+    def write_to(b: bytearray, value: str) -> None:  # type: ignore
+        Bytes.write_to(b, value.encode())
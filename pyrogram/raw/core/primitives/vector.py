@@ -16,51 +16,94 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from io import BytesIO
-from typing import cast, Union, Any
+from typing import Union, Any
 
 from .bool import BoolFalse, BoolTrue, Bool
-from .int import Int, Long
+from .bytes import Bytes
+from .double import Double
+from .int import Int, Long, Int128, Int256
+from .string import String
 from ..list import List
+from ..reader import Reader
 from ..tl_object import TLObject
 
 
 class Vector(bytes, TLObject):
     ID = 0x1CB5C415
 
+    # Core types are decoded straight from the Reader, without going through the primitives
+    READERS = {
+        Int: Reader.read_int,
+        Long: Reader.read_long,
+        Int128: Reader.read_int128,
+        Int256: Reader.read_int256,
+        Double: Reader.read_double,
+        Bool: Reader.read_bool,
+        Bytes: Reader.read_bytes,
+        String: Reader.read_string,
+    }
+
+    # Sizes of the fixed-width core types, used to skip vectors of them
+    SIZES = {Int: 4, Long: 8, Int128: 16, Int256: 32, Double: 8, Bool: 4}
+
     # Method added to handle the special case when a query returns a bare Vector (of Ints);
     # i.e., RpcResult body starts with 0x1cb5c415 (Vector Id) - e.g., messages.GetMessagesViews.
     @staticmethod
-    def read_bare(b: BytesIO, size: int) -> Union[int, Any]:
+    def read_bare(b: Reader, size: int) -> Union[int, Any]:
         if size == 4:
-            e = int.from_bytes(b.read(4), "little")
+            e = b.read_int(False)
             b.seek(-4, 1)
 
             if e in {BoolFalse.ID, BoolTrue.ID}:
-                return Bool.read(b)
+                return b.read_bool()
 
-            return Int.read(b)
+            return b.read_int()
 
         if size == 8:
-            return Long.read(b)
+            return b.read_long()
 
         return TLObject.read(b)
 
     @classmethod
-    def read(cls, data: BytesIO, t: Any = None, *args: Any) -> List:
-        count = Int.read(data)
-        left = len(data.read())
-        size = (left / count) if count else 0
-        data.seek(-left, 1)
-
-        return List(
-            t.read(data) if t
-            else Vector.read_bare(data, size)
-            for _ in range(count)
-        )
+    def read(cls, data: Reader, t: Any = None, *args: Any) -> List:
+        count = data.read_int()
+
+        if t is None:
+            size = (len(data.buffer) - data.offset) / count if count else 0
+
+            return List(Vector.read_bare(data, size) for _ in range(count))
+
+        read = Vector.READERS.get(t, t.read)
+
+        return List(read(data) for _ in range(count))
+
+    @staticmethod
+    def skip(data: Reader, t: Any = None, *args: Any) -> None:
+        count = data.read_int()
+
+        if t is None:
+            for _ in range(count):
+                TLObject.skip(data)
+        elif t in Vector.SIZES:
+            data.offset += count * Vector.SIZES[t]
+        else:
+            for _ in range(count):
+                data.skip_bytes()
 
     def __new__(cls, value: list, t: Any = None) -> bytes:  # type: ignore
-        return b"".join(
-            [Int(cls.ID, False), Int(len(value))]
-            + [cast(bytes, t(i)) if t else i.write() for i in value]
-        )
+        b = bytearray()
+        Vector.write_to(b, value, t)
+
+        return bytes(b)
+
+    @staticmethod
+    def write_to(b: bytearray, value: list, t: Any = None) -> None:
+        b += Int(Vector.ID, False)
+        b += Int(len(value))
+
+        if t:
+            for i in value:
+                b += t(i)
+        else:
+            for i in value:
+                i.write_into(b)
@@ -0,0 +1,135 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from struct import Struct
+from typing import Union
+
+INT = Struct("<i")
+UINT = Struct("<I")
+LONG = Struct("<q")
+ULONG = Struct("<Q")
+DOUBLE = Struct("<d")
+
+BOOL_TRUE = 0x997275B5
+
+
+class Reader:
+    """Zero-copy cursor used to deserialize TL objects.
+
+    Fields are decoded in place from a memoryview with :meth:`struct.Struct.unpack_from`, so that only the final
+    values are allocated. The subset of the :obj:`io.BytesIO` interface used by TL objects (``read``, ``seek``,
+    ``tell`` and ``getvalue``) is supported as well.
+    """
+
+    __slots__ = ["buffer", "offset"]
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview], offset: int = 0):
+        self.buffer = memoryview(data)
+        self.offset = offset
+
+    def read(self, n: int = -1) -> bytes:
+        start = self.offset
+        end = len(self.buffer) if n is None or n < 0 else min(start + n, len(self.buffer))
+        self.offset = end
+
+        return self.buffer[start:end].tobytes()
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 1:
+            offset += self.offset
+        elif whence == 2:
+            offset += len(self.buffer)
+
+        self.offset = max(offset, 0)
+
+        return self.offset
+
+    def tell(self) -> int:
+        return self.offset
+
+    def getvalue(self) -> bytes:
+        return self.buffer.tobytes()
+
+    def read_int(self, signed: bool = True) -> int:
+        offset = self.offset
+        self.offset = offset + 4
+
+        return (INT if signed else UINT).unpack_from(self.buffer, offset)[0]
+
+    def read_long(self, signed: bool = True) -> int:
+        offset = self.offset
+        self.offset = offset + 8
+
+        return (LONG if signed else ULONG).unpack_from(self.buffer, offset)[0]
+
+    def read_int128(self, signed: bool = True) -> int:
+        value = int.from_bytes(self.buffer[self.offset:self.offset + 16], "little", signed=signed)
+        self.offset += 16
+
+        return value
+
+    def read_int256(self, signed: bool = True) -> int:
+        value = int.from_bytes(self.buffer[self.offset:self.offset + 32], "little", signed=signed)
+        self.offset += 32
+
+        return value
+
+    def read_double(self) -> float:
+        offset = self.offset
+        self.offset = offset + 8
+
+        return DOUBLE.unpack_from(self.buffer, offset)[0]
+
+    def read_bool(self) -> bool:
+        offset = self.offset
+        self.offset = offset + 4
+
+        return UINT.unpack_from(self.buffer, offset)[0] == BOOL_TRUE
+
+    def read_bytes(self) -> bytes:
+        return self.read_view().tobytes()
+
+    def read_string(self) -> str:
+        return str(self.read_view(), "utf-8", "replace")
+
+    def skip_bytes(self) -> None:
+        buffer = self.buffer
+        offset = self.offset
+        length = buffer[offset]
+
+        if length <= 253:
+            self.offset = offset + 1 + length + (-(length + 1) % 4)
+        else:
+            length = buffer[offset + 1] | buffer[offset + 2] << 8 | buffer[offset + 3] << 16
+            self.offset = offset + 4 + length + (-length % 4)
+
+    def read_view(self) -> memoryview:
+        """Read a TL ``bytes`` field without copying it."""
+        buffer = self.buffer
+        offset = self.offset
+        length = buffer[offset]
+
+        if length <= 253:
+            offset += 1
+            self.offset = offset + length + (-(length + 1) % 4)
+        else:
+            length = buffer[offset + 1] | buffer[offset + 2] << 8 | buffer[offset + 3] << 16
+            offset += 4
+            self.offset = offset + length + (-length % 4)
+
+        return buffer[offset:offset + length]
@@ -20,6 +20,7 @@ from io import BytesIO
 from json import dumps
 from typing import cast, List, Any, Union, Dict
 
+from .reader import Reader, UINT
 from ..all import objects
 
 
@@ -29,12 +30,38 @@ class TLObject:
     QUALNAME = "Base"
 
     @classmethod
-    def read(cls, b: BytesIO, *args: Any) -> Any:
-        return cast(TLObject, objects[int.from_bytes(b.read(4), "little")]).read(b, *args)
+    def read(cls, b: Union[Reader, BytesIO], *args: Any) -> Any:
+        if b.__class__ is Reader:
+            offset = b.offset
+            b.offset = offset + 4
+
+            return cast(TLObject, objects[UINT.unpack_from(b.buffer, offset)[0]]).read(b, *args)
+
+        if isinstance(b, Reader):
+            # Reader subclasses, such as LazyReader, decide how objects are read
+            return b.read_object(*args)
+
+        # Keep supporting file-like objects by decoding from a Reader and moving them past the object
+        reader = Reader(b.getvalue(), b.tell())
+
+        try:
+            return TLObject.read(reader, *args)
+        finally:
+            b.seek(reader.offset)
+
+    @classmethod
+    def skip(cls, b: Reader, *args: Any) -> None:
+        offset = b.offset
+        b.offset = offset + 4
+
+        objects[UINT.unpack_from(b.buffer, offset)[0]].skip(b, *args)
 
     def write(self, *args: Any) -> bytes:
         pass
 
+    def write_into(self, b: bytearray, *args: Any) -> None:
+        b += self.write(*args)
+
     @staticmethod
     def default(obj: "TLObject") -> Union[str, Dict[str, str]]:
         if isinstance(obj, bytes):
@@ -20,7 +20,6 @@ import asyncio
 import logging
 import time
 from hashlib import sha1
-from io import BytesIO
 from os import urandom
 from typing import Optional
 
@@ -29,7 +28,7 @@ from pyrogram import raw
 from pyrogram.connection import Connection
 from pyrogram.crypto import aes, rsa, prime
 from pyrogram.errors import SecurityCheckMismatch
-from pyrogram.raw.core import TLObject, Long, Int
+from pyrogram.raw.core import TLObject, Long, Int, Reader
 from .internals import MsgId
 
 log = logging.getLogger(__name__)
@@ -55,22 +54,24 @@ class Auth:
 
     @staticmethod
     def pack(data: TLObject) -> bytes:
+        data = data.write()
+
         return (
             bytes(8)
             + Long(MsgId())
-            + Int(len(data.write()))
-            + data.write()
+            + Int(len(data))
+            + data
         )
 
     @staticmethod
-    def unpack(b: BytesIO):
+    def unpack(b: Reader):
         b.seek(20)  # Skip auth_key_id (8), message_id (8) and message_length (4)
         return TLObject.read(b)
 
     async def invoke(self, data: TLObject):
         data = self.pack(data)
         await self.connection.send(data)
-        response = BytesIO(await self.connection.recv())
+        response = Reader(await self.connection.recv())
 
         return self.unpack(response)
 
@@ -176,7 +177,7 @@ class Auth:
                 answer_with_hash = aes.ige256_decrypt(encrypted_answer, tmp_aes_key, tmp_aes_iv)
                 answer = answer_with_hash[20:]
 
-                server_dh_inner_data = TLObject.read(BytesIO(answer))
+                server_dh_inner_data = TLObject.read(Reader(answer))
 
                 log.debug("Done decrypting answer")
 
@@ -30,9 +30,12 @@ class MsgFactory:
         self.seq_no = SeqNo()
 
     def __call__(self, body: TLObject) -> Message:
+        data = body.write()
+
         return Message(
             body,
             MsgId(),
             self.seq_no(not isinstance(body, not_content_related)),
-            len(body)
+            len(data),
+            data
         )
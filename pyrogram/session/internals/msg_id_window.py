@@ -0,0 +1,58 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import deque
+
+
+class MsgIdWindow:
+    """Bounded window of the most recently received msg_ids.
+
+    Lookups, insertions and evictions are all O(1): msg_ids are kept in a ring buffer (in arrival order) backed by
+    a set for membership tests. Since evicted msg_ids can't be checked for duplicates anymore, the lower bound moves
+    past each evicted value, so that every msg_id below :attr:`min_msg_id` must be rejected.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+
+        self.queue = deque()
+        self.msg_ids = set()
+        self.min_msg_id = 0
+
+    def add(self, msg_id: int):
+        if not self.queue:
+            self.min_msg_id = max(self.min_msg_id, msg_id)
+
+        self.queue.append(msg_id)
+        self.msg_ids.add(msg_id)
+
+        if len(self.queue) > self.size:
+            evicted = self.queue.popleft()
+            self.msg_ids.discard(evicted)
+            self.min_msg_id = max(self.min_msg_id, evicted + 1)
+
+    def clear(self):
+        self.queue.clear()
+        self.msg_ids.clear()
+        self.min_msg_id = 0
+
+    def __contains__(self, msg_id: int) -> bool:
+        return msg_id in self.msg_ids
+
+    def __len__(self) -> int:
+        return len(self.queue)
@@ -17,12 +17,10 @@
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 import asyncio
-import bisect
 import logging
 import os
-from hashlib import sha1
 from io import BytesIO
-from typing import Optional
+from typing import List
 
 import pyrogram
 from pyrogram import raw
@@ -34,7 +32,7 @@ from pyrogram.errors import (
 )
 from pyrogram.raw.all import layer
 from pyrogram.raw.core import TLObject, MsgContainer, Int, FutureSalts
-from .internals import MsgId, MsgFactory
+from .internals import MsgId, MsgFactory, MsgIdWindow
 
 log = logging.getLogger(__name__)
 
@@ -50,9 +48,12 @@ class Session:
     WAIT_TIMEOUT = 15
     SLEEP_THRESHOLD = 10
     MAX_RETRIES = 10
-    ACKS_THRESHOLD = 10
+    ACKS_FLUSH_INTERVAL = 1
     PING_INTERVAL = 5
     STORED_MSG_IDS_MAX_SIZE = 1000 * 2
+    CONTAINER_MAX_LENGTH = 100
+    CONTAINER_MAX_SIZE = 1 << 15
+    CONTAINERS_MAX_SIZE = 1000
 
     TRANSPORT_ERRORS = {
         404: "auth key not found",
@@ -67,7 +68,8 @@ class Session:
         auth_key: bytes,
         test_mode: bool,
         is_media: bool = False,
-        is_cdn: bool = False
+        is_cdn: bool = False,
+        connections: int = 1
     ):
         self.client = client
         self.dc_id = dc_id
@@ -75,26 +77,38 @@ class Session:
         self.test_mode = test_mode
         self.is_media = is_media
         self.is_cdn = is_cdn
+        self.pool_size = max(1, connections)
 
-        self.connection: Optional[Connection] = None
+        # All the connections share the same auth key and session, so the server may answer on any of them
+        self.connections: List[Connection] = []
 
-        self.auth_key_id = sha1(auth_key).digest()[-8:]
+        # Slices and hash states of the auth key that are used to pack and unpack every single message
+        self.auth_key_slices = mtproto.AuthKey(auth_key)
+        self.auth_key_id = self.auth_key_slices.id
 
         self.session_id = os.urandom(8)
         self.msg_factory = MsgFactory()
 
         self.salt = 0
 
+        # Acks are piggybacked onto outgoing traffic and only sent on their own when the link is idle
         self.pending_acks = set()
+        self.piggybacked_acks = 0
 
         self.results = {}
 
-        self.stored_msg_ids = []
+        # Outgoing messages are coalesced into containers by the send worker. Container msg_ids are mapped to the
+        # msg_ids they carry, so that notifications referring to a whole container reach every request inside it.
+        self.send_queue = asyncio.Queue()
+        self.containers = {}
+
+        self.stored_msg_ids = MsgIdWindow(Session.STORED_MSG_IDS_MAX_SIZE)
 
         self.ping_task = None
         self.ping_task_event = asyncio.Event()
 
-        self.recv_task = None
+        self.recv_tasks = []
+        self.send_tasks = []
 
         self.is_started = asyncio.Event()
 
@@ -102,19 +116,25 @@ class Session:
 
     async def start(self):
         while True:
-            self.connection = self.client.connection_factory(
-                dc_id=self.dc_id,
-                test_mode=self.test_mode,
-                ipv6=self.client.ipv6,
-                proxy=self.client.proxy,
-                media=self.is_media,
-                protocol_factory=self.client.protocol_factory
-            )
+            self.connections = []
 
             try:
-                await self.connection.connect()
+                for _ in range(self.pool_size):
+                    connection = self.client.connection_factory(
+                        dc_id=self.dc_id,
+                        test_mode=self.test_mode,
+                        ipv6=self.client.ipv6,
+                        proxy=self.client.proxy,
+                        media=self.is_media,
+                        protocol_factory=self.client.protocol_factory
+                    )
+
+                    self.connections.append(connection)
+                    await connection.connect()
 
-                self.recv_task = self.loop.create_task(self.recv_worker())
+                for connection in self.connections:
+                    self.recv_tasks.append(self.loop.create_task(self.recv_worker(connection)))
+                    self.send_tasks.append(self.loop.create_task(self.send_worker(connection)))
 
                 await self.send(raw.functions.Ping(ping_id=0), timeout=self.START_TIMEOUT)
 
@@ -169,10 +189,27 @@ class Session:
 
         self.ping_task_event.clear()
 
-        await self.connection.close()
+        if self.send_tasks:
+            for _ in self.send_tasks:
+                self.send_queue.put_nowait(None)
+
+            await asyncio.gather(*self.send_tasks)
+            self.send_tasks.clear()
+
+        while not self.send_queue.empty():
+            item = self.send_queue.get_nowait()
+
+            if item is not None and not item[1].done():
+                item[1].set_exception(ConnectionError("Session stopped"))
+
+        self.containers.clear()
 
-        if self.recv_task:
-            await self.recv_task
+        for connection in self.connections:
+            await connection.close()
+
+        if self.recv_tasks:
+            recv_tasks, self.recv_tasks = self.recv_tasks, []
+            await asyncio.gather(*recv_tasks)
 
         if not self.is_media and callable(self.client.disconnect_handler):
             try:
@@ -186,19 +223,26 @@ class Session:
         await self.stop()
         await self.start()
 
-    async def handle_packet(self, packet):
+    def schedule_restart(self):
+        # Connections failing together must not restart the session over each other, the first one does it for all
+        if self.is_started.is_set():
+            self.is_started.clear()
+            self.loop.create_task(self.restart())
+
+    async def handle_packet(self, connection: Connection, packet):
         try:
-            data = await self.loop.run_in_executor(
-                pyrogram.crypto_executor,
+            data = await pyrogram.crypto_executor.run(
+                (self, mtproto.unpack),
+                len(packet),
                 mtproto.unpack,
-                BytesIO(packet),
+                packet,
                 self.session_id,
-                self.auth_key,
-                self.auth_key_id
+                self.auth_key_slices,
+                self.client.lazy_decoding
             )
         except ValueError as e:
             log.debug(e)
-            self.loop.create_task(self.restart())
+            self.schedule_restart()
             return
 
         messages = (
@@ -217,11 +261,8 @@ class Session:
                     self.pending_acks.add(msg.msg_id)
 
             try:
-                if len(self.stored_msg_ids) > Session.STORED_MSG_IDS_MAX_SIZE:
-                    del self.stored_msg_ids[:Session.STORED_MSG_IDS_MAX_SIZE // 2]
-
                 if self.stored_msg_ids:
-                    if msg.msg_id < self.stored_msg_ids[0]:
+                    if msg.msg_id < self.stored_msg_ids.min_msg_id:
                         raise SecurityCheckMismatch("The msg_id is lower than all the stored values")
 
                     if msg.msg_id in self.stored_msg_ids:
@@ -238,10 +279,10 @@ class Session:
                                                     "Most likely the client time has to be synchronized.")
             except SecurityCheckMismatch as e:
                 log.info("Discarding packet: %s", e)
-                await self.connection.close()
+                await connection.close()
                 return
             else:
-                bisect.insort(self.stored_msg_ids, msg.msg_id)
+                self.stored_msg_ids.add(msg.msg_id)
 
             if isinstance(msg.body, (raw.types.MsgDetailedInfo, raw.types.MsgNewDetailedInfo)):
                 self.pending_acks.add(msg.body.answer_msg_id)
@@ -262,19 +303,10 @@ class Session:
                 if self.client is not None:
                     self.loop.create_task(self.client.handle_updates(msg.body))
 
-            if msg_id in self.results:
-                self.results[msg_id].value = getattr(msg.body, "result", msg.body)
-                self.results[msg_id].event.set()
-
-        if len(self.pending_acks) >= self.ACKS_THRESHOLD:
-            log.debug("Sending %s acks", len(self.pending_acks))
-
-            try:
-                await self.send(raw.types.MsgsAck(msg_ids=list(self.pending_acks)), False)
-            except OSError:
-                pass
-            else:
-                self.pending_acks.clear()
+            for i in self.containers.pop(msg_id, None) or (msg_id,):
+                if i in self.results:
+                    self.results[i].value = getattr(msg.body, "result", msg.body)
+                    self.results[i].event.set()
 
     async def ping_worker(self):
         log.info("PingTask started")
@@ -294,18 +326,18 @@ class Session:
                     ), False
                 )
             except OSError:
-                self.loop.create_task(self.restart())
+                self.schedule_restart()
                 break
             except RPCError:
                 pass
 
         log.info("PingTask stopped")
 
-    async def recv_worker(self):
+    async def recv_worker(self, connection: Connection):
         log.info("NetworkTask started")
 
         while True:
-            packet = await self.connection.recv()
+            packet = await connection.recv()
 
             if packet is None or len(packet) == 4:
                 if packet:
@@ -322,16 +354,140 @@ class Session:
                         error_code, Session.TRANSPORT_ERRORS.get(error_code, "unknown error")
                     )
 
-                if self.is_started.is_set():
-                    self.loop.create_task(self.restart())
+                self.schedule_restart()
 
                 break
 
-            self.loop.create_task(self.handle_packet(packet))
+            self.loop.create_task(self.handle_packet(connection, packet))
 
         log.info("NetworkTask stopped")
 
+    async def send_worker(self, connection: Connection):
+        log.info("SendTask started")
+
+        # Every worker pulls from the shared queue as soon as its own connection is free again, so a slow write on
+        # one socket doesn't hold back the messages that the others can send in the meantime.
+        last_send = self.loop.time()
+
+        while True:
+            try:
+                item = await asyncio.wait_for(self.send_queue.get(), self.ACKS_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                if self.pending_acks:
+                    await self.send_batch(connection, [])
+                    last_send = self.loop.time()
+                elif self.loop.time() - last_send >= self.PING_INTERVAL:
+                    # The ping worker's pings go through the shared queue and may leave any connection idle
+                    await self.send_ping(connection)
+                    last_send = self.loop.time()
+
+                continue
+
+            if item is None:
+                break
+
+            # Everything enqueued during the same loop iteration is already waiting in the queue by now
+            items = [item]
+
+            while len(items) < self.CONTAINER_MAX_LENGTH and not self.send_queue.empty():
+                item = self.send_queue.get_nowait()
+
+                if item is None:
+                    break
+
+                items.append(item)
+
+            batch = []
+            batch_size = 0
+
+            for i in items:
+                if batch and (
+                    len(batch) >= self.CONTAINER_MAX_LENGTH
+                    or batch_size + i[0].length > self.CONTAINER_MAX_SIZE
+                ):
+                    await self.send_batch(connection, batch)
+
+                    batch = []
+                    batch_size = 0
+
+                batch.append(i)
+                batch_size += i[0].length
+
+            await self.send_batch(connection, batch)
+            last_send = self.loop.time()
+
+            if item is None:
+                break
+
+        log.info("SendTask stopped")
+
+    async def send_ping(self, connection: Connection):
+        future = self.loop.create_future()
+        message = self.msg_factory(
+            raw.functions.PingDelayDisconnect(ping_id=0, disconnect_delay=self.WAIT_TIMEOUT + 10)
+        )
+
+        await self.send_batch(connection, [(message, future)])
+
+        if future.exception() is not None:
+            log.debug("Unable to ping: %s", future.exception())
+
+    async def send_batch(self, connection: Connection, items: list):
+        messages = [i[0] for i in items]
+        acks = None
+
+        if self.pending_acks and sum(m.length for m in messages) <= self.CONTAINER_MAX_SIZE:
+            acks = list(self.pending_acks)
+            self.pending_acks.clear()
+
+            messages.append(self.msg_factory(raw.types.MsgsAck(msg_ids=acks)))
+
+            log.debug("Sending %s acks", len(acks))
+
+        if len(messages) == 1:
+            message = messages[0]
+        else:
+            message = self.msg_factory(MsgContainer(messages))
+
+            self.containers[message.msg_id] = [m.msg_id for m in messages]
+
+            if len(self.containers) > self.CONTAINERS_MAX_SIZE:
+                for _ in range(self.CONTAINERS_MAX_SIZE // 2):
+                    del self.containers[next(iter(self.containers))]
+
+            log.debug("Packed %s messages into container %s", len(messages), message.msg_id)
+
+        try:
+            payload = await pyrogram.crypto_executor.run(
+                (connection, mtproto.pack),
+                message.length,
+                mtproto.pack,
+                message,
+                self.salt,
+                self.session_id,
+                self.auth_key_slices
+            )
+
+            await connection.send(payload)
+        except Exception as e:
+            if acks:
+                self.pending_acks.update(acks)
+
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            if acks and items:
+                self.piggybacked_acks += len(acks)
+
+            for _, future in items:
+                if not future.done():
+                    future.set_result(None)
+
     async def send(self, data: TLObject, wait_response: bool = True, timeout: float = WAIT_TIMEOUT):
+        if not self.send_tasks:
+            raise ConnectionError("Session is not connected")
+
         message = self.msg_factory(data)
         msg_id = message.msg_id
 
@@ -340,19 +496,12 @@ class Session:
 
         log.debug("Sent: %s", message)
 
-        payload = await self.loop.run_in_executor(
-            pyrogram.crypto_executor,
-            mtproto.pack,
-            message,
-            self.salt,
-            self.session_id,
-            self.auth_key,
-            self.auth_key_id
-        )
+        future = self.loop.create_future()
+        self.send_queue.put_nowait((message, future))
 
         try:
-            await self.connection.send(payload)
-        except OSError as e:
+            await future
+        except Exception as e:
             self.results.pop(msg_id, None)
             raise e
 
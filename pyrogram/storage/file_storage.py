@@ -47,6 +47,14 @@ CREATE TABLE update_state
 );
 """
 
+EXPORTED_AUTH_KEYS_SCHEMA = """
+CREATE TABLE exported_auth_keys
+(
+    dc_id    INTEGER PRIMARY KEY,
+    auth_key BLOB
+);
+"""
+
 
 class FileStorage(SQLiteStorage):
     FILE_EXTENSION = ".session"
@@ -89,6 +97,12 @@ class FileStorage(SQLiteStorage):
 
             version += 1
 
+        if version == 6:
+            with self.conn:
+                self.conn.executescript(EXPORTED_AUTH_KEYS_SCHEMA)
+
+            version += 1
+
         self.version(version)
 
     async def open(self):
@@ -63,6 +63,12 @@ CREATE TABLE update_state
     seq  INTEGER
 );
 
+CREATE TABLE exported_auth_keys
+(
+    dc_id    INTEGER PRIMARY KEY,
+    auth_key BLOB
+);
+
 CREATE TABLE version
 (
     number INTEGER PRIMARY KEY
@@ -106,7 +112,7 @@ def get_input_peer(peer_id: int, access_hash: int, peer_type: str):
 
 
 class SQLiteStorage(Storage):
-    VERSION = 6
+    VERSION = 7
     USERNAME_TTL = 8 * 60 * 60
 
     def __init__(self, name: str):
@@ -189,6 +195,27 @@ class SQLiteStorage(Storage):
                         value
                     )
 
+    async def exported_auth_key(self, dc_id: int, value: bytes = object):
+        if value == object:
+            r = self.conn.execute(
+                "SELECT auth_key FROM exported_auth_keys WHERE dc_id = ?",
+                (dc_id,)
+            ).fetchone()
+
+            return r[0] if r else None
+        else:
+            with self.conn:
+                if value is None:
+                    self.conn.execute(
+                        "DELETE FROM exported_auth_keys WHERE dc_id = ?",
+                        (dc_id,)
+                    )
+                else:
+                    self.conn.execute(
+                        "REPLACE INTO exported_auth_keys (dc_id, auth_key) VALUES (?, ?)",
+                        (dc_id, value)
+                    )
+
     async def get_peer_by_id(self, peer_id: int):
         r = self.conn.execute(
             "SELECT id, access_hash, type FROM peers WHERE id = ?",
@@ -92,6 +92,22 @@ class Storage(ABC):
         """
         raise NotImplementedError
 
+    async def exported_auth_key(self, dc_id: int, value: bytes = object):
+        """Get or set the authorization key used for sessions on a DC other than the one of the current session.
+
+        These keys have already been authorized by importing the authorization of the current session, which is what
+        makes reusing them after a restart cheap. Storage engines that don't override this method don't keep them, and
+        such sessions are authorized from scratch after every restart.
+
+        Parameters:
+            dc_id (``int``):
+                The DC ID of the key.
+
+            value (``bytes``, *optional*):
+                The authorization key to set, None to forget the key of this DC.
+        """
+        return None
+
     @abstractmethod
     async def get_peer_by_id(self, peer_id: int):
         """Retrieve a peer by its ID.
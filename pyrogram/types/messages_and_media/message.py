@@ -4754,7 +4754,8 @@ class Message(Object, Update):
         in_memory: bool = False,
         block: bool = True,
         progress: Callable = None,
-        progress_args: tuple = ()
+        progress_args: tuple = (),
+        resume: bool = False
     ) -> str:
         """Bound method *download* of :obj:`~pyrogram.types.Message`.
 
@@ -4796,6 +4797,11 @@ class Message(Object, Update):
                 You can pass anything you need to be available in the progress callback scope; for example, a Message
                 object or a Client instance in order to edit the message with the updated progress status.
 
+            resume (``bool``, *optional*):
+                Pass True to download the file in parallel chunks and keep the progress on disk, so that a failed or
+                stopped download can be resumed by downloading again with the same *file_name*.
+                Defaults to False.
+
         Other Parameters:
             current (``int``):
                 The amount of bytes transmitted so far.
@@ -4819,6 +4825,7 @@ class Message(Object, Update):
             file_name=file_name,
             in_memory=in_memory,
             block=block,
+            resume=resume,
             progress=progress,
             progress_args=progress_args,
         )
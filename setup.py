@@ -83,7 +83,7 @@ setup(
     package_data={
         "pyrogram": ["py.typed"],
     },
-    packages=find_packages(exclude=["compiler*", "tests*"]),
+    packages=find_packages(exclude=["compiler*", "tests*", "benchmarks*"]),
     zip_safe=False,
     install_requires=requires
 )
@@ -0,0 +1,96 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import os
+
+import pytest
+
+from pyrogram.connection.transport import (
+    TCP, TCPAbridged, TCPAbridgedO, TCPFull, TCPIntermediate, TCPIntermediateO, Stream, ReaderStream
+)
+from pyrogram.crypto import aes
+
+SIZES = [4, 1024, 64 * 1024, 64 * 1024 + 4, 1024 * 1024]
+
+
+async def echo_server(handshake: int, obfuscated: bool) -> asyncio.AbstractServer:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        nonce = await reader.readexactly(handshake)
+        decrypt = encrypt = bytes
+
+        if obfuscated:
+            temp = nonce[55:7:-1]
+            decrypt = aes.CTR(nonce[8:40], nonce[40:56]).decrypt
+            encrypt = aes.CTR(temp[0:32], temp[32:48]).encrypt
+            decrypt(nonce)
+
+        # Frames are made the same way in both directions, except for the obfuscation keys
+        while data := await reader.read(64 * 1024):
+            writer.write(encrypt(decrypt(data)))
+
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stream", [Stream, ReaderStream])
+@pytest.mark.parametrize("transport, handshake, obfuscated", [
+    (TCPAbridged, 1, False),
+    (TCPIntermediate, 4, False),
+    (TCPFull, 0, False),
+    (TCPAbridgedO, 64, True),
+    (TCPIntermediateO, 64, True),
+])
+async def test_echo(monkeypatch, transport, handshake, obfuscated, stream):
+    monkeypatch.setattr(TCP, "STREAM", stream)
+    server = await echo_server(handshake, obfuscated)
+    tcp = transport(ipv6=False, proxy={})
+    await tcp.connect(server.sockets[0].getsockname())
+
+    packets = [os.urandom(size) for size in SIZES]
+
+    # Everything is sent before reading, so that frames are received back to back
+    for packet in packets:
+        await tcp.send(packet)
+
+    for packet in packets:
+        assert await tcp.recv() == packet
+
+    await tcp.close()
+    server.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stream", [Stream, ReaderStream])
+async def test_timeout_and_close(monkeypatch, stream):
+    monkeypatch.setattr(TCP, "TIMEOUT", 0.2)
+    monkeypatch.setattr(TCP, "STREAM", stream)
+    server = await echo_server(1, False)
+    tcp = TCPAbridged(ipv6=False, proxy={})
+    await tcp.connect(server.sockets[0].getsockname())
+
+    assert await tcp.recv() is None
+
+    await tcp.send(bytes(8))
+    await tcp.close()
+
+    assert await tcp.recv() is None
+
+    server.close()
@@ -0,0 +1,89 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import importlib.util
+import os
+import random
+import sys
+
+import pytest
+
+from pyrogram.crypto import aes
+
+
+def test_ctr_stream():
+    key, iv = os.urandom(32), os.urandom(16)
+    data = os.urandom(4096)
+    expected = aes.ctr256_encrypt(data, key, bytearray(iv))
+
+    encryptor, decryptor = aes.CTR(key, iv), aes.CTR(key, iv)
+    encrypted = []
+    decrypted = []
+    offset = 0
+
+    # Uneven chunks, as for 1, 3 and 4 bytes length prefixes followed by the packets
+    while offset < len(data):
+        size = random.choice((1, 3, 4, 15, 16, 17, 100, 500))
+        chunk = expected[offset:offset + size]
+        encrypted.append(encryptor.encrypt(data[offset:offset + size]))
+        decrypted.append(decryptor.decrypt(chunk))
+        offset += size
+
+    assert b"".join(encrypted) == expected
+    assert b"".join(decrypted) == data
+
+
+def test_ctr_counter_wraps():
+    key = os.urandom(32)
+    data = os.urandom(64)
+
+    assert aes.CTR(key, b"\xff" * 16).encrypt(data) == aes.ctr256_encrypt(data, key, bytearray(b"\xff" * 16))
+
+
+@pytest.mark.parametrize("hidden", [["tgcrypto"], ["tgcrypto", "cryptography.hazmat.primitives.ciphers"]])
+def test_fallbacks_match(hidden, monkeypatch):
+    # A None entry makes any import of that module raise ImportError
+    for name in hidden:
+        monkeypatch.setitem(sys.modules, name, None)
+
+    spec = importlib.util.spec_from_file_location("fallback_aes", aes.__file__)
+    fallback = importlib.util.module_from_spec(spec)
+
+    try:
+        spec.loader.exec_module(fallback)
+    except ImportError:
+        pytest.skip("backend not installed")
+
+    key, iv = os.urandom(32), os.urandom(32)
+    data = os.urandom(1024)
+    encrypted = aes.ige256_encrypt(data, key, iv)
+
+    assert fallback.ige256_encrypt(data, key, iv) == encrypted
+    assert fallback.ige256_decrypt(encrypted, key, iv) == data
+
+    expected_iv, expected_state = bytearray(iv[:16]), bytearray(1)
+    fallback_iv, fallback_state = bytearray(iv[:16]), bytearray(1)
+
+    for size in (1, 3, 4, 17, 100):
+        assert (
+            fallback.ctr256_encrypt(data[:size], key, fallback_iv, fallback_state)
+            == aes.ctr256_encrypt(data[:size], key, expected_iv, expected_state)
+        )
+        assert (fallback_iv, fallback_state) == (expected_iv, expected_state)
+
+    assert fallback.CTR(key, iv[:16]).encrypt(data) == aes.CTR(key, iv[:16]).encrypt(data)
@@ -0,0 +1,91 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pyrogram.crypto.executor import CryptoExecutor
+
+
+def job(i: int, delay: float = 0) -> tuple:
+    time.sleep(delay)
+    return i, threading.current_thread()
+
+
+@pytest.mark.asyncio
+async def test_small_jobs_run_inline():
+    executor = CryptoExecutor(workers=2, inline_max_size=1024)
+
+    assert await executor.run("lane", 1024, job, 1) == (1, threading.current_thread())
+    assert (await executor.run("lane", 1025, job, 2))[1] is not threading.current_thread()
+    assert (executor.inline_jobs, executor.pool_jobs) == (1, 1)
+    assert not executor.lanes
+
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_lane_order():
+    executor = CryptoExecutor(workers=4, inline_max_size=1024)
+    done = []
+
+    async def run(lane: str, i: int, size: int, delay: float):
+        done.append((lane, (await executor.run(lane, size, job, i, delay))[0]))
+
+    # Earlier jobs are the slowest, small jobs queued behind big ones must wait for them as well
+    await asyncio.gather(*[
+        run(lane, i, 1 if i % 2 else 2048, 0.04 - i * 0.01)
+        for i in range(4)
+        for lane in ("a", "b")
+    ])
+
+    assert [i for lane, i in done if lane == "a"] == [0, 1, 2, 3]
+    assert [i for lane, i in done if lane == "b"] == [0, 1, 2, 3]
+    assert executor.queue_delay_max > 0
+    assert not executor.lanes
+
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_jobs_keep_lane_order():
+    executor = CryptoExecutor(workers=2, inline_max_size=0)
+    done = []
+
+    def record(i: int, delay: float = 0):
+        time.sleep(delay)
+        done.append(i)
+
+    first = asyncio.ensure_future(executor.run("lane", 1, record, 1, 0.05))
+    second = asyncio.ensure_future(executor.run("lane", 1, record, 2))
+    third = asyncio.ensure_future(executor.run("lane", 1, record, 3))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    second.cancel()
+
+    await third
+
+    # The first job was already running and is waited for, the second one never started
+    assert done == [1, 3]
+    assert first.cancelled() and second.cancelled()
+    assert not executor.lanes
+
+    executor.shutdown()
@@ -0,0 +1,80 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+from hashlib import sha256
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.crypto import aes, mtproto
+from pyrogram.errors import SecurityCheckMismatch
+from pyrogram.raw.core import Message, Long, Reader
+
+AUTH_KEY = mtproto.AuthKey(os.urandom(256))
+SESSION_ID = os.urandom(8)
+
+
+def server_pack(message: Message, x: int = 8) -> bytes:
+    # Straight from https://core.telegram.org/mtproto/description
+    data = Long(0) + SESSION_ID + message.write()
+    data += os.urandom(-(len(data) + 12) % 16 + 12)
+    msg_key = sha256(AUTH_KEY.key[88 + x:88 + x + 32] + data).digest()[8:24]
+
+    sha256_a = sha256(msg_key + AUTH_KEY.key[x:x + 36]).digest()
+    sha256_b = sha256(AUTH_KEY.key[x + 40:x + 76] + msg_key).digest()
+    aes_key = sha256_a[:8] + sha256_b[8:24] + sha256_a[24:32]
+    aes_iv = sha256_b[:8] + sha256_a[8:24] + sha256_b[24:32]
+
+    return AUTH_KEY.id + msg_key + aes.ige256_encrypt(data, aes_key, aes_iv)
+
+
+def message(size: int = 0) -> Message:
+    return Message(raw.types.Pong(msg_id=1, ping_id=size), 0x5bb8e511 * 2 + 1, 1, 20)
+
+
+def test_pack():
+    packet = mtproto.pack(message(), 0, SESSION_ID, AUTH_KEY)
+    aes_key, aes_iv = mtproto.kdf(AUTH_KEY.key, bytes(packet[8:24]), True)
+    data = aes.ige256_decrypt(bytes(packet[24:]), aes_key, aes_iv)
+
+    assert packet[:8] == AUTH_KEY.id
+    assert packet[8:24] == sha256(AUTH_KEY.key[88:120] + data).digest()[8:24]
+    assert len(packet) % 16 == 8 and 12 <= len(data) - 16 - len(message().write()) <= 1024
+    assert Message.read(Reader(data[16:])) == message()
+
+
+def test_unpack():
+    unpacked = mtproto.unpack(server_pack(message()), SESSION_ID, AUTH_KEY)
+
+    assert unpacked.body == raw.types.Pong(msg_id=1, ping_id=0)
+    assert unpacked.msg_id == message().msg_id
+
+
+def test_unpack_checks():
+    packet = bytearray(server_pack(message()))
+    packet[8] ^= 1
+
+    with pytest.raises(SecurityCheckMismatch):
+        mtproto.unpack(packet, SESSION_ID, AUTH_KEY)
+
+    with pytest.raises(SecurityCheckMismatch):
+        mtproto.unpack(server_pack(message(), x=0), SESSION_ID, AUTH_KEY)
+
+    with pytest.raises(SecurityCheckMismatch):
+        mtproto.unpack(server_pack(message()), os.urandom(8), AUTH_KEY)
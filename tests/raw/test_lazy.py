@@ -0,0 +1,106 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.raw.core import TLObject, Reader, LazyReader, Lazy, Vector, Int, Long
+
+
+def message() -> "raw.types.Message":
+    return raw.types.Message(
+        id=1,
+        peer_id=raw.types.PeerChannel(channel_id=2),
+        date=1_700_000_000,
+        message="hello world",
+        media=raw.types.MessageMediaDice(value=6, emoticon="🎲"),
+        entities=[
+            raw.types.MessageEntityBold(offset=0, length=5),
+            raw.types.MessageEntityItalic(offset=6, length=5)
+        ],
+        views=10,
+        forwards=0
+    )
+
+
+def test_fields_are_decoded_on_access():
+    data = message().write()
+    decoded = TLObject.read(LazyReader(data))
+
+    assert type(decoded) is raw.types.Message
+    assert (decoded.id, decoded.message, decoded.views) == (1, "hello world", 10)
+    assert isinstance(decoded._lazy["media"], Lazy)
+
+    assert decoded.media == raw.types.MessageMediaDice(value=6, emoticon="🎲")
+    assert "media" not in decoded._lazy
+    assert decoded.entities == [
+        raw.types.MessageEntityBold(offset=0, length=5),
+        raw.types.MessageEntityItalic(offset=6, length=5)
+    ]
+    assert decoded.write() == data
+
+
+def test_classes_are_left_untouched():
+    data = message().write()
+
+    TLObject.read(LazyReader(data)).media
+
+    # Objects decoded eagerly keep plain slots, with nothing set aside
+    assert type(raw.types.Message.__dict__["media"]).__name__ == "member_descriptor"
+    assert not hasattr(TLObject.read(Reader(data)), "_lazy")
+
+    with pytest.raises(AttributeError):
+        TLObject.read(Reader(data)).missing
+
+
+def test_same_as_eager():
+    data = raw.types.updates.Difference(
+        new_messages=[message(), message()],
+        new_encrypted_messages=[],
+        other_updates=[raw.types.UpdateNewMessage(message=message(), pts=1, pts_count=1)],
+        chats=[],
+        users=[],
+        state=raw.types.updates.State(pts=1, qts=0, date=0, seq=1, unread_count=0)
+    ).write()
+
+    assert TLObject.read(LazyReader(data)) == TLObject.read(Reader(data))
+
+
+def test_small_constructors_vector():
+    data = raw.types.account.PrivacyRules(
+        rules=[raw.types.PrivacyValueAllowAll()],
+        chats=[],
+        users=[]
+    ).write()
+
+    assert TLObject.read(LazyReader(data)).rules == [raw.types.PrivacyValueAllowAll()]
+
+
+def test_rpc_result():
+    data = Int(raw.types.RpcResult.ID, False) + Long(1) + Vector([1, 2, 3], Int)
+
+    assert TLObject.read(LazyReader(data)).result == [1, 2, 3]
+
+
+def test_skip():
+    data = message().write() + Int(42)
+    b = Reader(data)
+
+    TLObject.skip(b)
+
+    assert b.read_int() == 42
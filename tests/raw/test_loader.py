@@ -0,0 +1,50 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.raw.core.loader import Objects
+
+
+def test_objects_resolve_on_lookup():
+    objects = Objects({0x1: "collections.OrderedDict"})
+
+    assert 0x1 in objects and 0x2 not in objects
+    assert list(objects) == [0x1] and len(objects) == 1
+    assert objects[0x1] is OrderedDict
+    assert objects.get(0x2) is None
+
+    with pytest.raises(KeyError):
+        objects[0x2]
+
+
+def test_raw_objects():
+    assert raw.objects[raw.types.Message.ID] is raw.types.Message
+    assert raw.objects[raw.types.help.ConfigSimple.ID] is raw.types.help.ConfigSimple
+    assert raw.objects[raw.functions.InvokeWithLayer.ID] is raw.functions.InvokeWithLayer
+
+
+def test_namespaces():
+    assert "Message" in dir(raw.types) and "messages" in dir(raw.types)
+    assert raw.types.messages.Messages.QUALNAME == "types.messages.Messages"
+    assert raw.base.Updates.__module__ == "pyrogram.raw.base.updates_t"
+    assert not hasattr(raw.types, "Missing")
+    assert not hasattr(raw.types.messages, "Message")
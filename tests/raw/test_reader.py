@@ -0,0 +1,104 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from io import BytesIO
+
+from pyrogram import raw
+from pyrogram.raw.core import TLObject, Reader, Int, Long, Int128, Double, Bool, Bytes, String
+
+
+def test_primitives():
+    data = (
+        Int(-1) + Int(0xFFFFFFFF, False) + Long(-2) + Int128(1 << 100) + Double(1.5) + Bool(True) + Bool(False)
+        + Bytes(b"x" * 300) + String("héllo")
+    )
+
+    b = Reader(data)
+
+    assert b.read_int() == -1
+    assert b.read_int(False) == 0xFFFFFFFF
+    assert b.read_long() == -2
+    assert b.read_int128() == 1 << 100
+    assert b.read_double() == 1.5
+    assert b.read_bool() is True
+    assert b.read_bool() is False
+    assert b.read_bytes() == b"x" * 300
+    assert b.read_string() == "héllo"
+    assert b.tell() == len(data)
+
+
+def test_file_like():
+    data = Int(1) + Int(2) + Int(3)
+    b = Reader(data)
+
+    assert b.read(4) == Int(1)
+    assert b.seek(-4, 1) == 0
+    assert b.seek(-4, 2) == 8
+    assert b.read() == Int(3)
+    assert b.read() == b""
+    assert b.getvalue() == data
+
+
+def test_objects():
+    user = raw.types.User(
+        id=777000,
+        access_hash=-1,
+        first_name="Telegram",
+        username="telegram",
+        verified=True,
+        usernames=[raw.types.Username(username="telegram", active=True)]
+    )
+    data = user.write() + Int(42)
+
+    for b in (Reader(data), BytesIO(data)):
+        decoded = TLObject.read(b)
+
+        assert isinstance(decoded, raw.types.User)
+        assert decoded.id == 777000
+        assert decoded.access_hash == -1
+        assert decoded.first_name == "Telegram"
+        assert decoded.verified is True
+        assert decoded.usernames[0].username == "telegram"
+
+        # File-like objects are moved past the decoded object, too
+        assert b.read() == Int(42)
+
+
+def test_fused_fields():
+    message = raw.types.Message(
+        id=1 << 30,
+        peer_id=raw.types.PeerChannel(channel_id=1 << 40),
+        date=1_700_000_000,
+        message="",
+        views=100,
+        forwards=-5,
+        grouped_id=-(1 << 60),
+        offline=True
+    )
+
+    decoded = TLObject.read(Reader(message.write()))
+
+    assert (decoded.id, decoded.views, decoded.forwards, decoded.grouped_id) == (1 << 30, 100, -5, -(1 << 60))
+    assert decoded.offline is True
+    assert decoded.edit_date is None
+
+    message.views = message.forwards = None
+    decoded = TLObject.read(Reader(message.write()))
+
+    assert decoded.views is None
+    assert decoded.forwards is None
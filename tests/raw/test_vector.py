@@ -0,0 +1,45 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from pyrogram import raw
+from pyrogram.raw.core import TLObject, Reader, Vector, Int, Long, Bool
+
+
+def test_bare_ints():
+    assert TLObject.read(Reader(Vector([1, 2, 3], Int))) == [1, 2, 3]
+
+
+def test_bare_bools():
+    assert TLObject.read(Reader(Vector([True, False], Bool))) == [True, False]
+
+
+def test_bare_longs():
+    assert TLObject.read(Reader(Vector([1 << 40, -1], Long))) == [1 << 40, -1]
+
+
+def test_bare_objects():
+    data = Vector([raw.types.PeerUser(user_id=1), raw.types.PeerChannel(channel_id=2)])
+
+    assert TLObject.read(Reader(data)) == [raw.types.PeerUser(user_id=1), raw.types.PeerChannel(channel_id=2)]
+
+
+def test_empty():
+    b = Reader(Vector([], Int) + Int(42))
+
+    assert TLObject.read(b) == []
+    assert b.read_int() == 42
@@ -0,0 +1,75 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from pyrogram import raw
+from pyrogram.raw.core import TLObject, Reader, Vector, Int, Long, Bytes, String
+
+
+def test_write_into():
+    query = raw.functions.messages.EditMessage(
+        peer=raw.types.InputPeerSelf(),
+        id=1,
+        message="hello",
+        entities=[raw.types.MessageEntityBold(offset=0, length=5)]
+    )
+
+    b = bytearray(b"prefix")
+    query.write_into(b)
+
+    assert b == b"prefix" + query.write()
+    assert query.write() == b"".join([
+        Int(query.ID, False),
+        Int(1 << 11 | 1 << 3),
+        raw.types.InputPeerSelf().write(),
+        Int(1),
+        String("hello"),
+        Vector([raw.types.MessageEntityBold(offset=0, length=5)])
+    ])
+
+
+def test_vector():
+    b = bytearray()
+    Vector.write_to(b, [1, 2], Long)
+
+    assert b == Vector([1, 2], Long) == Int(Vector.ID, False) + Int(2) + Long(1) + Long(2)
+
+
+def test_empty_flagged_vector():
+    # Empty vectors don't set their flag, so they must not be written either
+    message = raw.types.Message(id=1, peer_id=raw.types.PeerUser(user_id=1), date=0, message="", entities=[])
+    data = message.write()
+
+    assert data == raw.types.Message(id=1, peer_id=raw.types.PeerUser(user_id=1), date=0, message="").write()
+    assert TLObject.read(Reader(data)).write() == data
+
+
+def test_bytes_and_strings():
+    for value in (b"", b"abc", bytes(253), bytes(254), bytes(1000)):
+        b = bytearray()
+        Bytes.write_to(b, value)
+
+        assert b == Bytes(value)
+        assert Reader(b).read_bytes() == value
+
+    b = bytearray()
+    String.write_to(b, "héllo")
+
+    assert b == String("héllo")
+
+    # The base instance method is left as it is
+    assert Bytes.write_into is String.write_into is Vector.write_into is TLObject.write_into
@@ -0,0 +1,98 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+
+import pyrogram
+from pyrogram import client as client_module, raw
+from pyrogram.errors import AuthKeyUnregistered
+
+
+class Client:
+    def __init__(self):
+        self.name = "test"
+        self.disconnect_handler = None
+        self.lazy_decoding = False
+
+
+class Connection:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, data: bytes):
+        self.sent.append(data)
+
+    async def close(self):
+        pass
+
+
+class Session:
+    """Stands in for pyrogram.session.Session in Client tests. Stored keys equal to b"revoked" are unauthorized."""
+
+    started = []
+
+    def __init__(self, client, dc_id, auth_key, test_mode, is_media=False, is_cdn=False):
+        self.dc_id = dc_id
+        self.auth_key = auth_key
+        self.invoked = []
+
+    async def start(self):
+        await asyncio.sleep(0.01)
+
+        Session.started.append(self)
+
+    async def stop(self):
+        pass
+
+    async def invoke(self, query, *args, **kwargs):
+        self.invoked.append(type(query))
+
+        if isinstance(query, raw.functions.users.GetUsers) and self.auth_key == b"revoked":
+            raise AuthKeyUnregistered()
+
+
+class Auth:
+    """Stands in for pyrogram.session.Auth in Client tests. DCs in :attr:`unreachable` can't be connected to."""
+
+    unreachable = set()
+
+    def __init__(self, client, dc_id, test_mode):
+        self.dc_id = dc_id
+
+    async def create(self):
+        if self.dc_id in Auth.unreachable:
+            raise ConnectionError(f"DC{self.dc_id} is down")
+
+        return b"new"
+
+
+async def make_client(monkeypatch) -> "pyrogram.Client":
+    """Make a Client whose sessions to other DCs are started with the Session and Auth stand-ins."""
+    async def invoke(query):
+        return raw.types.auth.ExportedAuthorization(id=1, bytes=b"")
+
+    monkeypatch.setattr(client_module, "Session", Session)
+    monkeypatch.setattr(client_module, "Auth", Auth)
+    monkeypatch.setattr(Auth, "unreachable", set())
+    Session.started.clear()
+
+    client = pyrogram.Client("test", in_memory=True)
+    client.invoke = invoke
+    await client.storage.open()
+
+    return client
@@ -0,0 +1,66 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from pyrogram.session.internals import MsgIdWindow
+
+
+def test_duplicates():
+    window = MsgIdWindow(10)
+
+    window.add(5)
+    window.add(9)
+
+    assert 5 in window
+    assert 9 in window
+    assert 7 not in window
+    assert len(window) == 2
+
+
+def test_min_msg_id():
+    window = MsgIdWindow(10)
+
+    assert not window
+
+    window.add(100)
+    window.add(104)
+
+    assert window.min_msg_id == 100
+
+
+def test_eviction():
+    window = MsgIdWindow(3)
+
+    for msg_id in (1, 5, 9, 13, 17):
+        window.add(msg_id)
+
+    assert len(window) == 3
+    assert 1 not in window
+    assert 5 not in window
+    assert 9 in window
+    assert window.min_msg_id == 6
+
+
+def test_clear():
+    window = MsgIdWindow(3)
+
+    window.add(1)
+    window.clear()
+
+    assert not window
+    assert 1 not in window
+    assert window.min_msg_id == 0
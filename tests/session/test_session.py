@@ -0,0 +1,285 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import os
+from hashlib import sha256
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.crypto import aes, mtproto
+from pyrogram.raw.core import Long, Message, MsgContainer, Reader
+from pyrogram.session import Session
+from tests.session import Client, Connection
+
+
+def decrypt(session: Session, payload: bytes) -> Message:
+    msg_key = payload[8:24]
+    aes_key, aes_iv = mtproto.kdf(session.auth_key, msg_key, True)
+    data = Reader(aes.ige256_decrypt(payload[24:], aes_key, aes_iv))
+    data.seek(16)  # Skip salt (8) + session_id (8)
+
+    return Message.read(data)
+
+
+def encrypt(session: Session, message: Message) -> bytes:
+    data = Long(0) + session.session_id + message.write()
+    data += os.urandom(-(len(data) + 12) % 16 + 12)
+    msg_key = sha256(session.auth_key[96:128] + data).digest()[8:24]
+    aes_key, aes_iv = mtproto.kdf(session.auth_key, msg_key, False)
+
+    return session.auth_key_id + msg_key + aes.ige256_encrypt(data, aes_key, aes_iv)
+
+
+async def start(session: Session, connections: int = 1):
+    loop = asyncio.get_event_loop()
+
+    session.connections = [Connection() for _ in range(connections)]
+    session.send_tasks = [loop.create_task(session.send_worker(c)) for c in session.connections]
+
+
+@pytest.mark.asyncio
+async def test_send_coalesces_messages():
+    session = Session(Client(), 2, os.urandom(256), False)
+    await start(session)
+
+    await asyncio.gather(*[
+        session.send(raw.functions.Ping(ping_id=i), wait_response=False)
+        for i in range(10)
+    ])
+
+    assert len(session.connections[0].sent) == 1
+
+    message = decrypt(session, session.connections[0].sent[0])
+
+    assert isinstance(message.body, MsgContainer)
+    assert [m.body.ping_id for m in message.body.messages] == list(range(10))
+    assert all(m.msg_id < message.msg_id for m in message.body.messages)
+    assert session.containers[message.msg_id] == [m.msg_id for m in message.body.messages]
+
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_send_single_message_is_not_wrapped():
+    session = Session(Client(), 2, os.urandom(256), False)
+    await start(session)
+
+    await session.send(raw.functions.Ping(ping_id=1), wait_response=False)
+
+    message = decrypt(session, session.connections[0].sent[0])
+
+    assert isinstance(message.body, raw.functions.Ping)
+    assert not session.containers
+
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_send_splits_big_messages():
+    session = Session(Client(), 2, os.urandom(256), False)
+    await start(session)
+
+    await asyncio.gather(
+        session.send(raw.functions.Ping(ping_id=1), wait_response=False),
+        session.send(
+            raw.functions.upload.SaveFilePart(file_id=1, file_part=0, bytes=bytes(Session.CONTAINER_MAX_SIZE)),
+            wait_response=False
+        ),
+        session.send(raw.functions.Ping(ping_id=2), wait_response=False),
+    )
+
+    assert len(session.connections[0].sent) == 3
+
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_send_after_stop_raises():
+    session = Session(Client(), 2, os.urandom(256), False)
+    await start(session)
+    await session.stop()
+
+    with pytest.raises(ConnectionError):
+        await session.send(raw.functions.Ping(ping_id=1), wait_response=False)
+
+
+@pytest.mark.asyncio
+async def test_send_piggybacks_acks():
+    session = Session(Client(), 2, os.urandom(256), False)
+    await start(session)
+
+    session.pending_acks.update({1, 5, 9})
+
+    await session.send(raw.functions.Ping(ping_id=1), wait_response=False)
+
+    message = decrypt(session, session.connections[0].sent[0])
+
+    assert isinstance(message.body, MsgContainer)
+    assert isinstance(message.body.messages[0].body, raw.functions.Ping)
+    assert sorted(message.body.messages[1].body.msg_ids) == [1, 5, 9]
+    assert not session.pending_acks
+    assert session.piggybacked_acks == 3
+
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_acks_flushed_when_idle():
+    session = Session(Client(), 2, os.urandom(256), False)
+    session.ACKS_FLUSH_INTERVAL = 0.01
+    await start(session)
+
+    session.pending_acks.update({1, 5, 9})
+
+    await asyncio.sleep(0.1)
+
+    assert len(session.connections[0].sent) == 1
+
+    message = decrypt(session, session.connections[0].sent[0])
+
+    assert isinstance(message.body, raw.types.MsgsAck)
+    assert session.piggybacked_acks == 0
+
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_send_serializes_once():
+    class Ping(raw.functions.Ping):
+        writes = 0
+
+        def write(self, *args) -> bytes:
+            Ping.writes += 1
+            return super().write()
+
+    session = Session(Client(), 2, os.urandom(256), False)
+    await start(session)
+
+    await asyncio.gather(
+        session.send(Ping(ping_id=1), wait_response=False),
+        session.send(Ping(ping_id=2), wait_response=False)
+    )
+
+    assert Ping.writes == 2
+
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_send_spreads_over_connections():
+    class SlowConnection(Connection):
+        async def send(self, data: bytes):
+            if len(data) > 1024:
+                await asyncio.sleep(0.05)
+
+            await super().send(data)
+
+    session = Session(Client(), 2, os.urandom(256), False, connections=3)
+    session.connections = [SlowConnection() for _ in range(3)]
+    session.send_tasks = [asyncio.get_event_loop().create_task(session.send_worker(c)) for c in session.connections]
+
+    big = asyncio.ensure_future(session.send(
+        raw.functions.upload.SaveFilePart(file_id=1, file_part=0, bytes=bytes(4096)),
+        wait_response=False
+    ))
+
+    await asyncio.sleep(0.01)
+
+    # One connection is busy with the big request, the others keep the small ones flowing in the meantime
+    await asyncio.gather(*[
+        session.send(raw.functions.Ping(ping_id=i), wait_response=False)
+        for i in range(4)
+    ])
+
+    assert not big.done()
+    assert sum(len(c.sent) for c in session.connections) >= 1
+
+    await big
+
+    busy = [c for c in session.connections if any(len(p) > 1024 for p in c.sent)]
+
+    assert len(busy) == 1
+    assert all(len(p) > 1024 for p in busy[0].sent)
+
+    await session.stop()
+
+    assert not session.send_tasks
+
+
+@pytest.mark.asyncio
+async def test_responses_are_merged_from_any_connection():
+    session = Session(Client(), 2, os.urandom(256), False, connections=2)
+    await start(session, 2)
+
+    task = asyncio.ensure_future(session.send(raw.functions.Ping(ping_id=1), timeout=1))
+
+    while not any(c.sent for c in session.connections):
+        await asyncio.sleep(0)
+
+    sent, idle = sorted(session.connections, key=lambda c: not c.sent)
+    request = decrypt(session, sent.sent[0])
+
+    # The server may answer on any connection of the session, not just on the one that carried the request
+    pong = Message(raw.types.Pong(msg_id=request.msg_id, ping_id=1), request.msg_id + 1, 0, 20)
+    await session.handle_packet(idle, encrypt(session, pong))
+
+    assert (await task).ping_id == 1
+
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_every_connection_pings_when_idle():
+    session = Session(Client(), 2, os.urandom(256), False, connections=2)
+    session.ACKS_FLUSH_INTERVAL = 0.01
+    session.PING_INTERVAL = 0.05
+    await start(session, 2)
+
+    await asyncio.sleep(0.2)
+
+    for connection in session.connections:
+        assert connection.sent
+
+        message = decrypt(session, connection.sent[0])
+
+        assert isinstance(message.body, raw.functions.PingDelayDisconnect)
+
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_connections_dropping_together_restart_once():
+    class DroppedConnection(Connection):
+        async def recv(self):
+            return None
+
+    restarts = []
+
+    async def restart():
+        restarts.append(None)
+
+    session = Session(Client(), 2, os.urandom(256), False, connections=3)
+    session.restart = restart
+    session.is_started.set()
+
+    await asyncio.gather(*[session.recv_worker(DroppedConnection()) for _ in range(3)])
+    await asyncio.sleep(0)
+
+    assert len(restarts) == 1
@@ -0,0 +1,95 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sqlite3
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.storage import FileStorage, MemoryStorage
+from pyrogram.storage.sqlite_storage import SQLiteStorage
+from tests.session import make_client
+
+
+@pytest.mark.asyncio
+async def test_exported_auth_keys():
+    storage = MemoryStorage("test")
+    await storage.open()
+
+    key = os.urandom(256)
+
+    assert await storage.exported_auth_key(4) is None
+
+    await storage.exported_auth_key(4, key)
+    await storage.exported_auth_key(5, os.urandom(256))
+
+    assert await storage.exported_auth_key(4) == key
+
+    await storage.exported_auth_key(4, None)
+
+    assert await storage.exported_auth_key(4) is None
+    assert await storage.exported_auth_key(5) is not None
+
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_file_storage_update(tmp_path):
+    storage = FileStorage("test", tmp_path)
+    await storage.open()
+    await storage.close()
+
+    # Take the file back to the previous version of the schema
+    conn = sqlite3.connect(tmp_path / "test.session")
+    conn.execute("DROP TABLE exported_auth_keys")
+    conn.execute("UPDATE version SET number = 6")
+    conn.commit()
+    conn.close()
+
+    storage = FileStorage("test", tmp_path)
+    await storage.open()
+
+    assert storage.version() == SQLiteStorage.VERSION
+
+    await storage.exported_auth_key(4, b"key")
+
+    assert await storage.exported_auth_key(4) == b"key"
+
+    await storage.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stored_key", [None, b"revoked"])
+async def test_start_dc_session(monkeypatch, stored_key):
+    client = await make_client(monkeypatch)
+
+    if stored_key:
+        await client.storage.exported_auth_key(4, stored_key)
+
+    # The first session does the whole authorization, the key is then reused
+    session = await client.start_dc_session(4)
+
+    assert session.auth_key == b"new"
+    assert raw.functions.auth.ImportAuthorization in session.invoked
+    assert await client.storage.exported_auth_key(4) == b"new"
+
+    session = await client.start_dc_session(4, is_media=True)
+
+    assert session.auth_key == b"new"
+    assert session.invoked == [raw.functions.users.GetUsers]
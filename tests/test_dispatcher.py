@@ -0,0 +1,128 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+
+import pytest
+
+from pyrogram import Client, raw
+from pyrogram.dispatcher import Dispatcher
+from pyrogram.handlers import MessageHandler, RawUpdateHandler, UserStatusHandler
+
+
+def typing(user_id: int) -> raw.types.UpdateUserTyping:
+    return raw.types.UpdateUserTyping(user_id=user_id, action=raw.types.SendMessageTypingAction())
+
+
+async def start(handler, ordered_updates: bool = True) -> Client:
+    client = Client("test", in_memory=True, workers=4, ordered_updates=ordered_updates)
+    client.dispatcher.add_handler(RawUpdateHandler(handler), 0)
+    await client.dispatcher.start()
+
+    return client
+
+
+def test_get_chat_id():
+    assert Dispatcher.get_chat_id(typing(42)) == 42
+    assert Dispatcher.get_chat_id(raw.types.UpdateChannel(channel_id=1)) == -1000000000001
+    assert Dispatcher.get_chat_id(
+        raw.types.UpdateNewMessage(
+            message=raw.types.Message(id=1, peer_id=raw.types.PeerChat(chat_id=7), date=0, message=""),
+            pts=0,
+            pts_count=0
+        )
+    ) == -7
+    assert Dispatcher.get_chat_id(raw.types.UpdateConfig()) is None
+
+
+@pytest.mark.asyncio
+async def test_handlers_are_indexed_by_type_in_group_order():
+    dispatcher = Client("test", in_memory=True).dispatcher
+
+    message, raw_update, status = MessageHandler(print), RawUpdateHandler(print), UserStatusHandler(print)
+
+    dispatcher.add_handler(message, 1)
+    dispatcher.add_handler(status, 0)
+    dispatcher.add_handler(raw_update, -1)
+
+    assert list(dispatcher.groups) == [-1, 0, 1]
+    assert dispatcher.get_handlers(MessageHandler) == ((raw_update,), (message,))
+    assert dispatcher.get_handlers(type(None)) == ((raw_update,),)
+
+    groups = dispatcher.get_handlers(UserStatusHandler)
+    dispatcher.remove_handler(status, 0)
+
+    # Snapshots being iterated are left untouched
+    assert groups == ((raw_update,), (status,))
+    assert dispatcher.get_handlers(UserStatusHandler) == ((raw_update,),)
+
+    with pytest.raises(ValueError):
+        dispatcher.remove_handler(status, 2)
+
+
+@pytest.mark.asyncio
+async def test_updates_of_a_chat_are_handled_in_order():
+    handled = []
+
+    async def handler(client, update, users, chats):
+        # Earlier updates sleep longer, so they would finish last if handled in parallel
+        await asyncio.sleep(0.01 * (5 - update.action))
+        handled.append(update.action)
+
+    client = await start(handler)
+
+    for i in range(5):
+        update = typing(1)
+        update.action = i
+        client.dispatcher.updates_queue.put_nowait((update, {}, {}))
+
+    await client.dispatcher.stop()
+
+    assert handled == [0, 1, 2, 3, 4]
+    assert not client.dispatcher.shard_queues
+
+
+@pytest.mark.asyncio
+async def test_updates_of_different_chats_are_handled_in_parallel():
+    running = set()
+    overlapping = []
+    order = {}
+
+    async def handler(client, update, users, chats):
+        running.add(update.user_id)
+        overlapping.append(len(running))
+        await asyncio.sleep(0.01)
+        order.setdefault(update.user_id, []).append(update.action)
+        running.discard(update.user_id)
+
+    client = await start(handler)
+
+    for i in range(4):
+        for user_id in range(1, 9):
+            update = typing(user_id)
+            update.action = i
+            client.dispatcher.updates_queue.put_nowait((update, {}, {}))
+
+    await asyncio.sleep(0)
+    assert sum(client.dispatcher.shard_queue_sizes) > 0
+
+    await client.dispatcher.stop()
+
+    assert max(overlapping) > 1
+    assert all(actions == [0, 1, 2, 3] for actions in order.values())
+    assert len(order) == 8
@@ -0,0 +1,148 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import os
+import random
+
+import pytest
+
+from pyrogram import Client, raw
+from pyrogram.client import DownloadParts
+from pyrogram.errors import InternalServerError
+from pyrogram.file_id import FileId, FileType
+
+CHUNK_SIZE = 1024 * 1024
+FILE_ID = FileId(file_type=FileType.DOCUMENT, dc_id=2, media_id=1, access_hash=1)
+
+
+class MediaSession:
+    def __init__(self, data: bytes, fail_at: int = None):
+        self.data = data
+        self.fail_at = fail_at
+        self.offsets = []
+
+    async def invoke(self, query: raw.functions.upload.GetFile, sleep_threshold: float = 0):
+        self.offsets.append(query.offset)
+
+        # Let responses arrive out of order
+        await asyncio.sleep(random.random() / 100)
+
+        if query.offset == self.fail_at:
+            raise InternalServerError("test")
+
+        return raw.types.upload.File(
+            type=raw.types.storage.FilePartial(),
+            mtime=0,
+            bytes=self.data[query.offset:query.offset + query.limit]
+        )
+
+
+async def download(session: MediaSession, directory, progress=None):
+    client = Client("test", in_memory=True, max_download_window=4)
+    client.media_sessions[2] = session
+
+    return await client.handle_download(
+        (FILE_ID, str(directory), "file.bin", False, len(session.data), progress, (), True)
+    )
+
+
+@pytest.mark.asyncio
+async def test_download_out_of_order(tmp_path):
+    data = os.urandom(6 * CHUNK_SIZE + 1)
+    updates = []
+
+    async def progress(current, total):
+        updates.append(current)
+
+    path = await download(MediaSession(data), tmp_path, progress)
+
+    with open(path, "rb") as f:
+        assert f.read() == data
+
+    assert sorted(os.listdir(tmp_path)) == ["file.bin"]
+    assert updates == sorted(updates) and updates[-1] == len(data)
+
+
+@pytest.mark.asyncio
+async def test_download_media_progress_positional(tmp_path):
+    data = os.urandom(2 * CHUNK_SIZE + 1)
+    updates = []
+
+    async def progress(current, total):
+        updates.append(current)
+
+    client = Client("test", in_memory=True)
+    client.media_sessions[2] = MediaSession(data)
+
+    path = await client.download_media(FILE_ID.encode(), str(tmp_path / "file.bin"), False, True, progress)
+
+    with open(path, "rb") as f:
+        assert f.read() == data
+
+    assert updates == sorted(updates) and len(updates) == 3
+
+
+@pytest.mark.asyncio
+async def test_download_resumes_from_missing_chunks(tmp_path):
+    data = os.urandom(8 * CHUNK_SIZE - 1)
+
+    assert await download(MediaSession(data, fail_at=5 * CHUNK_SIZE), tmp_path) is None
+    assert sorted(os.listdir(tmp_path)) == ["file.bin.temp", "file.bin.temp.parts"]
+
+    parts = DownloadParts(str(tmp_path / "file.bin.temp.parts"), 1, len(data), CHUNK_SIZE)
+    assert parts.open()
+    parts.close()
+
+    assert 5 not in parts
+    assert 0 < len(parts) < parts.count
+
+    session = MediaSession(data)
+    path = await download(session, tmp_path)
+
+    with open(path, "rb") as f:
+        assert f.read() == data
+
+    assert sorted(session.offsets) == [i * CHUNK_SIZE for i in parts.missing()]
+    assert sorted(os.listdir(tmp_path)) == ["file.bin"]
+
+
+def test_parts(tmp_path):
+    path = str(tmp_path / "parts")
+
+    parts = DownloadParts(path, 1, 20 * CHUNK_SIZE, CHUNK_SIZE)
+    assert not parts.open()
+
+    for i in (0, 3, 19, 3):
+        parts.add(i)
+
+    parts.close()
+
+    parts = DownloadParts(path, 1, 20 * CHUNK_SIZE, CHUNK_SIZE)
+    assert parts.open()
+    parts.close()
+
+    assert len(parts) == 3
+    assert parts.missing() == [i for i in range(20) if i not in (0, 3, 19)]
+
+    # A different file never resumes from these parts
+    parts = DownloadParts(path, 2, 20 * CHUNK_SIZE, CHUNK_SIZE)
+    assert not parts.open()
+    parts.close()
+
+    assert len(parts) == 0
@@ -0,0 +1,257 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import os
+from hashlib import sha256
+
+import pytest
+
+from pyrogram import Client, raw
+from pyrogram.crypto import aes
+from pyrogram.errors import AuthKeyUnregistered
+from pyrogram.client import DownloadWindow
+from pyrogram.file_id import FileId, FileType
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class MediaSession:
+    def __init__(self, data: bytes, delay: float = 0.01):
+        self.data = data
+        self.delay = delay
+        self.offsets = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def invoke(self, query: raw.functions.upload.GetFile, sleep_threshold: float = 0):
+        self.offsets.append(query.offset)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        return raw.types.upload.File(
+            type=raw.types.storage.FilePartial(),
+            mtime=0,
+            bytes=self.data[query.offset:query.offset + query.limit]
+        )
+
+
+async def download(session: MediaSession, max_download_window: int, file_size: int = 0, limit: int = 0):
+    client = Client("test", in_memory=True, max_download_window=max_download_window)
+    client.media_sessions[2] = session
+    file_id = FileId(file_type=FileType.DOCUMENT, dc_id=2, media_id=1, access_hash=1)
+
+    return [bytes(c) async for c in client.get_file(file_id, file_size, limit)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("file_size", [0, 5 * CHUNK_SIZE + 123, 4 * CHUNK_SIZE])
+async def test_chunks_are_yielded_in_order(file_size):
+    data = os.urandom(file_size or 3 * CHUNK_SIZE - 1)
+    session = MediaSession(data)
+
+    chunks = await download(session, 4, file_size)
+
+    assert b"".join(chunks) == data
+    assert all(len(c) == CHUNK_SIZE for c in chunks[:-1])
+    assert session.max_in_flight > 1
+    assert session.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_window_of_one_is_sequential():
+    data = os.urandom(3 * CHUNK_SIZE)
+    session = MediaSession(data)
+
+    assert b"".join(await download(session, 1)) == data
+    assert session.max_in_flight == 1
+    assert session.offsets == [0, CHUNK_SIZE, 2 * CHUNK_SIZE, 3 * CHUNK_SIZE]
+
+
+@pytest.mark.asyncio
+async def test_limit_is_respected():
+    session = MediaSession(os.urandom(10 * CHUNK_SIZE))
+
+    assert len(await download(session, 4, limit=3)) == 3
+    assert max(session.offsets) < 3 * CHUNK_SIZE
+
+
+@pytest.mark.asyncio
+async def test_early_stop_cancels_pending_requests():
+    session = MediaSession(os.urandom(10 * CHUNK_SIZE))
+    client = Client("test", in_memory=True)
+    client.media_sessions[2] = session
+    file_id = FileId(file_type=FileType.DOCUMENT, dc_id=2, media_id=1, access_hash=1)
+
+    chunks = client.get_file(file_id)
+
+    for _ in range(3):
+        await chunks.__anext__()
+
+    await chunks.aclose()
+
+    assert session.in_flight == 0
+
+
+def test_window_adapts_to_rtt():
+    window = DownloadWindow(8)
+
+    for _ in range(10):
+        window.update(0.1)
+
+    assert window.size == 8
+
+    for _ in range(3):
+        window.update(0.5)
+
+    assert window.size == 5
+    assert DownloadWindow(0).max_size == 1
+
+
+class CdnSessions:
+    HASH_SIZE = 128 * 1024
+    HASHES_PER_BATCH = 16
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.key = os.urandom(32)
+        self.iv = os.urandom(16)
+        self.hash_requests = 0
+        self.corrupted = None
+        self.reupload_needed = None
+        self.broken = False
+        self.stopped = False
+
+    def get_hashes(self, offset: int):
+        return [
+            raw.types.FileHash(
+                offset=offset,
+                limit=min(self.HASH_SIZE, len(self.data) - offset),
+                hash=sha256(self.data[offset:offset + self.HASH_SIZE]).digest()
+            )
+            for offset in range(offset, len(self.data), self.HASH_SIZE)[:self.HASHES_PER_BATCH]
+        ]
+
+    async def invoke(self, query, sleep_threshold: float = 0):
+        if isinstance(query, raw.functions.upload.GetFile):
+            return raw.types.upload.FileCdnRedirect(
+                dc_id=203, file_token=b"token", encryption_key=self.key, encryption_iv=self.iv,
+                file_hashes=self.get_hashes(0)
+            )
+
+        if isinstance(query, raw.functions.upload.ReuploadCdnFile):
+            self.reupload_needed = None
+
+            return self.get_hashes(int.from_bytes(query.request_token, "big"))
+
+        if isinstance(query, raw.functions.upload.GetCdnFile):
+            if self.broken:
+                raise AuthKeyUnregistered()
+
+            if query.offset == self.reupload_needed:
+                return raw.types.upload.CdnFileReuploadNeeded(request_token=query.offset.to_bytes(4, "big"))
+
+            chunk = self.data[query.offset:query.offset + query.limit]
+
+            if query.offset == self.corrupted:
+                chunk = bytes(len(chunk))
+
+            iv = bytearray(self.iv[:-4] + (query.offset // 16).to_bytes(4, "big"))
+
+            return raw.types.upload.CdnFile(bytes=aes.ctr256_encrypt(chunk, self.key, iv))
+
+        if isinstance(query, raw.functions.upload.GetCdnFileHashes):
+            self.hash_requests += 1
+
+            return self.get_hashes(query.offset)
+
+    async def stop(self):
+        self.stopped = True
+
+
+async def cdn_download(sessions: CdnSessions, client: Client = None):
+    client = client or Client("test", in_memory=True)
+    client.media_sessions[2] = sessions
+    client.cdn_sessions.setdefault(203, sessions)
+    file_id = FileId(file_type=FileType.DOCUMENT, dc_id=2, media_id=1, access_hash=1)
+
+    return [bytes(c) async for c in client.get_file(file_id, len(sessions.data))]
+
+
+@pytest.mark.asyncio
+async def test_cdn_chunks_are_verified_with_batched_hashes():
+    data = os.urandom(6 * CHUNK_SIZE + 100)
+    sessions = CdnSessions(data)
+    client = Client("test", in_memory=True)
+
+    assert b"".join(await cdn_download(sessions, client)) == data
+    # The first batch comes with the redirect
+    assert sessions.hash_requests == 3
+    assert client.cdn_file_hashes[b"token"] is None
+
+
+@pytest.mark.asyncio
+async def test_cdn_reupload_hashes_are_used():
+    data = os.urandom(4 * CHUNK_SIZE)
+    sessions = CdnSessions(data)
+    sessions.reupload_needed = 2 * CHUNK_SIZE
+
+    assert b"".join(await cdn_download(sessions)) == data
+    assert sessions.reupload_needed is None
+    assert sessions.hash_requests == 0
+
+
+@pytest.mark.asyncio
+async def test_broken_cdn_session_is_replaced():
+    data = os.urandom(2 * CHUNK_SIZE)
+    sessions = CdnSessions(data)
+    broken = CdnSessions(data)
+    broken.broken = True
+
+    client = Client("test", in_memory=True)
+    client.cdn_sessions[203] = broken
+
+    async def get_cdn_session(dc_id: int):
+        return client.cdn_sessions.setdefault(dc_id, sessions)
+
+    client.get_cdn_session = get_cdn_session
+
+    assert b"".join(await cdn_download(sessions, client)) == data
+    assert broken.stopped
+    assert client.cdn_sessions[203] is sessions
+
+    # A new session that is broken as well is given up on, and not kept for the next downloads
+    sessions.broken = True
+
+    assert await cdn_download(sessions, client) == []
+    assert sessions.stopped
+    assert 203 not in client.cdn_sessions
+
+
+@pytest.mark.asyncio
+async def test_cdn_hash_mismatch_stops_download():
+    data = os.urandom(3 * CHUNK_SIZE)
+    sessions = CdnSessions(data)
+    sessions.corrupted = CHUNK_SIZE
+
+    assert b"".join(await cdn_download(sessions)) == data[:CHUNK_SIZE]
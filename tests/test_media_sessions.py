@@ -0,0 +1,67 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+
+import pytest
+
+from pyrogram.methods.messages.inline_session import get_session
+from tests.session import Auth, Session, make_client
+
+
+@pytest.mark.asyncio
+async def test_warm_up_configured_dcs(monkeypatch):
+    client = await make_client(monkeypatch)
+    client.warm_up_dcs = [2, 4, 5]
+    Auth.unreachable.add(5)
+
+    await client.warm_up_media_sessions()
+
+    assert client.media_sessions_ready.is_set()
+    assert sorted(client.media_sessions) == [2, 4]
+    assert sorted(s.dc_id for s in Session.started) == [2, 4]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_known_dcs(monkeypatch):
+    client = await make_client(monkeypatch)
+    client.warm_up_dcs = True
+    await client.storage.exported_auth_key(1, b"key")
+    await client.storage.exported_auth_key(4, b"key")
+
+    await client.warm_up_media_sessions()
+
+    assert sorted(client.media_sessions) == [1, 2, 4]
+
+
+@pytest.mark.asyncio
+async def test_media_session_is_started_once(monkeypatch):
+    client = await make_client(monkeypatch)
+    sessions = await asyncio.gather(*[client.get_media_session(4) for _ in range(5)])
+
+    assert all(s is sessions[0] for s in sessions)
+    assert [s.dc_id for s in Session.started] == [4]
+
+
+@pytest.mark.asyncio
+async def test_inline_session_is_a_media_session(monkeypatch):
+    client = await make_client(monkeypatch)
+    inline, media = await asyncio.gather(get_session(client, 4), client.get_media_session(4))
+
+    assert inline is media is client.media_sessions[4]
+    assert [s.dc_id for s in Session.started] == [4]
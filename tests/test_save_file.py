@@ -0,0 +1,171 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import io
+import os
+import time
+from hashlib import md5
+
+import pytest
+
+from pyrogram import Client, raw
+from pyrogram.errors import FloodWait, InternalServerError, FilePartMissing
+from pyrogram.methods.advanced import save_file
+from pyrogram.methods.advanced.save_file import UploadWindow
+
+PART_SIZE = 512 * 1024
+
+
+class MediaSession:
+    def __init__(self, failures: dict = None):
+        self.failures = failures or {}
+        self.parts = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def invoke(self, query, sleep_threshold: float = 0):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        try:
+            await asyncio.sleep(0.001)
+        finally:
+            self.in_flight -= 1
+
+        failures = self.failures.get(query.file_part)
+
+        if failures:
+            raise failures.pop(0)
+
+        self.parts[query.file_part] = query.bytes
+
+        return True
+
+
+class SlowFile(io.BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.name = "file.bin"
+        self.reading = False
+
+    def read(self, size: int = -1) -> bytes:
+        self.reading = True
+
+        try:
+            time.sleep(0.05)
+            return super().read(size)
+        finally:
+            self.reading = False
+
+
+async def upload(session: MediaSession, data: bytes, file: io.BytesIO = None):
+    client = Client("test", in_memory=True)
+    await client.storage.open()
+    client.media_sessions[await client.storage.dc_id()] = session
+
+    if file is None:
+        file = io.BytesIO(data)
+        file.name = "file.bin"
+
+    return await client.save_file(file)
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(save_file, "PART_RETRY_DELAY", 0)
+
+
+@pytest.mark.asyncio
+async def test_failed_parts_are_retried():
+    data = os.urandom(5 * PART_SIZE + 1)
+    session = MediaSession({
+        1: [InternalServerError("test"), OSError("test")],
+        4: [FloodWait(0)]
+    })
+
+    result = await upload(session, data)
+
+    assert isinstance(result, raw.types.InputFile)
+    assert result.parts == 6
+    assert result.md5_checksum == md5(data).hexdigest()
+    assert b"".join(session.parts[i] for i in range(6)) == data
+
+
+@pytest.mark.asyncio
+async def test_upload_fails_when_a_part_keeps_failing():
+    session = MediaSession({2: [InternalServerError("test")] * (save_file.PART_RETRIES + 1)})
+
+    assert await upload(session, os.urandom(4 * PART_SIZE)) is None
+
+
+@pytest.mark.asyncio
+async def test_upload_fails_on_other_errors():
+    session = MediaSession({0: [FilePartMissing(0)]})
+
+    assert await upload(session, os.urandom(4 * PART_SIZE)) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_upload_waits_for_pending_read():
+    session = MediaSession({0: [FilePartMissing(0)]})
+    file = SlowFile(os.urandom(4 * PART_SIZE))
+
+    assert await upload(session, b"", file) is None
+    assert not file.reading
+
+    position = file.tell()
+    await asyncio.sleep(0.1)
+
+    assert file.tell() == position
+
+
+@pytest.mark.asyncio
+async def test_big_files_are_uploaded_in_parallel():
+    data = os.urandom(21 * PART_SIZE)
+    session = MediaSession()
+
+    result = await upload(session, data)
+
+    assert isinstance(result, raw.types.InputFileBig)
+    assert b"".join(session.parts[i] for i in range(21)) == data
+    assert session.max_in_flight > 1
+
+
+def test_window_follows_throughput():
+    window = UploadWindow(2, 0)
+
+    # Throughput improves as long as the window grows
+    window.update(1, 100)
+    window.update(1, 100)
+    assert window.size == 3
+
+    for _ in range(3):
+        window.update(2, 200)
+
+    assert window.size == 4
+
+    # It gets worse, so the window turns around
+    for _ in range(4):
+        window.update(4, 100)
+
+    assert window.size == 3
+
+    window.flood()
+    assert window.size == 1
+    assert window.direction == -1